@@ -1,12 +1,34 @@
+import os
+from contextlib import contextmanager
 import streamlit as st
-import pandas as pd
-import numpy as np
-import time
+# Imported first so that, with BIOFORGE_PROFILE_STARTUP=1, the imports below
+# are timed
+from bioforge.startup import STARTUP
 import random
-from PIL import Image
-import base64
-import matplotlib.pyplot as plt
-import altair as alt
+import uuid
+import time
+from html import escape
+
+from bioforge.agents import AgentContext, AgentResult, AgentRuntime, attach_evidence
+from bioforge.assets import publish, publish_generated, stylesheet_html
+from bioforge.cache import ResultCache, result_key
+from bioforge.catalog import DEFAULT_CATALOG_PATH, open_catalog
+from bioforge.clinical import open_records
+from bioforge.comparison import ComparisonAnalytics
+from bioforge.charts import CHART_BACKEND, activity_chart_png, activity_chart_spec, activity_chart_svg
+from bioforge.evaluations import PRIORITIES, Evaluation, EvaluationStore
+from bioforge.federated import SCORE_FIELDS, federated_rescore, session_rng
+from bioforge.federated_sim import SITE_COUNTS, records_dataset, simulate, synthetic_dataset
+from bioforge.network import build_graph, network_svg
+from bioforge.pipeline import hypothesis_stream
+from bioforge.planner import plan_query
+from bioforge.progress import ProgressTracker
+from bioforge.provenance import ProvenanceStore
+from bioforge.ranking import DEFAULT_WEIGHTS, RANKING_MODES, WEIGHTED_SCORE, RankedView
+from bioforge.render import hypothesis_card_html, hypothesis_page_html, ratings_html, related_hypotheses_html, stream_preview_html
+from bioforge.rescoring import OnlineRescorer
+from bioforge.similarity import HypothesisIndex
+from bioforge.telemetry import TELEMETRY
 
 # Set page configuration
 st.set_page_config(
@@ -16,127 +38,24 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Apply custom CSS for retro gaming aesthetic
+# Static files (stylesheet, fonts, generated images) are served from
+# static/ when enabled in .streamlit/config.toml
+STATIC_SERVING = st.get_option("server.enableStaticServing")
+BASE_URL_PATH = st.get_option("server.baseUrlPath")
+
+@st.cache_resource
+def publish_assets():
+    return publish()
+
+# Apply custom CSS for retro gaming aesthetic: one <link> to the published
+# stylesheet (inlined only without static serving)
 def load_css():
-    st.markdown("""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=VT323&family=Space+Mono&display=swap');
-        
-        /* Main container */
-        .main {
-            background-color: #0a0a23;
-            color: #ffffff;
-        }
-        
-        /* Headers */
-        h1, h2, h3 {
-            font-family: 'VT323', monospace;
-            color: #FFD700;
-            text-shadow: 3px 3px 0px #FF4500;
-            letter-spacing: 2px;
-        }
-        
-        /* Paragraph text */
-        p, li, div {
-            font-family: 'Space Mono', monospace;
-            color: #ffffff;
-        }
-        
-        /* Button styling */
-        .stButton > button {
-            font-family: 'VT323', monospace;
-            font-size: 20px;
-            border: 3px solid #FFD700;
-            border-radius: 0px;
-            box-shadow: 3px 3px 0px #FF4500;
-            background-color: #000;
-            color: #FFD700;
-            transition: all 0.1s;
-        }
-        
-        .stButton > button:hover {
-            background-color: #FFD700;
-            color: #000;
-            transform: translate(2px, 2px);
-            box-shadow: 1px 1px 0px #FF4500;
-        }
-        
-        /* Select box styling */
-        .stSelectbox > div > div {
-            background-color: #000;
-            border: 3px solid #FFD700;
-            border-radius: 0px;
-            color: #FFD700;
-            font-family: 'Space Mono', monospace;
-        }
-        
-        /* Sidebar styling */
-        .sidebar .sidebar-content {
-            background-color: #0a0a23;
-            background-image: linear-gradient(0deg, #0a0a23 0%, #1a1a3a 100%);
-            border-right: 3px solid #FFD700;
-        }
-        
-        /* Pixel-perfect containers */
-        .pixel-box {
-            border: 3px solid #FFD700;
-            background-color: #121240;
-            padding: 20px;
-            margin: 10px 0px;
-            box-shadow: 5px 5px 0px #FF4500;
-        }
-        
-        /* Progress bar */
-        .stProgress > div > div {
-            background-color: #FFD700;
-        }
-        
-        /* Metric styling */
-        .stMetric {
-            background-color: #000;
-            border: 2px solid #FFD700;
-            padding: 10px;
-            box-shadow: 3px 3px 0px #FF4500;
-        }
-        
-        /* Tabs */
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 2px;
-        }
-        
-        .stTabs [data-baseweb="tab"] {
-            background-color: #000;
-            border: 2px solid #FFD700;
-            border-radius: 0px;
-            color: #FFD700;
-            font-family: 'VT323', monospace;
-            padding: 10px 20px;
-            font-size: 18px;
-        }
-        
-        .stTabs [aria-selected="true"] {
-            background-color: #FFD700;
-            color: #000;
-        }
-        
-        /* Divider */
-        hr {
-            border-color: #FFD700;
-            border-width: 2px;
-        }
-        
-        /* Code blocks */
-        code {
-            background-color: #1e1e3f;
-            color: #ff8a65;
-            border: 2px solid #FFD700;
-            padding: 2px 5px;
-            font-family: 'Space Mono', monospace;
-        }
-    </style>
-    """, unsafe_allow_html=True)
+    if STATIC_SERVING:
+        publish_assets()
+    st.markdown(stylesheet_html(STATIC_SERVING, base_path=BASE_URL_PATH), unsafe_allow_html=True)
 
-load_css()
+with STARTUP.section("stylesheet"):
+    load_css()
 
 # Title and introduction
 def load_header():
@@ -154,285 +73,276 @@ def load_header():
     </div>
     """, unsafe_allow_html=True)
 
-# Simulate loading animation
-def loading_animation(text="PROCESSING", duration=3):
+# Progress bar driven by real work; redraws are throttled to a bounded frame rate
+@contextmanager
+def progress_display(text="PROCESSING", total=1, preview=None):
+    # preview: optional callable returning HTML shown under the bar on
+    # every frame
     progress_bar = st.progress(0)
     status_text = st.empty()
+    preview_box = st.empty() if preview is not None else None
     
-    for i in range(101):
-        dots = "." * (i % 4)
-        status_text.markdown(f"<p style='font-family:VT323, monospace; font-size:20px; color:#FFD700'>{text}{dots}</p>", unsafe_allow_html=True)
-        progress_bar.progress(i)
-        time.sleep(duration/100)
+    def render(state):
+        dots = "." * (state.done % 4)
+        eta = f" ~{state.eta:.1f}s LEFT" if state.eta else ""
+        status_text.markdown(f"<p style='font-family:VT323, monospace; font-size:20px; color:#FFD700'>{text}{dots} {state.done}/{state.total}{eta}</p>", unsafe_allow_html=True)
+        progress_bar.progress(state.fraction)
+        if preview_box is not None:
+            preview_box.markdown(preview(), unsafe_allow_html=True)
     
-    status_text.empty()
-    progress_bar.empty()
+    try:
+        with ProgressTracker(total, text, callback=render) as tracker:
+            yield tracker
+    finally:
+        status_text.empty()
+        progress_bar.empty()
+        if preview_box is not None:
+            preview_box.empty()
 
-# Simulate pixelated data processing animation
+# Pixelated processing animation, shown until the returned placeholder is cleared
 def pixelated_processing_animation():
-    st.markdown("""
+    placeholder = st.empty()
+    placeholder.markdown("""
     <div style="text-align:center">
         <div style="display:inline-block; width:20px; height:20px; background:#FFD700; margin:5px; animation: pulse 1s infinite alternate;"></div>
         <div style="display:inline-block; width:20px; height:20px; background:#FFD700; margin:5px; animation: pulse 1s infinite alternate 0.1s;"></div>
         <div style="display:inline-block; width:20px; height:20px; background:#FFD700; margin:5px; animation: pulse 1s infinite alternate 0.2s;"></div>
         <div style="display:inline-block; width:20px; height:20px; background:#FFD700; margin:5px; animation: pulse 1s infinite alternate 0.3s;"></div>
         <div style="display:inline-block; width:20px; height:20px; background:#FFD700; margin:5px; animation: pulse 1s infinite alternate 0.4s;"></div>
-        <style>
-            @keyframes pulse {
-                0% { opacity: 0.3; }
-                100% { opacity: 1; }
-            }
-        </style>
     </div>
     """, unsafe_allow_html=True)
-    time.sleep(2)
-
-# Disease data
-disease_data = {
-    "Alzheimer's Disease": {
-        "description": "A progressive neurologic disorder that causes brain cells to die and the brain to shrink.",
-        "research_questions": [
-            "Gene variants associated with early-onset Alzheimer's",
-            "Role of tau protein in neurodegeneration",
-            "Microbiome influence on cognitive decline",
-            "Blood-brain barrier dysfunction patterns"
-        ],
-        "agents": {
-            "Literature Mining Agent": [
-                "Extracted 573 studies linking ApoE4 allele to earlier onset",
-                "Identified 47 papers discussing tau protein hyperphosphorylation mechanisms",
-                "Found new research suggesting gut-brain axis involvement in 128 studies"
-            ],
-            "Genomic Data Analysis Agent": [
-                "Detected novel single nucleotide polymorphisms in TREM2 gene",
-                "Identified expression patterns in 47 patients with early onset",
-                "Mapped pathway interactions between APP and PSEN1/2 genes"
-            ],
-            "Clinical Data Integration Agent": [
-                "Correlated cognitive assessment scores with biomarker presence",
-                "Identified patterns in disease progression across 1,200 patient records",
-                "Detected previously unknown relationship between sleep patterns and symptom severity"
-            ]
-        },
-        "hypotheses": [
-            {
-                "title": "Tau Protein Misfolding Cascade Hypothesis",
-                "description": "Misfolded tau proteins may trigger a cascade effect that spreads to adjacent neurons through exosome-mediated transport, potentially explaining the pattern of disease progression seen in clinical data.",
-                "supporting_evidence": {
-                    "Literature Mining Agent": "Multiple studies show intercellular tau protein transfer",
-                    "Genomic Data Analysis Agent": "Expression changes in exosome regulatory genes correlate with disease progression",
-                    "Clinical Data Integration Agent": "Disease spread patterns match predicted exosome-mediated transport routes"
-                },
-                "confidence": 87,
-                "novelty": 72,
-                "testability": 95
-            },
-            {
-                "title": "Microglial Priming Hypothesis",
-                "description": "Early-life infections may prime microglia for hyperactivation decades later, creating vulnerability to amyloid beta accumulation and neuroinflammation when triggered by age-related stressors.",
-                "supporting_evidence": {
-                    "Literature Mining Agent": "Studies show persistent microglial changes after infection",
-                    "Genomic Data Analysis Agent": "Gene expression signatures of 'primed' microglia identified in pre-symptomatic patients",
-                    "Clinical Data Integration Agent": "Statistical correlation between early-life infection history and disease onset"
-                },
-                "confidence": 76,
-                "novelty": 88,
-                "testability": 65
-            },
-            {
-                "title": "Metabolic-Cognitive Feedback Loop Hypothesis",
-                "description": "A bidirectional relationship may exist where early metabolic changes in the brain alter cognition, leading to behavior changes that further impact metabolic function, creating an accelerating disease cycle.",
-                "supporting_evidence": {
-                    "Literature Mining Agent": "Research shows tight coupling between brain metabolism and cognition",
-                    "Genomic Data Analysis Agent": "Metabolic regulatory genes show altered expression patterns early in disease",
-                    "Clinical Data Integration Agent": "Behavioral changes precede and predict metabolic biomarker shifts"
-                },
-                "confidence": 81,
-                "novelty": 79,
-                "testability": 83
-            }
-        ],
-        "federated_improvements": [
-            "Access to 50,000 additional patient records reveals stronger correlations",
-            "New genomic datasets highlight previously undetected gene variants",
-            "Longitudinal clinical data enables temporal validation of predicted progressions"
-        ]
-    },
-    "Pancreatic Cancer": {
-        "description": "A cancer that forms in the pancreas, a gland located behind the stomach.",
-        "research_questions": [
-            "Early detection biomarkers for pancreatic cancer",
-            "Stromal-epithelial interactions in tumor microenvironment",
-            "Immunotherapy resistance mechanisms",
-            "Metabolic adaptations driving malignant transformation"
-        ],
-        "agents": {
-            "Literature Mining Agent": [
-                "Analyzed 831 papers on pancreatic tumor microenvironment",
-                "Extracted data on 37 potential biomarkers from recent clinical trials",
-                "Identified patterns in treatment response across 219 case studies"
-            ],
-            "Genomic Data Analysis Agent": [
-                "Detected recurrent KRAS mutation patterns across 86 tumor samples",
-                "Identified novel RNA splicing anomalies in tumor-adjacent tissues",
-                "Mapped pathway alterations in tumor progression sequences"
-            ],
-            "Clinical Data Integration Agent": [
-                "Correlated imaging features with genetic profiles across patient cohorts",
-                "Identified subtle early symptoms appearing up to 18 months before diagnosis",
-                "Detected patterns in treatment response based on metabolic profiles"
-            ]
-        },
-        "hypotheses": [
-            {
-                "title": "Exosome-Driven Metabolic Reprogramming Hypothesis",
-                "description": "Pancreatic stellate cell-derived exosomes may reprogram metabolic pathways in pre-cancerous cells, creating a permissive environment for KRAS-driven transformation through epigenetic modifications.",
-                "supporting_evidence": {
-                    "Literature Mining Agent": "Recent publications show exosome signaling between stellate and ductal cells",
-                    "Genomic Data Analysis Agent": "Metabolic gene expression changes precede detectable KRAS mutations",
-                    "Clinical Data Integration Agent": "Metabolic shifts detected in blood samples months before diagnosis"
-                },
-                "confidence": 78,
-                "novelty": 91,
-                "testability": 82
-            },
-            {
-                "title": "Immune Exclusion Zone Hypothesis",
-                "description": "Pancreatic tumors may actively construct physical and biochemical barriers that create immune 'exclusion zones,' preventing T-cell infiltration through coordinated ECM remodeling and chemokine gradient manipulation.",
-                "supporting_evidence": {
-                    "Literature Mining Agent": "Studies show correlation between ECM density and T-cell exclusion",
-                    "Genomic Data Analysis Agent": "Expression signatures suggest coordinated ECM and chemokine regulation",
-                    "Clinical Data Integration Agent": "Imaging studies reveal spatial organization of immune exclusion"
-                },
-                "confidence": 85,
-                "novelty": 76,
-                "testability": 89
-            },
-            {
-                "title": "Metabolic-Neural Crosstalk Hypothesis",
-                "description": "Pancreatic tumors may exploit neural signaling to enhance their metabolic adaptability, forming a feedback loop where metabolic stress triggers neural invasion, which then provides access to alternative metabolic substrates.",
-                "supporting_evidence": {
-                    "Literature Mining Agent": "Reports of neural invasion correlating with metabolic adaptation",
-                    "Genomic Data Analysis Agent": "Upregulation of neurotransmitter receptors in metabolically stressed cells",
-                    "Clinical Data Integration Agent": "Neural invasion patterns predict metabolic signature shifts"
-                },
-                "confidence": 72,
-                "novelty": 94,
-                "testability": 77
-            }
-        ],
-        "federated_improvements": [
-            "Access to detailed dietary records provides new environmental correlations",
-            "Integration with diabetic patient monitoring data reveals early warning signs",
-            "Collaborative clinical trial data enables validation of biomarker predictions"
-        ]
-    },
-    "Type 2 Diabetes": {
-        "description": "A chronic condition that affects the way the body processes blood sugar (glucose).",
-        "research_questions": [
-            "Beta cell dysfunction mechanisms in early disease",
-            "Environmental factors affecting insulin resistance",
-            "Genetic predisposition and personalized treatment approaches",
-            "Neural regulation of glucose homeostasis"
-        ],
-        "agents": {
-            "Literature Mining Agent": [
-                "Analyzed 1,256 studies on beta cell functional decline",
-                "Extracted patterns from 459 papers on environmental risk factors",
-                "Mapped treatment efficacy data across different genetic profiles"
-            ],
-            "Genomic Data Analysis Agent": [
-                "Identified gene variant clusters associated with treatment responsiveness",
-                "Detected epigenetic patterns correlated with disease progression",
-                "Mapped interconnected pathways between metabolism and inflammation"
-            ],
-            "Clinical Data Integration Agent": [
-                "Correlated continuous glucose monitoring data with lifestyle factors",
-                "Identified subtle early warning signs from electronic health records",
-                "Detected patterns in drug response across diverse patient populations"
-            ]
-        },
-        "hypotheses": [
-            {
-                "title": "Circadian Disruption-Metabolic Failure Hypothesis",
-                "description": "Chronic disruption of circadian rhythms may trigger a progressive desynchronization of metabolic processes, leading to cellular stress that impairs beta cell function through specific epigenetic mechanisms.",
-                "supporting_evidence": {
-                    "Literature Mining Agent": "Multiple studies link shift work to diabetic risk",
-                    "Genomic Data Analysis Agent": "Clock gene variants correlate with beta cell dysfunction patterns",
-                    "Clinical Data Integration Agent": "Sleep pattern data shows strong correlation with disease progression"
-                },
-                "confidence": 83,
-                "novelty": 76,
-                "testability": 89
-            },
-            {
-                "title": "Microbiome-Induced Metabolic Memory Hypothesis",
-                "description": "Specific gut microbiome profiles may induce persistent epigenetic changes in metabolic tissues, creating a 'metabolic memory' that continues to drive insulin resistance even after the initial dysbiosis is resolved.",
-                "supporting_evidence": {
-                    "Literature Mining Agent": "Research shows lasting effects of temporary dysbiosis",
-                    "Genomic Data Analysis Agent": "Identified stable epigenetic markers induced by microbial metabolites",
-                    "Clinical Data Integration Agent": "Patient history reveals persistent effects after antibiotic treatments"
-                },
-                "confidence": 77,
-                "novelty": 90,
-                "testability": 75
-            },
-            {
-                "title": "Neural-Metabolic Integration Failure Hypothesis",
-                "description": "Dysfunction in neural circuits that monitor and regulate metabolism may precede measurable metabolic dysfunction, suggesting a central nervous system origin for what appears peripherally as insulin resistance.",
-                "supporting_evidence": {
-                    "Literature Mining Agent": "Studies show hypothalamic inflammation precedes peripheral insulin resistance",
-                    "Genomic Data Analysis Agent": "Neural gene expression changes detected before metabolic disruption",
-                    "Clinical Data Integration Agent": "Subtle autonomic nervous system dysfunction appears early in patient histories"
-                },
-                "confidence": 69,
-                "novelty": 87,
-                "testability": 72
-            }
-        ],
-        "federated_improvements": [
-            "Wearable device data provides continuous physiological monitoring insights",
-            "Integration with food consumption databases reveals dietary pattern effects",
-            "Cross-correlation with environmental monitoring shows pollution impact"
-        ]
-    }
-}
-
-# Agent icons (simple text emoji representations for the retro aesthetic)
-agent_icons = {
-    "Literature Mining Agent": "📚",
-    "Genomic Data Analysis Agent": "🧬",
-    "Clinical Data Integration Agent": "🏥"
-}
+    return placeholder
+
+# Disease catalog (loaded lazily from data/, one disease at a time)
+@st.cache_resource
+def get_catalog():
+    return open_catalog(os.environ.get("BIOFORGE_CATALOG", DEFAULT_CATALOG_PATH))
+
+# Agent network diagram per agent run state (state pairs, empty when idle),
+# laid out once per agent set. With static serving the page only carries an
+# <img> tag pointing at the published SVG.
+@st.cache_resource
+def agent_network_html(graph, states=()):
+    svg = network_svg(graph, dict(states))
+    if STATIC_SERVING:
+        svg = f'<img src="{publish_generated(svg, ".svg", base_path=BASE_URL_PATH)}" alt="Agent network">'
+    return network_frame(svg)
+
+def network_frame(svg):
+    return f"<div style='display:flex;justify-content:center;margin-bottom:20px;'>{svg}</div>"
+
+# Agent runtime shared by every session in the process
+@st.cache_resource
+def get_agent_runtime():
+    return AgentRuntime(provenance=ProvenanceStore())
+
+# Data-flow graph of the runtime's agents
+@st.cache_resource
+def get_agent_graph():
+    return build_graph(get_agent_runtime().agents)
+
+# (agent, status) pairs of a run, for the agent network diagram
+def run_states(results):
+    return tuple((name, result.status) for name, result in results.items()) if results else ()
+
+# Run the agents the query plan routes the question to concurrently and
+# report each one as soon as it finishes; `network` is a placeholder in which
+# the agent network diagram highlights the agents still running. Agents that
+# succeeded in `previous` (an earlier run's results) are not run again.
+def run_agents(disease, question, federated=False, network=None, previous=None):
+    runtime = get_agent_runtime()
+    plan = plan_query(disease, question, runtime.agents)
+    kept = {name: result for name, result in (previous or {}).items() if result.ok or result.skipped}
+    plan.agents = [agent for agent in plan.agents if agent.name not in kept]
+    context = AgentContext(
+        disease=disease, question=question, federated=federated, filters=plan.filters, catalog_only=plan.catalog_only,
+    )
+    status_style = "font-family:VT323, monospace; font-size:20px; color:#FFD700"
+    icons = {agent.name: agent.icon for agent in runtime.agents}
+
+    status_slots = {}
+    for agent in plan.agents:
+        status_slots[agent.name] = st.empty()
+        status_slots[agent.name].markdown(f"<p style='{status_style}'>{agent.icon} {agent.name}: RUNNING...</p>", unsafe_allow_html=True)
+
+    results = dict(kept, **{name: AgentResult(name, [], status="skipped", error=reason) for name, reason in plan.skipped.items()})
+    states = dict(run_states(results), **{agent.name: "running" for agent in plan.agents})
+    if network is not None:
+        network.markdown(network_frame(network_svg(get_agent_graph(), states)), unsafe_allow_html=True)
+    with progress_display("PROCESSING MULTI-AGENT DATA", len(plan.agents)) as tracker:
+        context.progress = tracker
+        for result in runtime.run(context, agents=plan.agents, progress=tracker):
+            results[result.agent] = result
+            states[result.agent] = result.status
+            if network is not None:
+                network.markdown(network_frame(network_svg(get_agent_graph(), states)), unsafe_allow_html=True)
+            if result.ok:
+                status = f"DONE IN {result.elapsed:.2f}s ({len(result.findings)} FINDINGS)"
+            else:
+                status = result.status.upper()
+            status_slots[result.agent].markdown(f"<p style='{status_style}'>{icons.get(result.agent, '🤖')} {result.agent}: {status}</p>", unsafe_allow_html=True)
+
+    for slot in status_slots.values():
+        slot.empty()
+
+    # Keep the registry order for display
+    results = {agent.name: results[agent.name] for agent in runtime.agents if agent.name in results}
+    if network is not None:
+        network.markdown(agent_network_html(get_agent_graph(), run_states(results)), unsafe_allow_html=True)
+    return results
+
+# Agent findings for a selection, from the shared cache when available.
+# Runs where an agent failed are only kept briefly in the cache, so the next
+# PROCESS DATA retries the failed agents of `previous`.
+def cached_agent_results(cache, key, disease, question, federated=False, network=None, previous=None):
+    results = cache.get(key)
+    if results is None:
+        results = run_agents(disease, question, federated, network, previous)
+        ttl = None if all(result.ok or result.skipped for result in results.values()) else FAILED_RUN_TTL
+        cache.put(key, results, ttl=ttl)
+    return results
+
+# Results of this session's last agent run for a selection: the shared cache
+# entry, else the copy kept when it ran. Plain reruns never run agents.
+def last_agent_results(cache, key):
+    results = cache.get(key)
+    if results is None:
+        results = st.session_state.setdefault('agent_runs', {}).get(key)
+    return results
+
+# Hypothesis set for a selection from the shared cache, generated when
+# missing. Sets built from a run with failed agents are only kept briefly.
+def cached_hypotheses(cache, key, disease, question, federated=False, agent_results=None):
+    hypotheses = cache.get(key)
+    if hypotheses is None:
+        hypotheses = generate_hypotheses(disease, question, federated, agent_results)
+        failed = agent_results and not all(result.ok or result.skipped for result in agent_results.values())
+        cache.put(key, hypotheses, ttl=FAILED_RUN_TTL if failed else None)
+    return hypotheses
+
+# Hypothesis set for a selection, reporting progress while it is built.
+# Evidence from a finished agent run replaces the catalog evidence it covers.
+def generate_hypotheses(disease, question, federated=False, agent_results=None):
+    animation = pixelated_processing_animation()
+    candidates = []
+    # Catalog hypotheses plus roughly one synthesized hypothesis per finding
+    findings = [r.findings for r in agent_results.values()] if agent_results else disease.agents.values()
+    estimate = len(disease.hypotheses_for(question)) + sum(len(f) for f in findings)
+    with progress_display("SYNTHESIZING HYPOTHESES", estimate, preview=lambda: stream_preview_html(candidates)) as tracker:
+        # The stream yields the first hypotheses while later ones are still
+        # being extracted and cross-linked
+        for hypothesis in hypothesis_stream(disease, question, agent_results):
+            candidates.append(hypothesis)
+            if tracker.done >= tracker.total:
+                tracker.add_total(1)
+            tracker.advance()
+    # Every evidence line is traced to its agent run or catalog record
+    catalog_key = get_agent_runtime().provenance.catalog_key(disease)
+    candidates = attach_evidence(candidates, (agent_results or {}).values(), catalog_key)
+    if federated:
+        # Batch re-score into new dicts; the catalog stays untouched
+        candidates = federated_rescore(candidates, session_seed(), key=disease.name)
+    animation.empty()
+    return candidates
+
+# Simulated federation of the disease's patient records (synthetic data
+# when there are none) across partner sites, one process per site
+def run_federation(disease, n_sites):
+    records = open_records(disease.name)
+    dataset = records_dataset(records) if records is not None else None
+    if dataset is None:
+        dataset = synthetic_dataset(seed=session_rng(0, disease.name).integers(2**32))
+    with progress_display(f"FEDERATING {n_sites} SITES", DEFAULT_FEDERATION_ROUNDS) as tracker:
+        return simulate(*dataset, n_sites, rounds=DEFAULT_FEDERATION_ROUNDS, on_round=lambda stats: tracker.advance())
+
+DEFAULT_FEDERATION_ROUNDS = 20
+
+# Seconds a run with failed or timed-out agents (and the hypotheses built
+# from it) stays cached
+FAILED_RUN_TTL = 30
+
+# Hypothesis sets kept per session, most recently generated last
+KEPT_HYPOTHESIS_SETS = 8
+
+# Result cache shared by every session in the process
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+# Vector index over every catalog hypothesis, for cross-disease search
+@st.cache_resource
+def get_hypothesis_index():
+    return HypothesisIndex.from_catalog(get_catalog())
+
+# Evaluation store shared by every session; writes happen on a background thread
+@st.cache_resource
+def get_evaluation_store():
+    return EvaluationStore()
+
+# Running rating statistics, seeded once from the evaluation store
+@st.cache_resource
+def get_rescorer():
+    return OnlineRescorer.from_store(get_evaluation_store())
+
+# Stable identifier for the current browser session
+def session_id():
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
+
+# Hypothesis comparison tables and chart specs of this session
+def comparison_analytics():
+    if 'comparison' not in st.session_state:
+        st.session_state.comparison = ComparisonAnalytics()
+    return st.session_state.comparison
+
+# Per-session seed for reproducible score adjustments
+def session_seed():
+    if 'seed' not in st.session_state:
+        st.session_state.seed = random.randrange(2**32)
+    return st.session_state.seed
+
+# Agent activity chart, served from the rendered-chart cache
+def render_activity_chart(agent, data):
+    if CHART_BACKEND == "vega":
+        st.vega_lite_chart(activity_chart_spec(agent, data), use_container_width=True)
+    elif CHART_BACKEND == "svg":
+        st.markdown(activity_chart_svg(agent, data), unsafe_allow_html=True)
+    else:
+        st.image(activity_chart_png(agent, data))
 
 # Main application
 def main():
-    load_header()
+    with STARTUP.section("header"):
+        load_header()
+    with STARTUP.section("catalog"):
+        catalog = get_catalog()
     
     st.markdown("<hr>", unsafe_allow_html=True)
     
     # Sidebar for navigation and controls
-    with st.sidebar:
+    with st.sidebar, STARTUP.section("sidebar"):
         st.markdown("<h2 style='text-align: center'>CONTROL PANEL</h2>", unsafe_allow_html=True)
         
         # Disease selection
         selected_disease = st.selectbox(
             "SELECT DISEASE AREA",
-            list(disease_data.keys()),
+            catalog.names(),
             key="disease_selector"
         )
+        disease = catalog.get(selected_disease)
         
         # Display disease description
         st.markdown(f"""
         <div class="pixel-box">
-            <p>{disease_data[selected_disease]['description']}</p>
+            <p>{disease.description}</p>
         </div>
         """, unsafe_allow_html=True)
         
         # Research question selection
         selected_question = st.selectbox(
             "SELECT RESEARCH QUESTION",
-            disease_data[selected_disease]['research_questions'],
+            disease.research_questions,
             key="question_selector"
         )
         
@@ -452,11 +362,25 @@ def main():
         </div>
         """, unsafe_allow_html=True)
     
+    # Results are cached per selection and shared across sessions; each
+    # session remembers which selections it has run
+    with STARTUP.section("agent runtime"):
+        runtime = get_agent_runtime()
+        cache = get_result_cache()
+    # Agent icons (simple text emoji representations for the retro aesthetic)
+    agent_icons = {agent.name: agent.icon for agent in runtime.agents}
+    agent_key = result_key("agents", selected_disease, selected_question, federated_learning, runtime.config_key())
+    hypothesis_key = result_key("hypotheses", selected_disease, selected_question, federated_learning, (session_seed(),) if federated_learning else ())
+    processed_runs = st.session_state.setdefault('processed_runs', set())
+    # hypothesis_key -> (agent results it was built from, hypotheses)
+    hypothesis_sets = st.session_state.setdefault('hypothesis_sets', {})
+    hypotheses = None
+    
     # Main content area with tabs
     tab1, tab2, tab3 = st.tabs(["AGENT NETWORK", "GENERATED HYPOTHESES", "HYPOTHESIS EVALUATION"])
     
     # Tab 1: Agent Network Visualization
-    with tab1:
+    with tab1, STARTUP.section("agent network tab"):
         st.markdown("<h2>AI AGENT NETWORK</h2>", unsafe_allow_html=True)
         st.markdown(f"""
         <div class="pixel-box">
@@ -464,205 +388,55 @@ def main():
             <p>Research focus: <span style='color:#FF4500'>{selected_question}</span></p>
         </div>
         """, unsafe_allow_html=True)
+        st.caption(" · ".join(plan_query(disease, selected_question, runtime.agents).describe()))
         
         # Agent Network Visualization
-        st.markdown("""
-        <div style='display: flex; justify-content: center; margin-bottom: 20px;'>
-            <div style='text-align: center; position: relative;'>
-                <div style='
-                    width: 100px;
-                    height: 100px;
-                    background-color: #000;
-                    border: 3px solid #FFD700;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    margin: 0 auto;
-                    font-family: VT323, monospace;
-                    font-size: 40px;
-                    color: #FFD700;
-                    position: absolute;
-                    top: 50%;
-                    left: 50%;
-                    transform: translate(-50%, -50%);
-                    box-shadow: 5px 5px 0px #FF4500;
-                    z-index: 10;
-                '>
-                    🧠
-                </div>
-                
-                <div style='
-                    width: 500px;
-                    height: 300px;
-                    position: relative;
-                '>
-                    <!-- Literature Mining Agent -->
-                    <div style='
-                        width: 80px;
-                        height: 80px;
-                        background-color: #000;
-                        border: 3px solid #FFD700;
-                        display: flex;
-                        align-items: center;
-                        justify-content: center;
-                        font-family: VT323, monospace;
-                        font-size: 30px;
-                        color: #FFD700;
-                        position: absolute;
-                        top: 20px;
-                        left: 30px;
-                        box-shadow: 3px 3px 0px #FF4500;
-                    '>
-                        📚
-                    </div>
-                    <div style='
-                        width: 150px;
-                        position: absolute;
-                        top: 35px;
-                        left: 120px;
-                        font-family: Space Mono, monospace;
-                        font-size: 12px;
-                        color: #FFD700;
-                    '>
-                        Literature Mining Agent
-                    </div>
-                    
-                    <!-- Genomic Agent -->
-                    <div style='
-                        width: 80px;
-                        height: 80px;
-                        background-color: #000;
-                        border: 3px solid #FFD700;
-                        display: flex;
-                        align-items: center;
-                        justify-content: center;
-                        font-family: VT323, monospace;
-                        font-size: 30px;
-                        color: #FFD700;
-                        position: absolute;
-                        top: 150px;
-                        left: 30px;
-                        box-shadow: 3px 3px 0px #FF4500;
-                    '>
-                        🧬
-                    </div>
-                    <div style='
-                        width: 170px;
-                        position: absolute;
-                        top: 165px;
-                        left: 120px;
-                        font-family: Space Mono, monospace;
-                        font-size: 12px;
-                        color: #FFD700;
-                    '>
-                        Genomic Data Analysis Agent
-                    </div>
-                    
-                    <!-- Clinical Agent -->
-                    <div style='
-                        width: 80px;
-                        height: 80px;
-                        background-color: #000;
-                        border: 3px solid #FFD700;
-                        display: flex;
-                        align-items: center;
-                        justify-content: center;
-                        font-family: VT323, monospace;
-                        font-size: 30px;
-                        color: #FFD700;
-                        position: absolute;
-                        top: 230px;
-                        left: 200px;
-                        box-shadow: 3px 3px 0px #FF4500;
-                    '>
-                        🏥
-                    </div>
-                    <div style='
-                        width: 170px;
-                        position: absolute;
-                        top: 245px;
-                        left: 290px;
-                        font-family: Space Mono, monospace;
-                        font-size: 12px;
-                        color: #FFD700;
-                    '>
-                        Clinical Data Integration Agent
-                    </div>
-                    
-                    <!-- Connector lines -->
-                    <div style='
-                        position: absolute;
-                        top: 60px;
-                        left: 120px;
-                        width: 100px;
-                        height: 3px;
-                        background-color: #FF4500;
-                        transform: rotate(30deg);
-                    '></div>
-                    <div style='
-                        position: absolute;
-                        top: 190px;
-                        left: 120px;
-                        width: 100px;
-                        height: 3px;
-                        background-color: #FF4500;
-                        transform: rotate(-30deg);
-                    '></div>
-                    <div style='
-                        position: absolute;
-                        top: 270px;
-                        left: 290px;
-                        width: 100px;
-                        height: 3px;
-                        background-color: #FF4500;
-                        transform: rotate(-60deg);
-                    '></div>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        network_slot = st.empty()
+        last_run = last_agent_results(cache, agent_key) if agent_key in processed_runs else None
+        network_slot.markdown(agent_network_html(get_agent_graph(), run_states(last_run)), unsafe_allow_html=True)
         
         # Process data button
         if st.button("PROCESS DATA", key="process_data"):
-            loading_animation("PROCESSING MULTI-AGENT DATA", 3)
-            st.session_state.data_processed = True
+            agent_runs = st.session_state.setdefault('agent_runs', {})
+            agent_runs[agent_key] = cached_agent_results(
+                cache, agent_key, disease, selected_question, federated_learning, network_slot, agent_runs.get(agent_key)
+            )
+            processed_runs.add(agent_key)
         
-        # Display agent findings if data processed
-        if st.session_state.get('data_processed', False):
+        # Display agent findings if data processed; failed agents are only
+        # retried by pressing PROCESS DATA
+        if agent_key in processed_runs:
+            agent_results = last_agent_results(cache, agent_key)
             st.markdown("<h3>AGENT FINDINGS</h3>", unsafe_allow_html=True)
+            if any(not (result.ok or result.skipped) for result in agent_results.values()):
+                st.warning("SOME AGENTS FAILED OR TIMED OUT. PRESS PROCESS DATA TO RETRY THEM.")
             
-            for agent, findings in disease_data[selected_disease]['agents'].items():
-                with st.expander(f"{agent_icons[agent]} {agent}"):
+            for agent, result in agent_results.items():
+                with st.expander(f"{agent_icons.get(agent, '🤖')} {agent}"):
                     st.markdown(f"""
                     <div class="pixel-box" style="background-color:#111;">
                         <p style="color:#FFD700;font-family:VT323, monospace;font-size:20px;">AGENT LOGS:</p>
                     """, unsafe_allow_html=True)
                     
+                    findings = result.findings if result.ok else [f"{result.status.upper()}: {result.error}"]
                     for finding in findings:
                         st.markdown(f"""
                         <div style="border-left:3px solid #FF4500;padding-left:10px;margin:5px 0;font-family:'Space Mono', monospace;font-size:14px;color:#ffffff;background-color:#121240;">
-                            {finding}
+                            {escape(finding)}
                         </div>
                         """, unsafe_allow_html=True)
                     
                     st.markdown("</div>", unsafe_allow_html=True)
                     
                     # Display a simple pixel chart for this agent
-                    data = np.random.randint(1, 10, size=8)
-                    fig, ax = plt.subplots(figsize=(5, 2))
-                    ax.bar(range(len(data)), data, color='#FFD700', edgecolor='#FF4500', linewidth=2)
-                    ax.set_facecolor('#000000')
-                    fig.patch.set_facecolor('#000000')
-                    ax.set_title('Activity Metrics', color='#FFD700', fontfamily='monospace')
-                    ax.tick_params(colors='#FFD700')
-                    ax.spines['bottom'].set_color('#FFD700')
-                    ax.spines['top'].set_color('#FFD700')
-                    ax.spines['left'].set_color('#FFD700')
-                    ax.spines['right'].set_color('#FFD700')
-                    st.pyplot(fig)
+                    data = TELEMETRY.work_history(agent, 8)
+                    if len(data):
+                        render_activity_chart(agent, data)
+        elif processed_runs:
+            st.info("Press PROCESS DATA to run the agents for this selection.")
     
     # Tab 2: Generated Hypotheses
-    with tab2:
+    with tab2, STARTUP.section("hypotheses tab"):
         st.markdown("<h2>GENERATED HYPOTHESES</h2>", unsafe_allow_html=True)
         
         # Explanation text
@@ -672,17 +446,30 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
+        # Hypotheses are only generated by the button; reruns show this
+        # session's last set. Sets are cached per agent run outcome, so
+        # processing data (or retrying failed agents) refreshes their evidence.
+        agent_results = last_agent_results(cache, agent_key) if agent_key in processed_runs else None
+        
         # Generate hypotheses button
         if st.button("GENERATE HYPOTHESES", key="generate_hypotheses"):
-            pixelated_processing_animation()
-            loading_animation("SYNTHESIZING HYPOTHESES", 4)
-            st.session_state.hypotheses_generated = True
+            hypotheses = cached_hypotheses(
+                cache, (hypothesis_key, run_states(agent_results)), disease, selected_question, federated_learning, agent_results,
+            )
+            hypothesis_sets.pop(hypothesis_key, None)
+            hypothesis_sets[hypothesis_key] = (agent_results, hypotheses)
+            while len(hypothesis_sets) > KEPT_HYPOTHESIS_SETS:
+                hypothesis_sets.pop(next(iter(hypothesis_sets)))
         
         # Display hypotheses if generated
-        if st.session_state.get('hypotheses_generated', False):
-            hypotheses = disease_data[selected_disease]['hypotheses']
+        if hypothesis_key in hypothesis_sets:
+            source, hypotheses = hypothesis_sets[hypothesis_key]
+            if source is not agent_results:
+                st.info("Agent findings changed since these hypotheses were generated. Press GENERATE HYPOTHESES to refresh their evidence.")
+            # Blend in researcher ratings collected so far
+            hypotheses = get_rescorer().apply(selected_disease, hypotheses)
             
-            # Apply federated improvements if enabled
+            # Show federated improvements if enabled
             if federated_learning:
                 st.markdown(f"""
                 <div class="pixel-box" style="border-color:#FF4500;background-color:#1a1a3a;">
@@ -691,85 +478,68 @@ def main():
                     <ul>
                 """, unsafe_allow_html=True)
                 
-                for improvement in disease_data[selected_disease]['federated_improvements']:
+                for improvement in disease.federated_improvements:
                     st.markdown(f"<li>{improvement}</li>", unsafe_allow_html=True)
                 
                 st.markdown("</ul></div>", unsafe_allow_html=True)
                 
-                # Slight boost to hypothesis scores when federated learning is on
-                for i in range(len(hypotheses)):
-                    hypotheses[i] = dict(hypotheses[i])  # Create a copy to avoid modifying the original
-                    hypotheses[i]['confidence'] = min(100, hypotheses[i]['confidence'] + random.randint(5, 10))
-                    hypotheses[i]['novelty'] = min(100, hypotheses[i]['novelty'] + random.randint(3, 8))
+                # Federated training over simulated partner sites
+                with st.expander("FEDERATION SIMULATOR"):
+                    n_sites = st.select_slider("PARTNER SITES", options=SITE_COUNTS, value=8, key="federation_sites")
+                    federation_key = result_key("federation", selected_disease, None, True, (n_sites,))
+                    if st.button("RUN SIMULATION", key="run_federation"):
+                        cache.get_or_compute(federation_key, lambda: run_federation(disease, n_sites))
+                    simulation = cache.get(federation_key)
+                    if simulation is not None:
+                        converged = f"CONVERGED IN ROUND {simulation.converged_round}" if simulation.converged_round else "NOT CONVERGED"
+                        st.caption(
+                            f"{simulation.n_samples:,} RECORDS · {n_sites} SITES · SETUP {simulation.setup_time:.2f}s · "
+                            f"{simulation.mean_round_time * 1000:.1f} ms/ROUND · {simulation.total_bytes / 1024:.1f} KB EXCHANGED · {converged}"
+                        )
+                        st.dataframe([vars(stats) for stats in simulation.rounds], hide_index=True, use_container_width=True)
             
-            # Display each hypothesis
-            for idx, hypothesis in enumerate(hypotheses):
-                with st.expander(f"HYPOTHESIS #{idx+1}: {hypothesis['title']}", expanded=(idx == 0)):
-                    st.markdown(f"""
-                    <div class="pixel-box" style="background-color:#121240;">
-                        <p style="font-family:Space Mono, monospace; color: #ffffff;">{hypothesis['description']}</p>
+            # Ranking controls; only the selected page is ranked and rendered
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                ranking_mode = st.selectbox("RANK BY", RANKING_MODES, key="ranking_mode")
+            weights = DEFAULT_WEIGHTS
+            if ranking_mode == WEIGHTED_SCORE:
+                with st.expander("SCORE WEIGHTS"):
+                    weight_cols = st.columns(3)
+                    weights = tuple(
+                        weight_col.slider(field.upper(), 0.0, 5.0, 1.0, step=0.5, key=f"weight_{field}")
+                        for weight_col, field in zip(weight_cols, SCORE_FIELDS)
+                    )
+            ranked = RankedView(hypotheses, ranking_mode, weights)
+            with col2:
+                page = st.number_input("PAGE", min_value=1, max_value=ranked.n_pages(), value=1) - 1
+            compact_view = st.checkbox("COMPACT VIEW", value=False, key="compact_view", help="Render the whole page as a single block without action buttons")
+            
+            page_items = ranked.page(page)
+            if page_items:
+                st.caption(f"SHOWING {page_items[0][0] + 1}-{page_items[-1][0] + 1} OF {len(ranked)} HYPOTHESES")
+            
+            # Display the page: one HTML fragment per card, or one for the
+            # whole page in compact view
+            page_ratings = get_evaluation_store().summaries(selected_disease, [h['title'] for _, _, h in page_items])
+            if compact_view:
+                st.markdown(hypothesis_page_html(page_items, agent_icons, ratings=page_ratings), unsafe_allow_html=True)
+            else:
+                for rank, idx, hypothesis in page_items:
+                    with st.expander(f"HYPOTHESIS #{rank+1}: {hypothesis['title']}", expanded=(rank == 0)):
+                        st.markdown(hypothesis_card_html(hypothesis, agent_icons, page_ratings.get(hypothesis['title'])), unsafe_allow_html=True)
                         
-                        <h4 style="color:#FFD700;font-family:VT323, monospace;">SUPPORTING EVIDENCE:</h4>
-                    """, unsafe_allow_html=True)
-                    
-                    for agent, evidence in hypothesis['supporting_evidence'].items():
-                        st.markdown(f"""
-                        <div style="margin:10px 0;">
-                            <span style="color:#FF4500;font-family:VT323, monospace;">{agent_icons[agent]} {agent}:</span>
-                            <div style="border-left:3px solid #FFD700;padding-left:10px;margin-top:5px;font-family:Space Mono, monospace;font-size:14px;color:#ffffff;background-color:#121240;">
-                                {evidence}
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # Metrics visualization
-                    st.markdown("<h4 style='color:#FFD700;font-family:VT323, monospace;'>HYPOTHESIS METRICS:</h4>", unsafe_allow_html=True)
-                    
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.markdown(f"""
-                        <div style="text-align:center;border:2px solid #FFD700;padding:10px;margin:5px;background:#121240;">
-                            <div style="font-family:VT323, monospace;color:#FFD700;">CONFIDENCE</div>
-                            <div style="font-size:30px;font-family:VT323, monospace;color:#FF4500;">{hypothesis['confidence']}%</div>
-                            <div style="width:100%;background:#333;height:10px;margin-top:5px;">
-                                <div style="width:{hypothesis['confidence']}%;background:#FFD700;height:10px;"></div>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col2:
-                        st.markdown(f"""
-                        <div style="text-align:center;border:2px solid #FFD700;padding:10px;margin:5px;background:#121240;">
-                            <div style="font-family:VT323, monospace;color:#FFD700;">NOVELTY</div>
-                            <div style="font-size:30px;font-family:VT323, monospace;color:#FF4500;">{hypothesis['novelty']}%</div>
-                            <div style="width:100%;background:#333;height:10px;margin-top:5px;">
-                                <div style="width:{hypothesis['novelty']}%;background:#FFD700;height:10px;"></div>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    with col3:
-                        st.markdown(f"""
-                        <div style="text-align:center;border:2px solid #FFD700;padding:10px;margin:5px;background:#121240;">
-                            <div style="font-family:VT323, monospace;color:#FFD700;">TESTABILITY</div>
-                            <div style="font-size:30px;font-family:VT323, monospace;color:#FF4500;">{hypothesis['testability']}%</div>
-                            <div style="width:100%;background:#333;height:10px;margin-top:5px;">
-                                <div style="width:{hypothesis['testability']}%;background:#FFD700;height:10px;"></div>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    st.markdown("</div>", unsafe_allow_html=True)
-                    
-                    # Quick action buttons for this hypothesis
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.button("FLAG AS HIGH POTENTIAL", key=f"high_potential_{idx}")
-                    with col2:
-                        st.button("REQUEST MORE EVIDENCE", key=f"more_evidence_{idx}")
+                        # Quick action buttons for this hypothesis
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            st.button("FLAG AS HIGH POTENTIAL", key=f"high_potential_{idx}")
+                        with col2:
+                            st.button("REQUEST MORE EVIDENCE", key=f"more_evidence_{idx}")
+        elif hypothesis_sets:
+            st.info("Press GENERATE HYPOTHESES for this selection.")
     
     # Tab 3: Hypothesis Evaluation
-    with tab3:
+    with tab3, STARTUP.section("evaluation tab"):
         st.markdown("<h2>HYPOTHESIS EVALUATION</h2>", unsafe_allow_html=True)
         
         st.markdown("""
@@ -779,17 +549,18 @@ def main():
         """, unsafe_allow_html=True)
         
         # Only show if hypotheses have been generated
-        if st.session_state.get('hypotheses_generated', False):
+        if hypotheses is not None:
             # Hypothesis selection for detailed evaluation
             selected_hypothesis = st.selectbox(
                 "SELECT HYPOTHESIS TO EVALUATE",
-                [h['title'] for h in disease_data[selected_disease]['hypotheses']],
+                [h['title'] for h in hypotheses],
                 key="hypothesis_evaluator"
             )
             
             # Get the selected hypothesis object
-            hypothesis = next((h for h in disease_data[selected_disease]['hypotheses'] if h['title'] == selected_hypothesis), None)
+            hypothesis = next((h for h in hypotheses if h['title'] == selected_hypothesis), None)
             
+            evaluation_store = get_evaluation_store()
             if hypothesis:
                 st.markdown(f"""
                 <div class="pixel-box" style="background-color:#111;">
@@ -797,6 +568,22 @@ def main():
                     <p style="font-family:Space Mono, monospace;">{hypothesis['description']}</p>
                 </div>
                 """, unsafe_allow_html=True)
+                ratings = ratings_html(evaluation_store.summary(selected_disease, hypothesis['title']))
+                if ratings:
+                    st.markdown(ratings, unsafe_allow_html=True)
+                
+                # Similar hypotheses from the rest of the catalog
+                with st.expander("RELATED HYPOTHESES IN OTHER DISEASES"):
+                    with st.spinner("INDEXING CATALOG..."):
+                        hypothesis_index = get_hypothesis_index()
+                    search_start = time.perf_counter()
+                    related = hypothesis_index.related(hypothesis, selected_disease)
+                    search_ms = (time.perf_counter() - search_start) * 1000
+                    if related:
+                        st.markdown(related_hypotheses_html(related), unsafe_allow_html=True)
+                    else:
+                        st.markdown("No related hypotheses in other diseases.")
+                    st.caption(f"{len(hypothesis_index):,} HYPOTHESES INDEXED · {search_ms:.1f} ms")
                 
                 # Evaluation form
                 st.markdown("<h3>RESEARCHER FEEDBACK</h3>", unsafe_allow_html=True)
@@ -817,7 +604,7 @@ def main():
                 
                 priority = st.select_slider(
                     "RESEARCH PRIORITY",
-                    options=["LOW", "MEDIUM", "HIGH", "VERY HIGH"],
+                    options=list(PRIORITIES),
                     value="HIGH",
                     help="Set priority level for further investigation"
                 )
@@ -830,73 +617,46 @@ def main():
                 
                 # Submit feedback button
                 if st.button("SUBMIT EVALUATION", key="submit_evaluation"):
-                    loading_animation("PROCESSING FEEDBACK", 2)
+                    evaluation = Evaluation(
+                        disease=selected_disease,
+                        hypothesis=hypothesis['title'],
+                        potential=potential_rating,
+                        novelty=novelty_rating,
+                        priority=priority,
+                        feedback=feedback,
+                        session=session_id(),
+                    )
+                    evaluation_store.submit(evaluation)
+                    rescorer = get_rescorer()
+                    rescorer.update(evaluation)
                     st.success("Evaluation submitted successfully! The AI system will incorporate your feedback.")
                     
-                    # Show random improvement suggestion
-                    improvements = [
-                        "Consider expanding the literature search to include recent preprints",
-                        "Additional clinical data could strengthen the correlation evidence",
-                        "Genomic data analysis suggests investigating pathway X more closely",
-                        "Similar patterns were observed in related disease models"
-                    ]
-                    
+                    # Suggestions derived from the accumulated evaluations
+                    suggestion_items = "".join(f'<p style="color:#FFD700;font-family:Space Mono, monospace;">"{escape(text)}"</p>' for text in rescorer.suggestions(selected_disease, hypothesis))
                     st.markdown(f"""
                     <div class="pixel-box" style="border-color:#FF4500;margin-top:20px;">
                         <h4 style="color:#FFD700;font-family:VT323, monospace;">AI SYSTEM RESPONSE:</h4>
                         <p>Based on your evaluation, the system suggests:</p>
-                        <p style="color:#FFD700;font-family:Space Mono, monospace;">"{random.choice(improvements)}"</p>
+                        {suggestion_items}
                     </div>
                     """, unsafe_allow_html=True)
             
             # Visualization of all hypotheses comparison
             st.markdown("<h3>HYPOTHESIS COMPARISON</h3>", unsafe_allow_html=True)
             
-            # Create comparison data
-            comparison_data = []
-            for h in disease_data[selected_disease]['hypotheses']:
-                comparison_data.append({
-                    "Hypothesis": h['title'][:20] + "...",
-                    "Confidence": h['confidence'],
-                    "Novelty": h['novelty'],
-                    "Testability": h['testability']
-                })
-            
-            # Use Altair to create a grouped bar chart with retro styling
-            chart_data = pd.DataFrame(comparison_data)
-            
-            # Reshape the data for Altair
-            chart_data_melted = pd.melt(
-                chart_data, 
-                id_vars=['Hypothesis'], 
-                value_vars=['Confidence', 'Novelty', 'Testability'],
-                var_name='Metric', 
-                value_name='Score'
-            )
-            
-            # Create the chart
-            chart = alt.Chart(chart_data_melted).mark_bar().encode(
-                x=alt.X('Hypothesis:N', title=None),
-                y=alt.Y('Score:Q', title='Score'),
-                color=alt.Color('Metric:N', scale=alt.Scale(
-                    domain=['Confidence', 'Novelty', 'Testability'],
-                    range=['#FFD700', '#FF4500', '#00BFFF']
-                )),
-                column=alt.Column('Metric:N', title=None)
-            ).properties(
-                width=150,
-                height=200
-            ).configure_view(
-                strokeWidth=0
-            ).configure_axis(
-                labelColor='#FFD700',
-                titleColor='#FFD700',
-                gridColor='#333333'
-            )
-            
-            st.altair_chart(chart, use_container_width=True)
+            # Scores are diffed into the session's per-disease table; the
+            # chart spec is rebuilt only when a score changed
+            comparison = comparison_analytics()
+            comparison.update(selected_disease, [h['title'] for h in hypotheses], ranked.matrix)
+            st.vega_lite_chart(comparison.spec(selected_disease), use_container_width=True)
         else:
             st.info("Generate hypotheses first to enable evaluation features.")
+    
+    # Startup profile, after the first run of the process
+    startup_report = STARTUP.finish()
+    if startup_report:
+        with st.sidebar.expander("STARTUP PROFILE"):
+            st.code(startup_report)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
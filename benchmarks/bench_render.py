@@ -0,0 +1,172 @@
+"""Headless benchmark of the app's render path.
+
+Drives ``app.py`` through Streamlit's ``AppTest`` (disease selection,
+PROCESS DATA, GENERATE HYPOTHESES, the federated toggle and SUBMIT
+EVALUATION) against synthetic catalogs and reports, per step, rerun latency
+percentiles, the number of elements in the page and the serialized size of
+their protos. A separate pass under ``tracemalloc`` reports peak memory.
+
+    python benchmarks/bench_render.py
+    python benchmarks/bench_render.py --sizes 3 300 --repeat 10 --json bench.json
+
+The evaluation database and the provenance store are pointed at a temporary
+directory before the app is first imported, so a run neither writes to
+``data/`` nor replays agent runs stored by earlier runs. Within a run, agent
+results are cached and replayed as they are in the app.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from bioforge.catalog import write_json_catalog, write_sqlite_catalog  # noqa: E402
+from bioforge.synthetic import synthetic_catalog  # noqa: E402
+
+DEFAULT_SIZES = (3, 300, 30000)
+
+
+def walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from walk(child)
+
+
+def page_stats(at):
+    nodes = list(walk(at._tree))
+    payload = sum(
+        node.proto.ByteSize()
+        for node in nodes
+        if getattr(node, "proto", None) is not None and hasattr(node.proto, "ByteSize")
+    )
+    return len(nodes), payload
+
+
+def federated_checkbox(at):
+    return next(c for c in at.checkbox if c.label.startswith("ENABLE FEDERATED"))
+
+
+def scenario(at, diseases):
+    # (step name, action) pairs; every action is followed by a rerun
+    for disease in diseases:
+        yield "select disease", lambda d=disease: at.selectbox(key="disease_selector").select(d)
+        yield "process data", lambda: at.button(key="process_data").click()
+        yield "generate hypotheses", lambda: at.button(key="generate_hypotheses").click()
+        yield "federated on", lambda: federated_checkbox(at).check()
+        yield "generate federated", lambda: at.button(key="generate_hypotheses").click()
+        yield "submit evaluation", lambda: at.button(key="submit_evaluation").click()
+        yield "federated off", lambda: federated_checkbox(at).uncheck()
+
+
+def run_app(catalog_path, repeat, timeout):
+    # Returns {step: {"latency": [...], "elements": n, "payload": bytes}}
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    os.environ["BIOFORGE_CATALOG"] = str(catalog_path)
+
+    results = {}
+    start = time.perf_counter()
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=timeout).run()
+    results["first render"] = {"latency": [time.perf_counter() - start]}
+    results["first render"]["elements"], results["first render"]["payload"] = page_stats(at)
+
+    diseases = list(at.selectbox(key="disease_selector").options)[:2]
+    for _ in range(repeat):
+        for step, action in scenario(at, diseases):
+            action()
+            start = time.perf_counter()
+            at.run()
+            elapsed = time.perf_counter() - start
+            if at.exception:
+                raise RuntimeError(f"{step}: {at.exception[0].message}")
+            entry = results.setdefault(step, {"latency": []})
+            entry["latency"].append(elapsed)
+            entry["elements"], entry["payload"] = page_stats(at)
+    return results
+
+
+def peak_memory(catalog_path, timeout):
+    tracemalloc.start()
+    try:
+        run_app(catalog_path, 1, timeout)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(size, results, peak):
+    rows = []
+    for step, entry in results.items():
+        latency = np.asarray(entry["latency"]) * 1000.0
+        rows.append({
+            "hypotheses": size,
+            "step": step,
+            "runs": len(latency),
+            "p50_ms": float(np.percentile(latency, 50)),
+            "p95_ms": float(np.percentile(latency, 95)),
+            "max_ms": float(latency.max()),
+            "elements": entry["elements"],
+            "payload_bytes": entry["payload"],
+            "peak_memory_bytes": peak,
+        })
+    return rows
+
+
+def print_rows(rows):
+    header = f"{'hypotheses':>10}  {'step':<20} {'runs':>4} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'elements':>8} {'payload KB':>10} {'peak MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['hypotheses']:>10}  {row['step']:<20} {row['runs']:>4} {row['p50_ms']:>9.1f} "
+            f"{row['p95_ms']:>9.1f} {row['max_ms']:>9.1f} {row['elements']:>8} "
+            f"{row['payload_bytes'] / 1024:>10.1f} {row['peak_memory_bytes'] / 2**20:>8.1f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="total hypotheses per synthetic catalog")
+    parser.add_argument("--diseases", type=int, default=3, help="diseases per synthetic catalog")
+    parser.add_argument("--repeat", type=int, default=5, help="scenario repetitions per catalog")
+    parser.add_argument("--format", choices=("json", "sqlite"), default="json", help="catalog storage format")
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds allowed per rerun")
+    parser.add_argument("--json", dest="json_path", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["BIOFORGE_EVALUATIONS"] = str(Path(tmp) / "evaluations.sqlite")
+        os.environ["BIOFORGE_PROVENANCE"] = str(Path(tmp) / "provenance")
+        for size in args.sizes:
+            records = synthetic_catalog(size, n_diseases=args.diseases)
+            if args.format == "sqlite":
+                catalog_path = Path(tmp) / f"catalog-{size}.sqlite"
+                write_sqlite_catalog(records, catalog_path)
+            else:
+                catalog_path = Path(tmp) / f"catalog-{size}"
+                write_json_catalog(records, catalog_path)
+            results = run_app(catalog_path, args.repeat, args.timeout)
+            peak = peak_memory(catalog_path, args.timeout)
+            rows.extend(summarize(size, results, peak))
+
+    print_rows(rows)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Core building blocks behind the BioForge Agents Interactive app."""
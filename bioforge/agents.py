@@ -0,0 +1,340 @@
+"""Multi-agent runtime.
+
+Agents are pluggable workers registered by name. ``AgentRuntime`` runs every
+agent of a query concurrently on a shared thread pool, enforces a timeout per
+agent and yields each ``AgentResult`` as soon as that agent finishes, so the
+wall-clock time of a run is that of the slowest agent rather than the sum.
+An agent's timeout counts from when its call starts, not from when it was
+queued. A timed-out call cannot be interrupted; it keeps its thread until it
+returns, and the pool holds ``abandoned_workers`` threads (one per agent by
+default) on top of ``max_workers`` for such calls. An agent whose timed-out call is still running
+is not started again, so stuck calls never take more than one thread per
+agent.
+Given a ``ProvenanceStore``, a run whose inputs were seen before is served
+from the store, and every result carries the key of its provenance record.
+"""
+
+import importlib
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from bioforge.provenance import canonical_json, digest
+from bioforge.telemetry import TELEMETRY
+
+DEFAULT_TIMEOUT = 30.0
+
+# Seconds between checks for queued agents that have started
+QUEUE_POLL = 0.05
+
+
+@dataclass
+class AgentContext:
+    disease: object
+    question: str = None
+    federated: bool = False
+    params: dict = field(default_factory=dict)
+    # Optional ProgressTracker; agents may add_total()/advance() from workers
+    progress: object = None
+    # Optional bioforge.planner.ScanFilters to push down into data scans
+    filters: object = None
+    # Names of agents whose data scans the query plan pruned; they only
+    # serve their catalog findings
+    catalog_only: frozenset = frozenset()
+
+
+@dataclass
+class AgentOutput:
+    # Findings plus activity metrics (see bioforge.telemetry.METRIC_FIELDS)
+    findings: list
+    metrics: dict = field(default_factory=dict)
+    # {keyword: evidence text}, strongest first; attach_evidence() puts the
+    # text in the supporting_evidence of hypotheses mentioning the keyword
+    evidence: dict = field(default_factory=dict)
+
+
+@dataclass
+class AgentResult:
+    agent: str
+    findings: list
+    status: str = "ok"
+    elapsed: float = 0.0
+    error: str = None
+    metrics: dict = field(default_factory=dict)
+    evidence: dict = field(default_factory=dict)
+    # Key of the run's record in the provenance store, if any
+    provenance: str = None
+    # Served from the provenance store rather than recomputed
+    replayed: bool = False
+
+    @property
+    def ok(self):
+        return self.status == "ok"
+
+    @property
+    def skipped(self):
+        # Not run because the query plan routed the question elsewhere
+        return self.status == "skipped"
+
+
+class Agent:
+    name = "Agent"
+    icon = "🤖"
+    timeout = DEFAULT_TIMEOUT
+    # Word stems of research questions this agent's data scans answer; an
+    # agent without topics is relevant to every question
+    topics = ()
+    # Whether the agent can answer from the disease catalog alone, so the
+    # planner prunes its scans instead of skipping it
+    catalog_fallback = False
+    # Data sources the agent reads, for the agent network diagram
+    sources = ()
+
+    def relevant(self, filters):
+        return not self.topics or filters.mentions(self.topics)
+
+    def provenance_inputs(self, context, store):
+        # {dataset: fingerprint} of the data a run for this context reads;
+        # see bioforge.provenance.ProvenanceStore.dataset_hash
+        return {}
+
+    def run(self, context):
+        # Return an AgentOutput, or a plain list of finding strings
+        raise NotImplementedError
+
+
+class CatalogFindingsAgent(Agent):
+    # Serves the findings recorded for this agent in the disease catalog
+    sources = ("Disease catalog",)
+    catalog_fallback = True
+
+    def scans(self, context):
+        # Whether a data-backed subclass may scan its data for this context
+        return self.name not in context.catalog_only
+
+    def provenance_inputs(self, context, store):
+        return {"Disease catalog": digest(canonical_json(context.disease.agents.get(self.name, [])))}
+
+    def run(self, context):
+        findings = list(context.disease.agents.get(self.name, []))
+        return AgentOutput(findings, {"documents_scanned": len(findings)})
+
+
+AGENT_REGISTRY = OrderedDict()
+
+# (module, class) of the built-in agents. Agents backed by their own data
+# live in their own modules, which import this one, so they are loaded on
+# first use of the registry rather than at import time.
+DEFAULT_AGENTS = (
+    ("bioforge.literature", "LiteratureMiningAgent"),
+    ("bioforge.genomics", "GenomicDataAnalysisAgent"),
+    ("bioforge.clinical", "ClinicalDataIntegrationAgent"),
+)
+_defaults_loaded = False
+
+
+def register_agent(agent):
+    # Register an agent instance (or class) under its name, replacing any
+    # previous agent with the same name
+    if isinstance(agent, type):
+        agent = agent()
+    AGENT_REGISTRY[agent.name] = agent
+    return agent
+
+
+def load_default_agents():
+    # Register the built-in agents not already registered under their name
+    global _defaults_loaded
+    if _defaults_loaded:
+        return
+    _defaults_loaded = True
+    for module, name in DEFAULT_AGENTS:
+        agent = getattr(importlib.import_module(module), name)
+        if agent.name not in AGENT_REGISTRY:
+            register_agent(agent)
+
+
+def registered_agents():
+    load_default_agents()
+    return list(AGENT_REGISTRY.values())
+
+
+class AgentRuntime:
+    def __init__(self, agents=None, max_workers=8, telemetry=TELEMETRY, provenance=None,
+                 abandoned_workers=None):
+        self.agents = list(agents) if agents is not None else registered_agents()
+        if abandoned_workers is None:
+            # Room for one stuck call per agent
+            abandoned_workers = len(self.agents)
+        self.telemetry = telemetry
+        # Optional bioforge.provenance.ProvenanceStore
+        self.provenance = provenance
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers + abandoned_workers, thread_name_prefix="bioforge-agent",
+        )
+        # agent name -> future of its timed-out call, while it still runs
+        self._abandoned = {}
+
+    def config_key(self):
+        # Identifies the agent set for result caching
+        return tuple((agent.name, type(agent).__name__, agent.timeout) for agent in self.agents)
+
+    def _call(self, agent, context, started=None):
+        # (output, metrics, elapsed, provenance key, replayed); the start time
+        # is stored in started[agent.name] for the caller's deadline
+        start = time.perf_counter()
+        if started is not None:
+            started[agent.name] = start
+        key = None
+        if self.provenance is not None:
+            key, inputs = self.provenance.run_key(agent, context)
+            stored = self.provenance.load(key)
+            if stored is not None:
+                elapsed = time.perf_counter() - start
+                output = AgentOutput(stored["findings"], stored["metrics"], dict(stored["evidence"]))
+                metrics = dict(output.metrics, latency_ms=elapsed * 1000.0)
+                if self.telemetry is not None:
+                    # The stored run's metrics, flagged so work charts skip it
+                    self.telemetry.record(agent.name, dict(metrics, replayed=1))
+                return output, metrics, elapsed, key, True
+        output = agent.run(context)
+        elapsed = time.perf_counter() - start
+        if not isinstance(output, AgentOutput):
+            output = AgentOutput(list(output))
+        metrics = dict(output.metrics, latency_ms=elapsed * 1000.0)
+        if self.telemetry is not None:
+            self.telemetry.record(agent.name, metrics)
+        if key is not None:
+            # Evidence is stored as pairs to keep its strongest-first order
+            self.provenance.save(key, inputs, {
+                "findings": list(output.findings),
+                "metrics": output.metrics,
+                "evidence": list(output.evidence.items()),
+            })
+        return output, metrics, elapsed, key, False
+
+    def run(self, context, agents=None, progress=None):
+        # Yield AgentResults in completion order. A ProgressTracker, if given,
+        # is advanced once per finished agent and refreshed while waiting so
+        # work reported from agent threads reaches the UI.
+        agents = list(agents) if agents is not None else self.agents
+        poll = progress.min_interval if progress is not None and progress.min_interval else None
+        # agent name -> perf_counter time its call started
+        started = {}
+        pending = {}
+        for agent in agents:
+            stuck = self._abandoned.get(agent.name)
+            if stuck is not None and not stuck.done():
+                if progress is not None:
+                    progress.advance(label=agent.name)
+                yield AgentResult(
+                    agent.name, [], status="timeout",
+                    error=f"An earlier call timed out after {agent.timeout:g}s and is still running",
+                )
+                continue
+            future = self.executor.submit(self._call, agent, context, started)
+            pending[future] = agent
+
+        while pending:
+            deadlines = [started[a.name] + a.timeout for a in pending.values() if a.name in started]
+            timeout = max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None
+            if len(deadlines) < len(pending):
+                # Some agents are still queued; their deadlines are not known yet
+                timeout = QUEUE_POLL if timeout is None else min(timeout, QUEUE_POLL)
+            if poll is not None:
+                timeout = poll if timeout is None else min(timeout, poll)
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                agent = pending.pop(future)
+                try:
+                    output, metrics, elapsed, key, replayed = future.result()
+                except Exception as exc:
+                    result = AgentResult(
+                        agent.name, [], status="error",
+                        elapsed=time.perf_counter() - started[agent.name], error=str(exc),
+                    )
+                else:
+                    result = AgentResult(
+                        agent.name, output.findings, elapsed=elapsed,
+                        metrics=metrics, evidence=output.evidence,
+                        provenance=key, replayed=replayed,
+                    )
+                if progress is not None:
+                    progress.advance(label=agent.name)
+                yield result
+
+            now = time.perf_counter()
+            for future, agent in list(pending.items()):
+                start = started.get(agent.name)
+                if start is not None and now >= start + agent.timeout:
+                    # The worker thread cannot be interrupted; drop its result
+                    # and keep the agent from starting again until it returns
+                    del pending[future]
+                    self._abandoned[agent.name] = future
+                    future.add_done_callback(lambda f, name=agent.name: self._release(name, f))
+                    if progress is not None:
+                        progress.advance(label=agent.name)
+                    yield AgentResult(
+                        agent.name, [], status="timeout",
+                        elapsed=now - start, error=f"Timed out after {agent.timeout:g}s",
+                    )
+            if progress is not None:
+                progress.refresh()
+
+    def _release(self, name, future):
+        if self._abandoned.get(name) is future:
+            del self._abandoned[name]
+
+    def run_all(self, context, agents=None):
+        return list(self.run(context, agents=agents))
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def attach_evidence(hypotheses, results, catalog=None):
+    # Copies of the hypotheses whose supporting_evidence entry for an agent is
+    # replaced by that agent's strongest evidence whose keyword appears in the
+    # title or description. Copies also map every evidence entry that came
+    # from a run (its evidence or one of its findings) to the run's provenance
+    # key under "provenance"; any other entry came from the disease catalog
+    # and maps to catalog, the record's key (ProvenanceStore.catalog_key), if
+    # given. Hypotheses left unchanged are returned as is.
+    results = [result for result in results if result.ok]
+    matchers = []
+    for result in results:
+        if result.evidence:
+            keywords = sorted(result.evidence, key=len, reverse=True)
+            pattern = re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b", re.IGNORECASE)
+            lookup = {k.lower(): rank for rank, k in enumerate(result.evidence)}
+            matchers.append((result.agent, pattern, lookup, list(result.evidence.values())))
+    # agent -> (key, texts of the run)
+    runs = {
+        result.agent: (result.provenance, set(result.findings) | set(result.evidence.values()))
+        for result in results if result.provenance
+    }
+    if not matchers and not runs and not catalog:
+        return hypotheses
+
+    attached = []
+    for hypothesis in hypotheses:
+        text = f"{hypothesis['title']} {hypothesis['description']}"
+        evidence = dict(hypothesis.get("supporting_evidence") or {})
+        for agent, pattern, lookup, texts in matchers:
+            ranks = [lookup[m.group(0).lower()] for m in pattern.finditer(text)]
+            if ranks:
+                evidence[agent] = texts[min(ranks)]
+        provenance = dict(hypothesis.get("provenance") or {})
+        for agent, line in evidence.items():
+            key, texts = runs.get(agent, (None, ()))
+            if line in texts:
+                provenance[agent] = key
+            elif catalog:
+                provenance[agent] = catalog
+            elif agent in runs:
+                provenance.pop(agent, None)
+        changed = evidence != hypothesis.get("supporting_evidence", {}) or provenance != hypothesis.get("provenance", {})
+        attached.append(dict(hypothesis, supporting_evidence=evidence, provenance=provenance) if changed else hypothesis)
+    return attached
@@ -0,0 +1,141 @@
+"""Static assets: stylesheet, fonts and generated images.
+
+Sources live in ``assets/`` (``bioforge.css`` and ``fonts/*.ttf``). At
+start-up ``publish`` copies new or changed files into ``static/``, which
+Streamlit serves at ``/<server.baseUrlPath>/app/static/`` when
+``server.enableStaticServing`` is on (see ``.streamlit/config.toml``). The
+page then links the stylesheet instead of re-sending it on every rerun, and
+nothing is fetched from the network: the fonts are declared with
+``@font-face`` over the bundled files, falling back to installed fonts.
+
+Without static serving the stylesheet is inlined. Its relative font URLs
+would then resolve against the page, so the bundled fonts are embedded as
+data URIs instead (and dropped when missing, leaving the installed fonts).
+
+Generated images (e.g. the agent network SVG) are published under a name
+derived from their content, so browsers can cache them indefinitely.
+
+The font files (SIL Open Font License) are not in the repository, so a fresh
+checkout renders with installed fallback fonts. Fetch them, with their
+license texts, on a machine with network access with
+``python -m bioforge.assets --fetch-fonts`` (or copy the ``.ttf`` files into
+``assets/fonts/``) before deploying; ``python -m bioforge.assets`` lists
+the fonts still missing.
+"""
+
+import argparse
+import hashlib
+import re
+import shutil
+from functools import lru_cache
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+ASSETS_DIR = ROOT / "assets"
+STATIC_DIR = ROOT / "static"
+# URL path Streamlit serves STATIC_DIR under, below server.baseUrlPath
+STATIC_PATH = "app/static"
+
+STYLESHEET = "bioforge.css"
+FONTS = {
+    "VT323-Regular.ttf": "https://github.com/google/fonts/raw/main/ofl/vt323/VT323-Regular.ttf",
+    "SpaceMono-Regular.ttf": "https://github.com/google/fonts/raw/main/ofl/spacemono/SpaceMono-Regular.ttf",
+}
+# License text fetched with each font
+LICENSES = {
+    "VT323-OFL.txt": "https://github.com/google/fonts/raw/main/ofl/vt323/OFL.txt",
+    "SpaceMono-OFL.txt": "https://github.com/google/fonts/raw/main/ofl/spacemono/OFL.txt",
+}
+PUBLISHED = (STYLESHEET,) + tuple(f"fonts/{name}" for name in FONTS)
+
+# A bundled font source in the stylesheet, with the separator before it
+FONT_SOURCE = re.compile(r"\s*,\s*url\('(fonts/[^']+)'\)\s*format\('([^']+)'\)")
+
+
+def static_url(base_path=""):
+    # Absolute URL path of STATIC_DIR for a server.baseUrlPath
+    return "/" + "/".join(part for part in (base_path.strip("/"), STATIC_PATH) if part)
+
+
+def publish(assets_dir=ASSETS_DIR, static_dir=STATIC_DIR):
+    # Copy the asset files that are missing or out of date in static_dir;
+    # returns the published relative paths
+    assets_dir, static_dir = Path(assets_dir), Path(static_dir)
+    published = []
+    for name in PUBLISHED:
+        source, target = assets_dir / name, static_dir / name
+        if not source.exists():
+            continue
+        stat = source.stat()
+        if not target.exists() or target.stat().st_size != stat.st_size or target.stat().st_mtime < stat.st_mtime:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+        published.append(name)
+    return published
+
+
+def publish_generated(content, suffix, static_dir=STATIC_DIR, base_path=""):
+    # Write generated content under a content-addressed name; returns its URL
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    name = f"gen-{hashlib.sha256(data).hexdigest()[:16]}{suffix}"
+    path = Path(static_dir) / name
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(path.suffix + ".tmp")
+        temporary.write_bytes(data)
+        temporary.replace(path)
+    return f"{static_url(base_path)}/{name}"
+
+
+def stylesheet_html(static_serving, assets_dir=ASSETS_DIR, base_path=""):
+    # A <link> to the published stylesheet, or the stylesheet inlined when
+    # static files are not served
+    if static_serving:
+        return f'<link rel="stylesheet" href="{static_url(base_path)}/{STYLESHEET}">'
+    return f"<style>{inline_stylesheet(str(assets_dir))}</style>"
+
+
+@lru_cache(maxsize=None)
+def inline_stylesheet(assets_dir=str(ASSETS_DIR)):
+    # The stylesheet with its bundled fonts embedded as data URIs
+    import base64
+
+    def embed(match):
+        path = Path(assets_dir) / match.group(1)
+        if not path.exists():
+            return ""
+        data = base64.b64encode(path.read_bytes()).decode("ascii")
+        return f", url('data:font/ttf;base64,{data}') format('{match.group(2)}')"
+
+    return FONT_SOURCE.sub(embed, (Path(assets_dir) / STYLESHEET).read_text(encoding="utf-8"))
+
+
+def fetch_fonts(assets_dir=ASSETS_DIR):
+    # Only used offline, so the app does not import urllib at start-up
+    import urllib.request
+
+    fonts_dir = Path(assets_dir) / "fonts"
+    fonts_dir.mkdir(parents=True, exist_ok=True)
+    for name, url in {**FONTS, **LICENSES}.items():
+        path = fonts_dir / name
+        if not path.exists():
+            with urllib.request.urlopen(url, timeout=30) as response:
+                path.write_bytes(response.read())
+            print(f"fetched {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fetch-fonts", action="store_true", help="download the bundled fonts into assets/fonts/")
+    args = parser.parse_args(argv)
+    if args.fetch_fonts:
+        fetch_fonts()
+    for name in publish():
+        print(f"published static/{name}")
+    for name in FONTS:
+        if not (ASSETS_DIR / "fonts" / name).exists():
+            print(f"missing assets/fonts/{name}; run with --fetch-fonts to download it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Process-wide result cache for agent runs and hypothesis sets.
+
+Entries are keyed by ``(kind, disease, research question, federated flag,
+agent config)`` and shared by every session in the process, so a query that
+any session already ran returns at once. The cache is bounded by an
+estimate of the pickled size of its values (least recently used entries are
+evicted first) and every entry expires after a TTL.
+"""
+
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+DEFAULT_MAX_BYTES = int(os.environ.get("BIOFORGE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+DEFAULT_TTL = float(os.environ.get("BIOFORGE_CACHE_TTL", 3600))
+
+
+def result_key(kind, disease, question, federated=False, config=()):
+    return (kind, disease, question, bool(federated), tuple(config))
+
+
+def estimate_size(value):
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+@dataclass
+class _Entry:
+    value: object
+    size: int
+    expires: float
+
+
+class ResultCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= self.clock():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key, value, size=None, ttl=None):
+        size = estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            # Never cache something that would evict everything else
+            return value
+        expires = self.clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, size, expires)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute())
+        return value
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
+
+    def purge_expired(self):
+        now = self.clock()
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.expires <= now]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,302 @@
+"""Disease knowledge store.
+
+Catalogs live under ``data/`` and are loaded lazily, one disease at a time.
+Two on-disk layouts are supported:
+
+* a JSON directory with an ``index.json`` listing disease names and one
+  ``<slug>.json`` file per disease, and
+* a single SQLite database (``*.sqlite`` / ``*.db``) for large catalogs.
+
+Only the disease names are read up front (they populate the sidebar); the
+description, research questions, agent findings and hypotheses of a disease
+are read when it is selected.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent.parent / "data" / "catalog"
+
+# Number of fully loaded diseases kept in memory per catalog
+DEFAULT_CACHE_SIZE = 32
+
+
+class CatalogError(LookupError):
+    pass
+
+
+def slugify(name):
+    slug = re.sub(r"[^a-z0-9]+", "-", name.lower().replace("'", "")).strip("-")
+    return slug or "disease"
+
+
+@dataclass
+class DiseaseRecord:
+    name: str
+    description: str
+    research_questions: list
+    agents: dict
+    hypotheses: list
+    federated_improvements: list = field(default_factory=list)
+    question_index: dict = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        if not self.question_index:
+            self.question_index = build_question_index(self.research_questions, self.hypotheses)
+
+    def hypotheses_for(self, question=None):
+        # Hypotheses relevant to a research question (all of them if none given)
+        if question is None or question not in self.question_index:
+            return self.hypotheses
+        return [self.hypotheses[i] for i in self.question_index[question]]
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "description": self.description,
+            "research_questions": self.research_questions,
+            "agents": self.agents,
+            "hypotheses": self.hypotheses,
+            "federated_improvements": self.federated_improvements,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            name=data["name"],
+            description=data.get("description", ""),
+            research_questions=list(data.get("research_questions", [])),
+            agents=dict(data.get("agents", {})),
+            hypotheses=list(data.get("hypotheses", [])),
+            federated_improvements=list(data.get("federated_improvements", [])),
+        )
+
+
+def build_question_index(research_questions, hypotheses):
+    # Map research question -> hypothesis positions. Hypotheses may list the
+    # questions they address under "research_questions"; untagged ones apply
+    # to every question of the disease.
+    index = {question: [] for question in research_questions}
+    for position, hypothesis in enumerate(hypotheses):
+        tagged = hypothesis.get("research_questions")
+        for question in (tagged or research_questions):
+            index.setdefault(question, []).append(position)
+    return index
+
+
+class JsonCatalogStore:
+    def __init__(self, root):
+        self.root = Path(root)
+        self._index = None
+
+    def _load_index(self):
+        if self._index is None:
+            with open(self.root / "index.json", encoding="utf-8") as f:
+                entries = json.load(f)["diseases"]
+            self._index = OrderedDict((entry["name"], entry["file"]) for entry in entries)
+        return self._index
+
+    def names(self):
+        return list(self._load_index().keys())
+
+    def load(self, name):
+        index = self._load_index()
+        if name not in index:
+            raise CatalogError(f"Unknown disease: {name}")
+        with open(self.root / index[name], encoding="utf-8") as f:
+            return DiseaseRecord.from_dict(json.load(f))
+
+
+class SqliteCatalogStore:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _connect(self):
+        # sqlite3 connections cannot be shared across Streamlit script threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def names(self):
+        rows = self._connect().execute("SELECT name FROM diseases ORDER BY position")
+        return [name for (name,) in rows]
+
+    def load(self, name):
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT id, description FROM diseases WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            raise CatalogError(f"Unknown disease: {name}")
+        disease_id, description = row
+
+        questions = [q for (q,) in conn.execute(
+            "SELECT question FROM research_questions WHERE disease_id = ? ORDER BY position",
+            (disease_id,),
+        )]
+        agents = OrderedDict()
+        for agent, finding in conn.execute(
+            "SELECT agent, finding FROM agent_findings WHERE disease_id = ? ORDER BY position",
+            (disease_id,),
+        ):
+            agents.setdefault(agent, []).append(finding)
+        hypotheses = [
+            json.loads(payload)
+            for (payload,) in conn.execute(
+                "SELECT payload FROM hypotheses WHERE disease_id = ? ORDER BY position",
+                (disease_id,),
+            )
+        ]
+        improvements = [text for (text,) in conn.execute(
+            "SELECT improvement FROM federated_improvements WHERE disease_id = ? ORDER BY position",
+            (disease_id,),
+        )]
+        return DiseaseRecord(
+            name=name,
+            description=description,
+            research_questions=questions,
+            agents=dict(agents),
+            hypotheses=hypotheses,
+            federated_improvements=improvements,
+        )
+
+
+class DiseaseCatalog:
+    def __init__(self, store, cache_size=DEFAULT_CACHE_SIZE):
+        self.store = store
+        self.cache_size = cache_size
+        self._names = None
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+
+    def names(self):
+        if self._names is None:
+            self._names = self.store.names()
+        return self._names
+
+    def get(self, name):
+        with self._lock:
+            if name in self._loaded:
+                self._loaded.move_to_end(name)
+                return self._loaded[name]
+        record = self.store.load(name)
+        with self._lock:
+            self._loaded[name] = record
+            while len(self._loaded) > self.cache_size:
+                self._loaded.popitem(last=False)
+        return record
+
+    def iter_hypotheses(self):
+        # (disease name, hypothesis) for every disease; records not already
+        # cached are loaded without evicting the cached ones
+        for name in self.names():
+            with self._lock:
+                record = self._loaded.get(name)
+            if record is None:
+                record = self.store.load(name)
+            for hypothesis in record.hypotheses:
+                yield name, hypothesis
+
+    def __contains__(self, name):
+        return name in self.names()
+
+    def __len__(self):
+        return len(self.names())
+
+
+def open_catalog(path=DEFAULT_CATALOG_PATH, cache_size=DEFAULT_CACHE_SIZE):
+    path = Path(path)
+    if path.is_dir():
+        store = JsonCatalogStore(path)
+    elif path.suffix in (".sqlite", ".sqlite3", ".db"):
+        store = SqliteCatalogStore(path)
+    else:
+        raise CatalogError(f"Unsupported catalog location: {path}")
+    return DiseaseCatalog(store, cache_size=cache_size)
+
+
+def write_json_catalog(records, root):
+    # Write DiseaseRecords (or plain dicts) as a JSON directory catalog
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    entries = []
+    used = set()
+    for record in records:
+        data = record.to_dict() if isinstance(record, DiseaseRecord) else record
+        slug = slugify(data["name"])
+        while slug in used:
+            slug += "-x"
+        used.add(slug)
+        filename = f"{slug}.json"
+        with open(root / filename, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        entries.append({"name": data["name"], "file": filename})
+    with open(root / "index.json", "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "diseases": entries}, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def write_sqlite_catalog(records, path):
+    # Write DiseaseRecords (or plain dicts) into a SQLite catalog
+    path = Path(path)
+    if path.exists():
+        path.unlink()
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executescript("""
+            CREATE TABLE diseases (
+                id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL,
+                description TEXT, position INTEGER
+            );
+            CREATE TABLE research_questions (disease_id INTEGER, position INTEGER, question TEXT);
+            CREATE TABLE agent_findings (disease_id INTEGER, position INTEGER, agent TEXT, finding TEXT);
+            CREATE TABLE hypotheses (disease_id INTEGER, position INTEGER, title TEXT, payload TEXT);
+            CREATE TABLE federated_improvements (disease_id INTEGER, position INTEGER, improvement TEXT);
+        """)
+        for position, record in enumerate(records):
+            data = record.to_dict() if isinstance(record, DiseaseRecord) else record
+            cursor = conn.execute(
+                "INSERT INTO diseases (name, description, position) VALUES (?, ?, ?)",
+                (data["name"], data.get("description", ""), position),
+            )
+            disease_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO research_questions VALUES (?, ?, ?)",
+                [(disease_id, i, q) for i, q in enumerate(data.get("research_questions", []))],
+            )
+            findings = [
+                (agent, finding)
+                for agent, items in data.get("agents", {}).items()
+                for finding in items
+            ]
+            conn.executemany(
+                "INSERT INTO agent_findings VALUES (?, ?, ?, ?)",
+                [(disease_id, i, agent, finding) for i, (agent, finding) in enumerate(findings)],
+            )
+            conn.executemany(
+                "INSERT INTO hypotheses VALUES (?, ?, ?, ?)",
+                [
+                    (disease_id, i, h["title"], json.dumps(h, ensure_ascii=False))
+                    for i, h in enumerate(data.get("hypotheses", []))
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO federated_improvements VALUES (?, ?, ?)",
+                [(disease_id, i, text) for i, text in enumerate(data.get("federated_improvements", []))],
+            )
+        conn.executescript("""
+            CREATE INDEX idx_questions_disease ON research_questions (disease_id, position);
+            CREATE INDEX idx_findings_disease ON agent_findings (disease_id, position);
+            CREATE INDEX idx_hypotheses_disease ON hypotheses (disease_id, position);
+            CREATE INDEX idx_improvements_disease ON federated_improvements (disease_id, position);
+        """)
+    conn.close()
@@ -0,0 +1,102 @@
+"""Agent activity charts.
+
+Charts are rendered once per (agent, data) pair and the resulting bytes or
+Vega-Lite spec are cached, so a rerun with unchanged data costs a dictionary
+lookup. Raster charts are drawn on a themed ``matplotlib.figure.Figure`` that
+is recycled per thread; figures never enter pyplot's global registry, so
+nothing accumulates in long-lived sessions.
+"""
+
+import io
+import os
+import threading
+from functools import lru_cache
+
+# Retro theme shared by every agent chart
+THEME = {
+    "background": "#000000",
+    "bar": "#FFD700",
+    "edge": "#FF4500",
+    "text": "#FFD700",
+}
+FIGSIZE = (5, 2)
+DPI = 100
+CACHE_SIZE = 256
+
+# "png", "svg" or "vega"
+CHART_BACKEND = os.environ.get("BIOFORGE_CHART_BACKEND", "png")
+
+_local = threading.local()
+
+
+def _figure():
+    # One themed figure per thread, cleared and reused for every render
+    fig = getattr(_local, "figure", None)
+    if fig is None:
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=FIGSIZE, dpi=DPI)
+        fig.patch.set_facecolor(THEME["background"])
+        fig.add_subplot(1, 1, 1)
+        _local.figure = fig
+    return fig
+
+
+def _apply_theme(ax, title):
+    ax.set_facecolor(THEME["background"])
+    ax.set_title(title, color=THEME["text"], fontfamily="monospace")
+    ax.tick_params(colors=THEME["text"])
+    for spine in ax.spines.values():
+        spine.set_color(THEME["text"])
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _render(agent, values, title, fmt):
+    fig = _figure()
+    ax = fig.axes[0]
+    ax.clear()
+    _apply_theme(ax, title)
+    ax.bar(range(len(values)), values, color=THEME["bar"], edgecolor=THEME["edge"], linewidth=2)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, facecolor=fig.get_facecolor())
+    return buffer.getvalue()
+
+
+def activity_chart_png(agent, values, title="Activity Metrics"):
+    return _render(agent, tuple(float(v) for v in values), title, "png")
+
+
+def activity_chart_svg(agent, values, title="Activity Metrics"):
+    # Inline <svg> markup without the XML prolog, ready to embed in HTML
+    svg = _render(agent, tuple(float(v) for v in values), title, "svg").decode("utf-8")
+    return svg[svg.index("<svg"):]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _spec(agent, values, title):
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "title": {"text": title, "color": THEME["text"], "font": "monospace"},
+        "background": THEME["background"],
+        "height": 140,
+        "data": {"values": [{"step": i, "value": v} for i, v in enumerate(values)]},
+        "mark": {"type": "bar", "color": THEME["bar"], "stroke": THEME["edge"], "strokeWidth": 2},
+        "encoding": {
+            "x": {"field": "step", "type": "ordinal", "title": None},
+            "y": {"field": "value", "type": "quantitative", "title": None},
+        },
+        "config": {
+            "view": {"stroke": THEME["text"]},
+            "axis": {"labelColor": THEME["text"], "domainColor": THEME["text"], "tickColor": THEME["text"], "gridColor": "#333333"},
+        },
+    }
+
+
+def activity_chart_spec(agent, values, title="Activity Metrics"):
+    # Vega-Lite spec with the data inlined; treat the returned dict as read-only
+    return _spec(agent, tuple(float(v) for v in values), title)
+
+
+def clear_chart_cache():
+    _render.cache_clear()
+    _spec.cache_clear()
@@ -0,0 +1,262 @@
+"""Clinical data integration over local patient-record tables.
+
+A disease's records live in ``data/clinical/<disease-slug>/`` (or under
+``$BIOFORGE_CLINICAL``), each table as ``.csv`` or ``.parquet``:
+
+* ``outcomes`` - one row per patient: ``patient_id`` plus one numeric column
+  per outcome (e.g. ``progression`` as 0/1, ``survival_months``);
+* ``biomarkers`` - long format: ``patient_id``, ``biomarker``, ``value``;
+* ``assessments`` - long format: ``patient_id``, ``assessment``, ``score``.
+
+Outcomes are loaded whole and indexed by patient, the build side of a hash
+join. The long tables are read in chunks sized from ``memory_budget`` with
+typed columns (categorical feature names, float32 values); each chunk is
+joined to the outcomes through the index's hash table and reduced with one
+group-by to per-(feature, outcome) sums. Pearson correlations come from the
+summed chunks, so tables larger than memory stream through.
+
+Cohort predicates of a query plan (``bioforge.planner.ScanFilters``) are
+applied to the outcomes before the join, so records of excluded patients
+drop out at the hash lookup; features named in the question are reported
+first.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from bioforge.agents import AgentOutput, CatalogFindingsAgent
+from bioforge.catalog import slugify
+from bioforge.planner import NO_FILTERS
+from bioforge.stats import benjamini_hochberg, pearson_from_sums
+
+DEFAULT_CLINICAL_DIR = Path(
+    os.environ.get(
+        "BIOFORGE_CLINICAL",
+        Path(__file__).resolve().parent.parent / "data" / "clinical",
+    )
+)
+DEFAULT_MEMORY_BUDGET = int(os.environ.get("BIOFORGE_CLINICAL_MEMORY", 256 * 2**20))
+
+FDR_THRESHOLD = 0.05
+
+# Long tables: name -> (feature column, value column)
+FEATURE_TABLES = {
+    "biomarkers": ("biomarker", "value"),
+    "assessments": ("assessment", "score"),
+}
+
+# Approximate in-memory bytes per long-table row while a chunk is joined
+# and reduced (id, category code, value, gathered outcomes, sums)
+ROW_BYTES = 256
+
+# Words too generic to link a feature to a hypothesis on their own
+GENERIC_WORDS = frozenset({"serum", "plasma", "csf", "blood", "level", "levels", "score", "total", "index", "count", "ratio"})
+
+SUMS = ("n", "sx", "sy", "sxx", "syy", "sxy")
+
+# Question word stems that call for patient records
+TOPICS = (
+    "biomarker", "marker", "patient", "clinical", "cohort", "outcome", "progression", "detection", "diagnos",
+    "treatment", "therapy", "immunotherap", "resistance", "decline", "cognitive", "survival", "personalized", "protein", "level",
+)
+
+
+def table_path(directory, name):
+    for suffix in (".parquet", ".csv"):
+        path = Path(directory) / f"{name}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def read_outcomes(path):
+    # pandas is imported by the functions using it, so registering the agent at
+    # app start-up does not load it
+    import pandas as pd
+
+    if path.suffix == ".parquet":
+        table = pd.read_parquet(path)
+    else:
+        table = pd.read_csv(path, dtype={"patient_id": str})
+    table["patient_id"] = table["patient_id"].astype(str)
+    outcomes = table.set_index("patient_id").apply(pd.to_numeric, errors="coerce").astype(np.float64)
+    # Only keep the first row of duplicated patients so the join is 1:1
+    return outcomes[~outcomes.index.duplicated()]
+
+
+def read_chunks(path, feature, value, chunk_rows):
+    # DataFrames of (patient_id: str, feature: category, value: float32)
+    import pandas as pd
+
+    columns = ["patient_id", feature, value]
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=chunk_rows, columns=columns):
+            chunk = batch.to_pandas()
+            chunk["patient_id"] = chunk["patient_id"].astype(str)
+            yield chunk.astype({feature: "category", value: np.float32})
+    else:
+        yield from pd.read_csv(
+            path, usecols=columns, chunksize=chunk_rows,
+            dtype={"patient_id": str, feature: "category", value: np.float32},
+        )
+
+
+def correlation_sums(chunk, feature, value, outcomes):
+    # Hash-join a chunk to the outcomes and reduce it to one row of sums per
+    # feature, with columns (sum name, outcome); also returns the joined rows
+    import pandas as pd
+
+    rows = outcomes.index.get_indexer(chunk["patient_id"])
+    joined = rows >= 0
+    x = chunk[value].to_numpy(dtype=np.float64)[joined]
+    y = outcomes.to_numpy()[rows[joined]]
+    valid = ~np.isnan(y) & ~np.isnan(x)[:, None]
+    x = np.where(valid, x[:, None], 0.0)
+    y = np.where(valid, y, 0.0)
+    parts = {"n": valid.astype(np.float64), "sx": x, "sy": y, "sxx": x * x, "syy": y * y, "sxy": x * y}
+    frame = pd.DataFrame(
+        np.hstack([parts[name] for name in SUMS]),
+        columns=pd.MultiIndex.from_product([SUMS, outcomes.columns]),
+    )
+    keys = chunk[feature].array[joined]
+    return frame.groupby(keys, observed=True, sort=False).sum(), int(joined.sum())
+
+
+@dataclass
+class ClinicalReport:
+    patients: int = 0
+    records: int = 0
+    records_joined: int = 0
+    # Patients left out by cohort filters
+    patients_excluded: int = 0
+    pairs_tested: int = 0
+    # (feature, outcome, r, n, q) below FDR_THRESHOLD, strongest first
+    correlations: list = field(default_factory=list)
+
+
+def analyze(directory, memory_budget=DEFAULT_MEMORY_BUDGET, progress=None, filters=NO_FILTERS):
+    import pandas as pd
+
+    outcomes = read_outcomes(table_path(directory, "outcomes"))
+    keep = filters.cohort_mask(outcomes)
+    report = ClinicalReport(patients=int(keep.sum()), patients_excluded=int((~keep).sum()))
+    if not keep.all():
+        outcomes = outcomes[keep]
+    chunk_rows = max(1, memory_budget // (ROW_BYTES * max(1, outcomes.shape[1])))
+    tables = [(name, path) for name, path in ((n, table_path(directory, n)) for n in FEATURE_TABLES) if path]
+    if progress is not None:
+        progress.add_total(len(tables))
+
+    totals = []
+    for name, path in tables:
+        feature, value = FEATURE_TABLES[name]
+        total = None
+        for chunk in read_chunks(path, feature, value, chunk_rows):
+            sums, joined = correlation_sums(chunk, feature, value, outcomes)
+            report.records += len(chunk)
+            report.records_joined += joined
+            total = sums if total is None else total.add(sums, fill_value=0.0)
+        if total is not None:
+            totals.append(total)
+        if progress is not None:
+            progress.advance()
+    if not totals:
+        return report
+
+    # One row per (feature, outcome) pair
+    sums = pd.concat(totals).groupby(level=0, observed=True, sort=False).sum().stack(future_stack=True)
+    r, p = pearson_from_sums(*(sums[name].to_numpy() for name in SUMS))
+    q = benjamini_hochberg(p)
+    report.pairs_tested = len(sums)
+    significant = np.flatnonzero(q < FDR_THRESHOLD)
+    significant = significant[np.lexsort((-np.abs(r[significant]), q[significant]))]
+    report.correlations = [
+        (str(sums.index[i][0]), str(sums.index[i][1]), float(r[i]), int(sums["n"].iat[i]), float(q[i]))
+        for i in significant
+    ]
+    # Features the question names come first (the sort is stable)
+    report.correlations.sort(key=lambda c: not named_feature(c[0], filters))
+    return report
+
+
+def named_feature(feature, filters):
+    return any(keyword.lower() in filters.terms for keyword in feature_keywords(feature))
+
+
+def feature_keywords(feature):
+    # The feature name plus its distinctive words, for evidence matching
+    # ("CSF p-tau" -> "CSF p-tau", "p-tau", "tau")
+    words = re.findall(r"[A-Za-z0-9]+(?:-[A-Za-z0-9]+)*", feature)
+    words += [part for word in words if "-" in word for part in word.split("-")]
+    keywords = [feature]
+    for word in words:
+        if len(word) >= 3 and word.lower() not in GENERIC_WORDS and word not in keywords:
+            keywords.append(word)
+    return keywords
+
+
+def open_records(disease_name, clinical_dir=DEFAULT_CLINICAL_DIR):
+    # Record directory for a disease, or None if it has no outcomes table
+    path = Path(clinical_dir) / slugify(disease_name)
+    return path if table_path(path, "outcomes") else None
+
+
+class ClinicalDataIntegrationAgent(CatalogFindingsAgent):
+    # Correlates biomarkers and assessments with outcomes in the disease's
+    # patient records; falls back to the catalog findings when there are none
+    name = "Clinical Data Integration Agent"
+    icon = "🏥"
+    sources = CatalogFindingsAgent.sources + ("Patient records",)
+    # Streaming large record tables takes longer than catalog lookups
+    timeout = 300.0
+    top_correlations = 3
+    topics = TOPICS
+
+    def relevant(self, filters):
+        # Symbols in the question may name biomarkers
+        return super().relevant(filters) or bool(filters.genes)
+
+    def __init__(self, clinical_dir=DEFAULT_CLINICAL_DIR, memory_budget=DEFAULT_MEMORY_BUDGET):
+        self.clinical_dir = Path(clinical_dir)
+        self.memory_budget = memory_budget
+
+    def provenance_inputs(self, context, store):
+        directory = open_records(context.disease.name, self.clinical_dir) if self.scans(context) else None
+        if directory is None:
+            return super().provenance_inputs(context, store)
+        tables = [table_path(directory, name) for name in ("outcomes",) + tuple(FEATURE_TABLES)]
+        return {"Patient records": store.dataset_hash(path for path in tables if path)}
+
+    def run(self, context):
+        directory = open_records(context.disease.name, self.clinical_dir) if self.scans(context) else None
+        if directory is None:
+            return super().run(context)
+        filters = context.filters or NO_FILTERS
+        report = analyze(directory, self.memory_budget, context.progress, filters)
+        findings = [
+            f"Joined {report.records_joined:,} of {report.records:,} biomarker and assessment records "
+            f"to outcomes for {report.patients:,} patients",
+            f"{len(report.correlations):,} of {report.pairs_tested:,} feature-outcome correlations "
+            f"significant at FDR < {FDR_THRESHOLD:g}",
+        ]
+        if report.patients_excluded:
+            findings.append(
+                f"Cohort restricted to {report.patients:,} patients ({'; '.join(filters.describe())}), "
+                f"{report.patients_excluded:,} excluded"
+            )
+        evidence = {}
+        header = len(findings)
+        for feature, outcome, r, n, q in report.correlations:
+            direction = "higher" if r > 0 else "lower"
+            text = f"{feature} tracks {direction} {outcome} across {n:,} patient records (r = {r:+.2f}, q = {q:.1e})"
+            if len(findings) < header + self.top_correlations:
+                findings.append(text)
+            for keyword in feature_keywords(feature):
+                evidence.setdefault(keyword, text)
+        return AgentOutput(findings, {"records_joined": report.records_joined}, evidence)
@@ -0,0 +1,176 @@
+"""Hypothesis comparison analytics.
+
+The evaluation tab compares the scores (confidence, novelty, testability) of
+a disease's hypotheses. ``ScoreTable`` keeps one disease's scores as columns
+and applies each new hypothesis set as a diff: changed rows are overwritten
+in place and rows appended to the end of the set are appended, and the
+table's ``version`` only moves when a score actually changed. Only a
+different set of hypotheses rebuilds the table.
+
+``ComparisonAnalytics.spec`` caches the Vega-Lite spec per (disease, score
+version), so reruns that only move a slider or page reuse the spec. Up to
+``DETAIL_ROWS`` hypotheses the chart shows every hypothesis; past it the
+spec switches to aggregated views, per-score histograms over ``BINS`` bins
+plus the ``TOP_N`` hypotheses by mean score. The chart payload then has a
+fixed size however large the catalog is.
+"""
+
+import numpy as np
+
+from bioforge.federated import SCORE_FIELDS
+from bioforge.ranking import top_k
+
+DETAIL_ROWS = 50
+TOP_N = 10
+BINS = 20
+SCORE_RANGE = (0, 100)
+LABEL_LENGTH = 20
+
+GOLD = "#FFD700"
+# Bar colour per score field
+COLORS = {"confidence": GOLD, "novelty": "#FF4500", "testability": "#00BFFF"}
+
+CONFIG = {
+    "view": {"strokeWidth": 0},
+    "axis": {"labelColor": GOLD, "titleColor": GOLD, "gridColor": "#333333"},
+    "title": {"color": GOLD, "font": "VT323, monospace", "fontSize": 18},
+}
+
+
+class ScoreTable:
+    def __init__(self, fields=SCORE_FIELDS):
+        self.fields = tuple(fields)
+        self.titles = []
+        self.scores = np.empty((0, len(self.fields)), dtype=np.float64)
+        self.version = 0
+
+    def __len__(self):
+        return len(self.titles)
+
+    def sync(self, titles, matrix):
+        # Make the table hold these hypotheses (titles and their score
+        # matrix, e.g. RankedView.matrix); returns whether anything changed
+        titles = list(titles)
+        matrix = np.asarray(matrix, dtype=np.float64).reshape(len(titles), len(self.fields))
+        n = len(self.titles)
+        if len(titles) < n or titles[:n] != self.titles:
+            self.titles, self.scores = titles, matrix.copy()
+            self.version += 1
+            return True
+        changed = np.any(matrix[:n] != self.scores, axis=1)
+        if not changed.any() and len(titles) == n:
+            return False
+        self.scores[changed] = matrix[:n][changed]
+        if len(titles) > n:
+            self.titles.extend(titles[n:])
+            self.scores = np.concatenate([self.scores, matrix[n:]])
+        self.version += 1
+        return True
+
+
+def _label(title):
+    return title[:LABEL_LENGTH] + "..."
+
+
+def _metric(field):
+    return field.capitalize()
+
+
+def _color(fields):
+    return {
+        "field": "Metric", "type": "nominal", "legend": None,
+        "scale": {"domain": [_metric(f) for f in fields], "range": [COLORS.get(f, GOLD) for f in fields]},
+    }
+
+
+def _bars(table, data, title=None):
+    # Faceted bars of long-format score rows, one column per score field
+    spec = {
+        "data": data,
+        "mark": "bar",
+        "width": 150,
+        "height": 200,
+        "encoding": {
+            "x": {"field": "Hypothesis", "type": "nominal", "title": None, "sort": None},
+            "y": {"field": "Score", "type": "quantitative", "title": "Score"},
+            "color": _color(table.fields),
+            "column": {"field": "Metric", "type": "nominal", "title": None, "sort": [_metric(f) for f in table.fields]},
+        },
+    }
+    if title:
+        spec["title"] = title
+    return spec
+
+
+def _long_rows(table, rows):
+    labels = [_label(table.titles[i]) for i in rows]
+    return [
+        {"Hypothesis": label, "Metric": _metric(field), "Score": float(table.scores[i, column])}
+        for column, field in enumerate(table.fields)
+        for i, label in zip(rows, labels)
+    ]
+
+
+def _histogram_rows(table, bins=BINS):
+    edges = np.linspace(*SCORE_RANGE, bins + 1)
+    rows = []
+    for column, field in enumerate(table.fields):
+        counts, _ = np.histogram(np.clip(table.scores[:, column], *SCORE_RANGE), bins=edges)
+        rows.extend(
+            {"Metric": _metric(field), "start": float(start), "end": float(end), "Hypotheses": int(count)}
+            for start, end, count in zip(edges[:-1], edges[1:], counts)
+        )
+    return rows
+
+
+def comparison_spec(table, detail_rows=DETAIL_ROWS, top_n=TOP_N, bins=BINS):
+    # Vega-Lite spec comparing the table's hypotheses
+    if len(table) <= detail_rows:
+        spec = _bars(table, {"values": _long_rows(table, range(len(table)))})
+    else:
+        top = top_k(table.scores.mean(axis=1), top_n)[:top_n]
+        step = (SCORE_RANGE[1] - SCORE_RANGE[0]) / bins
+        spec = {
+            "vconcat": [
+                {
+                    "title": f"SCORE DISTRIBUTION OF {len(table):,} HYPOTHESES",
+                    "data": {"name": "bins"},
+                    "mark": "bar",
+                    "width": 150,
+                    "height": 120,
+                    "encoding": {
+                        "x": {"field": "start", "type": "quantitative", "bin": {"binned": True, "step": step}, "title": "Score"},
+                        "x2": {"field": "end"},
+                        "y": {"field": "Hypotheses", "type": "quantitative"},
+                        "color": _color(table.fields),
+                        "column": {"field": "Metric", "type": "nominal", "title": None, "sort": [_metric(f) for f in table.fields]},
+                    },
+                },
+                _bars(table, {"name": "top"}, title=f"TOP {len(top)} BY MEAN SCORE"),
+            ],
+            "datasets": {"bins": _histogram_rows(table, bins), "top": _long_rows(table, top)},
+        }
+    spec["$schema"] = "https://vega.github.io/schema/vega-lite/v5.json"
+    spec["config"] = CONFIG
+    return spec
+
+
+class ComparisonAnalytics:
+    # Score tables and their latest chart spec, per disease
+    def __init__(self, detail_rows=DETAIL_ROWS, top_n=TOP_N, bins=BINS):
+        self.detail_rows = detail_rows
+        self.top_n = top_n
+        self.bins = bins
+        self.tables = {}
+        # disease -> (score version, spec)
+        self._specs = {}
+
+    def update(self, disease, titles, matrix):
+        return self.tables.setdefault(disease, ScoreTable()).sync(titles, matrix)
+
+    def spec(self, disease):
+        table = self.tables[disease]
+        cached = self._specs.get(disease)
+        if cached is None or cached[0] != table.version:
+            cached = self._specs[disease] = (table.version, comparison_spec(table, self.detail_rows, self.top_n, self.bins))
+        return cached[1]
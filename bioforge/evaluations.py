@@ -0,0 +1,253 @@
+"""Persistent store for researcher evaluations.
+
+Evaluations are appended to a SQLite database in WAL mode. ``submit`` only
+puts the evaluation on a queue; a background writer thread drains the queue
+and inserts in batches, so the Streamlit script thread never waits on disk.
+A failed batch (locked database, full disk) is logged and retried a few
+times before it is dropped; ``submit`` and ``flush`` raise once the writer
+has stopped rather than queueing evaluations nobody will write.
+Aggregates (count, mean ratings, priority histogram) are computed in SQL
+over an index on (disease, hypothesis).
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+DEFAULT_EVALUATIONS_PATH = Path(
+    os.environ.get(
+        "BIOFORGE_EVALUATIONS",
+        Path(__file__).resolve().parent.parent / "data" / "evaluations.sqlite",
+    )
+)
+
+PRIORITIES = ("LOW", "MEDIUM", "HIGH", "VERY HIGH")
+
+# Attempts per batch, and the delay before the first retry (doubled after
+# every failed attempt)
+WRITE_ATTEMPTS = 3
+RETRY_DELAY = 0.5
+
+INSERT = (
+    "INSERT INTO evaluations (created_at, disease, hypothesis, potential, novelty, priority, feedback, session)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    disease TEXT NOT NULL,
+    hypothesis TEXT NOT NULL,
+    potential INTEGER NOT NULL,
+    novelty INTEGER NOT NULL,
+    priority TEXT NOT NULL,
+    feedback TEXT,
+    session TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_evaluations_hypothesis ON evaluations (disease, hypothesis);
+"""
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class Evaluation:
+    disease: str
+    hypothesis: str
+    potential: int
+    novelty: int
+    priority: str
+    feedback: str = ""
+    session: str = ""
+    created_at: float = field(default_factory=time.time)
+
+    def row(self):
+        return (
+            self.created_at, self.disease, self.hypothesis, self.potential,
+            self.novelty, self.priority, self.feedback, self.session,
+        )
+
+
+@dataclass(frozen=True)
+class EvaluationSummary:
+    count: int = 0
+    mean_potential: float = None
+    mean_novelty: float = None
+    priorities: dict = field(default_factory=dict)
+
+
+class EvaluationStore:
+    def __init__(self, path=DEFAULT_EVALUATIONS_PATH, batch_size=200, flush_interval=0.25):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.batches = 0
+        # Evaluations dropped after WRITE_ATTEMPTS failed writes, and the
+        # last write error
+        self.failed = 0
+        self.error = None
+        self._queue = queue.Queue()
+        self._local = threading.local()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="bioforge-evaluations", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _check_writer(self):
+        if not self._writer.is_alive():
+            raise RuntimeError(f"Evaluation writer for {self.path} is not running") from self.error
+
+    def submit(self, evaluation):
+        # Non-blocking; the evaluation is written by the background thread
+        self._check_writer()
+        self._queue.put(evaluation)
+
+    def _write_batch(self, conn, batch):
+        rows = [evaluation.row() for evaluation in batch]
+        delay = RETRY_DELAY
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                with conn:
+                    conn.executemany(INSERT, rows)
+            except sqlite3.Error as exc:
+                self.error = exc
+                if attempt == WRITE_ATTEMPTS:
+                    self.failed += len(batch)
+                    logger.error("Dropped %d evaluations after %d failed writes to %s", len(batch), attempt, self.path, exc_info=exc)
+                    return
+                logger.warning("Writing %d evaluations to %s failed (%s); retrying in %.1fs", len(batch), self.path, exc, delay)
+                time.sleep(delay)
+                delay *= 2
+            else:
+                self.written += len(batch)
+                self.batches += 1
+                return
+
+    def _write_loop(self):
+        try:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.Error as exc:
+            self.error = exc
+            logger.error("Cannot open %s; evaluations will not be saved", self.path, exc_info=exc)
+            self._drain()
+            return
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch, taken = [], 1
+            try:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+                deadline = time.monotonic() + self.flush_interval
+                while not stopping and len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    taken += 1
+                    if item is _STOP:
+                        stopping = True
+                    else:
+                        batch.append(item)
+                if batch:
+                    self._write_batch(conn, batch)
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+        conn.close()
+
+    def _drain(self):
+        # Release flush() callers waiting on items the writer will not write
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._queue.task_done()
+
+    def flush(self):
+        # Block until everything submitted so far has been written (or
+        # dropped after failed writes)
+        self._check_writer()
+        self._queue.join()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path)
+            self._local.conn = conn
+        return conn
+
+    def rating_moments(self):
+        # Yield (disease, hypothesis, count, mean potential, mean potential²,
+        # mean novelty, mean novelty², priority histogram) for every
+        # evaluated hypothesis, to seed online re-scoring at startup
+        conn = self._connect()
+        histogram = {}
+        for disease, hypothesis, priority, count in conn.execute(
+            "SELECT disease, hypothesis, priority, COUNT(*) FROM evaluations GROUP BY disease, hypothesis, priority"
+        ):
+            histogram.setdefault((disease, hypothesis), {})[priority] = count
+        for row in conn.execute(
+            "SELECT disease, hypothesis, COUNT(*), AVG(potential), AVG(potential * potential),"
+            " AVG(novelty), AVG(novelty * novelty) FROM evaluations GROUP BY disease, hypothesis"
+        ):
+            yield row + (histogram.get(row[:2], {}),)
+
+    def summary(self, disease, hypothesis):
+        return self.summaries(disease, [hypothesis]).get(hypothesis, EvaluationSummary())
+
+    def summaries(self, disease, hypotheses=None):
+        # {hypothesis title: EvaluationSummary} for one disease
+        conn = self._connect()
+        where, params = "disease = ?", [disease]
+        if hypotheses is not None:
+            hypotheses = list(hypotheses)
+            if not hypotheses:
+                return {}
+            where += f" AND hypothesis IN ({','.join('?' * len(hypotheses))})"
+            params += hypotheses
+        totals = conn.execute(
+            f"SELECT hypothesis, COUNT(*), AVG(potential), AVG(novelty) FROM evaluations"
+            f" WHERE {where} GROUP BY hypothesis",
+            params,
+        ).fetchall()
+        histogram = {}
+        for hypothesis, priority, count in conn.execute(
+            f"SELECT hypothesis, priority, COUNT(*) FROM evaluations WHERE {where} GROUP BY hypothesis, priority",
+            params,
+        ):
+            histogram.setdefault(hypothesis, {})[priority] = count
+        return {
+            hypothesis: EvaluationSummary(
+                count=count,
+                mean_potential=mean_potential,
+                mean_novelty=mean_novelty,
+                priorities={p: histogram.get(hypothesis, {}).get(p, 0) for p in PRIORITIES},
+            )
+            for hypothesis, count, mean_potential, mean_novelty in totals
+        }
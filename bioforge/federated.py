@@ -0,0 +1,57 @@
+"""Federated score adjustment.
+
+Scores of a whole hypothesis set are adjusted in one batch over an
+``(n, 3)`` matrix of [confidence, novelty, testability]. The adjustment uses
+a seeded RNG (one seed per session, mixed with the disease name), so it is
+stable across reruns, and it returns new hypothesis dicts: the canonical
+catalog is never modified.
+"""
+
+import zlib
+
+import numpy as np
+
+SCORE_FIELDS = ("confidence", "novelty", "testability")
+
+# Inclusive (low, high) boost per score field when federated learning is on
+FEDERATED_BOOSTS = {
+    "confidence": (5, 10),
+    "novelty": (3, 8),
+    "testability": (0, 0),
+}
+
+MAX_SCORE = 100
+
+
+def score_matrix(hypotheses, fields=SCORE_FIELDS):
+    matrix = np.empty((len(hypotheses), len(fields)), dtype=np.int64)
+    for column, name in enumerate(fields):
+        matrix[:, column] = [h[name] for h in hypotheses]
+    return matrix
+
+
+def session_rng(seed, key=""):
+    # Independent, reproducible stream per (session seed, key)
+    return np.random.default_rng([seed, zlib.crc32(key.encode("utf-8"))])
+
+
+def federated_boosts(n, rng, boosts=FEDERATED_BOOSTS, fields=SCORE_FIELDS):
+    low = np.array([boosts[name][0] for name in fields])
+    high = np.array([boosts[name][1] for name in fields])
+    return rng.integers(low, high + 1, size=(n, len(fields)))
+
+
+def federated_score_matrix(hypotheses, rng):
+    scores = score_matrix(hypotheses)
+    return np.minimum(MAX_SCORE, scores + federated_boosts(len(hypotheses), rng))
+
+
+def with_scores(hypotheses, matrix, fields=SCORE_FIELDS):
+    # New hypothesis dicts carrying the scores in matrix; inputs are untouched
+    rows = matrix.tolist()
+    return [dict(h, **dict(zip(fields, row))) for h, row in zip(hypotheses, rows)]
+
+
+def federated_rescore(hypotheses, seed, key=""):
+    rng = session_rng(seed, key)
+    return with_scores(hypotheses, federated_score_matrix(hypotheses, rng))
@@ -0,0 +1,400 @@
+"""Genomic association analysis over local cohorts.
+
+A cohort lives in ``data/genomics/<disease-slug>/`` (or under
+``$BIOFORGE_GENOMICS``):
+
+* ``samples.csv`` - one row per sample with ``sample`` and ``case``
+  (1 for cases, 0 for controls); it fixes the sample order. Other columns
+  (e.g. ``age_at_onset``) can be used by cohort filters of the query plan;
+* ``expression.npy`` (genes x samples, float; one contiguous row per
+  gene) with ``genes.txt``, or ``expression.parquet`` with one column per
+  gene and rows in sample order;
+* any number of ``*.vcf`` / ``*.vcf.gz`` files.
+
+Expression matrices are memory-mapped (``np.load(mmap_mode="r")``, or
+Parquet read one block of columns at a time) and tested with a vectorized
+Welch t-test per gene. VCFs are streamed in chunks of variants and tested
+with an allelic chi-square test per variant. Work is split into gene blocks
+and VCF byte ranges that run on a shared process pool; block and chunk sizes are
+derived from ``memory_budget`` so the resident set stays bounded however
+many samples the cohort has. P-values are corrected with Benjamini-Hochberg.
+
+Scans take the ``ScanFilters`` of a query plan (see ``bioforge.planner``):
+cohort predicates select samples, named genes select expression rows, and
+the question's topics select the expression and/or variant shards.
+"""
+
+import gzip
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+from bioforge.agents import AgentOutput, CatalogFindingsAgent
+from bioforge.catalog import slugify
+from bioforge.planner import NO_FILTERS
+from bioforge.stats import allelic_chi2, benjamini_hochberg, welch_t_test
+
+DEFAULT_GENOMICS_DIR = Path(
+    os.environ.get(
+        "BIOFORGE_GENOMICS",
+        Path(__file__).resolve().parent.parent / "data" / "genomics",
+    )
+)
+DEFAULT_MEMORY_BUDGET = int(os.environ.get("BIOFORGE_GENOMICS_MEMORY", 256 * 2**20))
+DEFAULT_WORKERS = min(8, len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1)
+
+FDR_THRESHOLD = 0.05
+
+# Approximate bytes per genotype cell while a VCF chunk is parsed (split
+# bytes objects plus the decoded allele arrays)
+VCF_CELL_BYTES = 96
+
+# CHROM through FORMAT; sample columns follow
+VCF_FIXED_FIELDS = 9
+
+# Below this many matrix cells the work is done inline, without the pool
+INLINE_CELLS = 2_000_000
+
+# Question word stems that call for the variant (VCF) or expression shards
+VARIANT_TOPICS = ("variant", "snp", "mutation", "allele", "genetic", "predisposition", "gwas", "heritab", "polygenic")
+EXPRESSION_TOPICS = ("expression", "transcript", "rna")
+
+
+def _expression_block(path, genes, case_mask, sample_index=None):
+    # Worker: Welch t-test for the genes (a slice or index array of rows) of
+    # an expression matrix, over the samples in sample_index (all if None)
+    path = Path(path)
+    if path.suffix == ".npy":
+        block = np.asarray(np.load(path, mmap_mode="r")[genes], dtype=np.float64).T
+    else:
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path, memory_map=True)
+        columns = np.asarray(expression_genes(path))[genes].tolist()
+        block = parquet.read(columns=columns).to_pandas().to_numpy(dtype=np.float64)
+    if sample_index is not None:
+        block = block[sample_index]
+    diff, _, p = welch_t_test(block[case_mask], block[~case_mask])
+    return genes, diff, p
+
+
+def _open_vcf(path):
+    path = Path(path)
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def _decode_genotypes(cells):
+    # GT cells as S3 bytes (b"0/1", b"1|1", b"./.", b"1") -> (alt allele
+    # count, called allele count)
+    raw = np.ascontiguousarray(cells, dtype="S3").view(np.uint8).reshape(cells.shape + (3,))
+    first = raw[..., 0].astype(np.int16) - ord("0")
+    second = raw[..., 2].astype(np.int16) - ord("0")
+    diploid = (raw[..., 1] == ord("/")) | (raw[..., 1] == ord("|"))
+    called1 = (first >= 0) & (first <= 9)
+    called2 = diploid & (second >= 0) & (second <= 9)
+    alt = (called1 & (first > 0)).astype(np.int32) + (called2 & (second > 0))
+    return alt, called1.astype(np.int32) + called2
+
+
+def _vcf_chunks(f, chunk_rows, n_fields=VCF_FIXED_FIELDS):
+    # Yield (variant labels, genotype cells as an S3 array) per chunk of
+    # variant lines; GT must be the first FORMAT field, as the spec requires.
+    # Blank lines and records with fewer than n_fields fields (e.g. truncated
+    # by an interrupted write) are skipped.
+    labels, rows = [], []
+    for line in f:
+        fields = line.rstrip(b"\r\n").split(b"\t")
+        if len(fields) < n_fields:
+            continue
+        variant_id = fields[2].decode()
+        labels.append(variant_id if variant_id != "." else f"{fields[0].decode()}:{fields[1].decode()}")
+        # Assigning to "S3" keeps the GT part of "0/1:35:..." cells
+        rows.append(fields[9:])
+        if len(rows) >= chunk_rows:
+            yield labels, np.array(rows, dtype="S3")
+            labels, rows = [], []
+    if rows:
+        yield labels, np.array(rows, dtype="S3")
+
+
+def vcf_header(path):
+    # (sample names, byte offset of the first variant line)
+    with _open_vcf(path) as f:
+        for line in f:
+            if line.startswith(b"#CHROM"):
+                return line.rstrip(b"\r\n").decode().split("\t")[9:], f.tell()
+    return [], None
+
+
+def vcf_ranges(path, n_ranges):
+    # Split the variant lines of an uncompressed VCF into byte ranges that
+    # can be scanned independently; a gzipped VCF is a single range
+    samples, start = vcf_header(path)
+    if start is None:
+        return []
+    if Path(path).suffix == ".gz" or n_ranges <= 1:
+        return [(start, None)]
+    size = Path(path).stat().st_size
+    bounds = np.linspace(start, size, n_ranges + 1).astype(np.int64).tolist()
+    return [(bounds[i], bounds[i + 1]) for i in range(n_ranges) if bounds[i] < bounds[i + 1]]
+
+
+def _vcf_range(path, start, stop, samples, case_mask, chunk_rows, top_n):
+    # Worker: test the variant lines starting in [start, stop) of a VCF
+    # (stop None: to the end); returns (p-values, top hits)
+    vcf_samples, data_start = vcf_header(path)
+    position = {name: i for i, name in enumerate(samples)}
+    columns = np.array([i for i, name in enumerate(vcf_samples) if name in position], dtype=np.intp)
+    is_case = np.array([case_mask[position[vcf_samples[i]]] for i in columns], dtype=bool)
+    if len(columns) == len(vcf_samples):
+        columns = slice(None)
+    pvalues, top = [], []
+    with _open_vcf(path) as f:
+        f.seek(start)
+        if start > data_start:
+            # Mid-line: that line belongs to the previous range
+            f.seek(start - 1)
+            f.readline()
+        lines = f if stop is None else iter(lambda: f.readline() if f.tell() < stop else b"", b"")
+        for labels, cells in _vcf_chunks(lines, chunk_rows, VCF_FIXED_FIELDS + len(vcf_samples)):
+            alt, called = _decode_genotypes(cells[:, columns])
+            alt_cases, alt_controls = alt[:, is_case].sum(axis=1), alt[:, ~is_case].sum(axis=1)
+            called_cases, called_controls = called[:, is_case].sum(axis=1), called[:, ~is_case].sum(axis=1)
+            odds, p = allelic_chi2(alt_cases, called_cases - alt_cases, alt_controls, called_controls - alt_controls)
+            pvalues.append(p)
+            top.extend((float(p[i]), labels[i], float(odds[i])) for i in np.argsort(p)[:top_n])
+    top.sort()
+    return (np.concatenate(pvalues) if pvalues else np.empty(0)), top[:top_n]
+
+
+def expression_genes(path):
+    path = Path(path)
+    if path.suffix == ".npy":
+        return (path.parent / "genes.txt").read_text(encoding="utf-8").split()
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(path)
+    return [name for name in schema.names if name != "sample"]
+
+
+@dataclass
+class AssociationReport:
+    n_samples: int = 0
+    n_cases: int = 0
+    genes_tested: int = 0
+    # (gene, mean difference, q) for genes below FDR_THRESHOLD, best first
+    genes: list = field(default_factory=list)
+    variants_tested: int = 0
+    variant_files: int = 0
+    # (variant, odds ratio, q) for variants below FDR_THRESHOLD, best first
+    variants: list = field(default_factory=list)
+    variants_significant: int = 0
+    # Samples left out by cohort filters
+    n_excluded: int = 0
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def process_pool(workers=DEFAULT_WORKERS):
+    # Shared pool; spawned rather than forked since the app is multithreaded
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+        return _pool
+
+
+class Cohort:
+    def __init__(self, path):
+        # Imported here so registering the agent at app start-up does not
+        # load pandas
+        import pandas as pd
+
+        self.path = Path(path)
+        table = pd.read_csv(self.path / "samples.csv", dtype={"sample": str})
+        self.table = table
+        self.samples = table["sample"].tolist()
+        self.case_mask = table["case"].to_numpy().astype(bool)
+        self.expression = next(
+            (p for p in (self.path / "expression.npy", self.path / "expression.parquet") if p.exists()),
+            None,
+        )
+        self.vcfs = sorted(self.path.glob("*.vcf")) + sorted(self.path.glob("*.vcf.gz"))
+
+    def shards(self, filters=NO_FILTERS):
+        # (expression, VCFs) to scan for a question: the shards its topics
+        # ask for, or all of them when it asks for neither specifically
+        variants = filters.mentions(VARIANT_TOPICS)
+        expression = filters.mentions(EXPRESSION_TOPICS) or bool(filters.genes)
+        if not (variants or expression):
+            variants = expression = True
+        return (self.expression if expression else None), (self.vcfs if variants else [])
+
+    def analyze(self, memory_budget=DEFAULT_MEMORY_BUDGET, workers=DEFAULT_WORKERS, top_n=3, progress=None, filters=NO_FILTERS):
+        expression, vcfs = self.shards(filters)
+        # Cohort filters select samples; None keeps all of them
+        keep = filters.cohort_mask(self.table)
+        sample_index = None if keep.all() else np.flatnonzero(keep)
+        samples = self.samples if sample_index is None else [self.samples[i] for i in sample_index]
+        case_mask = self.case_mask if sample_index is None else self.case_mask[sample_index]
+        report = AssociationReport(
+            n_samples=len(samples), n_cases=int(case_mask.sum()), n_excluded=len(self.samples) - len(samples),
+        )
+        n = len(samples)
+        if not n:
+            return report
+        # Each worker gets an equal share of the budget
+        share = max(1, memory_budget // workers)
+
+        genes = expression_genes(expression) if expression is not None else []
+        # Genes named in the question, if the cohort has any of them
+        named = {gene.lower() for gene in filters.genes}
+        rows = np.array([i for i, gene in enumerate(genes) if gene.lower() in named], dtype=np.intp)
+        tasks = []
+        block = max(1, share // (n * 8 * 4))
+        if len(rows):
+            for start in range(0, len(rows), block):
+                tasks.append((_expression_block, (str(expression), rows[start:start + block], case_mask, sample_index)))
+        else:
+            for start in range(0, len(genes), block):
+                tasks.append((_expression_block, (str(expression), slice(start, min(start + block, len(genes))), case_mask, sample_index)))
+        chunk_rows = max(1, share // (n * VCF_CELL_BYTES))
+        for vcf in vcfs:
+            for start, stop in vcf_ranges(vcf, workers):
+                tasks.append((_vcf_range, (str(vcf), start, stop, samples, case_mask, chunk_rows, top_n)))
+        if progress is not None:
+            progress.add_total(len(tasks))
+
+        # A VCF takes roughly four bytes per genotype cell
+        cells = n * (len(rows) or len(genes)) + sum(vcf.stat().st_size for vcf in vcfs) // 4
+        if cells <= INLINE_CELLS or workers <= 1:
+            results = ((fn, fn(*args)) for fn, args in tasks)
+        else:
+            pool = process_pool(workers)
+            futures = {pool.submit(fn, *args): fn for fn, args in tasks}
+            results = ((futures[future], future.result()) for future in as_completed(futures))
+
+        gene_p = np.ones(len(genes))
+        gene_diff = np.zeros(len(genes))
+        tested = np.zeros(len(genes), dtype=bool)
+        variant_p, variant_top = [], []
+        for fn, result in results:
+            if fn is _expression_block:
+                block_genes, diff, p = result
+                gene_p[block_genes] = p
+                gene_diff[block_genes] = diff
+                tested[block_genes] = True
+            else:
+                p, top = result
+                variant_p.append(p)
+                variant_top.extend(top)
+            if progress is not None:
+                progress.advance()
+
+        if tested.any():
+            tested = np.flatnonzero(tested)
+            q = benjamini_hochberg(gene_p[tested])
+            significant = np.flatnonzero(q < FDR_THRESHOLD)
+            significant = significant[np.argsort(q[significant])]
+            report.genes_tested = len(tested)
+            report.genes = [(genes[tested[i]], float(gene_diff[tested[i]]), float(q[i])) for i in significant]
+        if variant_p:
+            p = np.concatenate(variant_p)
+            q_sorted = benjamini_hochberg(np.sort(p))
+            report.variants_tested = p.size
+            report.variant_files = len(vcfs)
+            report.variants_significant = int(np.count_nonzero(q_sorted < FDR_THRESHOLD))
+            # Top hits are the globally smallest p-values, so their q-values
+            # are the first entries of the sorted q-values
+            variant_top.sort()
+            report.variants = [
+                (label, odds, float(q_sorted[i]))
+                for i, (_, label, odds) in enumerate(variant_top[:top_n])
+                if q_sorted[i] < FDR_THRESHOLD
+            ]
+        return report
+
+
+def open_cohort(disease_name, genomics_dir=DEFAULT_GENOMICS_DIR):
+    # Cohort for a disease, or None if there is no usable data for it
+    path = Path(genomics_dir) / slugify(disease_name)
+    if not (path / "samples.csv").exists():
+        return None
+    cohort = Cohort(path)
+    if cohort.expression is None and not cohort.vcfs:
+        return None
+    return cohort
+
+
+class GenomicDataAnalysisAgent(CatalogFindingsAgent):
+    # Runs association tests on the disease's local cohort; falls back to
+    # the catalog findings when there is none
+    name = "Genomic Data Analysis Agent"
+    icon = "🧬"
+    sources = CatalogFindingsAgent.sources + ("Expression matrices", "Variant calls")
+    # Whole-cohort scans take longer than catalog lookups
+    timeout = 300.0
+    top_hits = 3
+    topics = VARIANT_TOPICS + EXPRESSION_TOPICS + ("gene", "genom")
+
+    def relevant(self, filters):
+        return super().relevant(filters) or bool(filters.genes)
+
+    def __init__(self, genomics_dir=DEFAULT_GENOMICS_DIR, memory_budget=DEFAULT_MEMORY_BUDGET, workers=DEFAULT_WORKERS):
+        self.genomics_dir = Path(genomics_dir)
+        self.memory_budget = memory_budget
+        self.workers = workers
+
+    def provenance_inputs(self, context, store):
+        cohort = open_cohort(context.disease.name, self.genomics_dir) if self.scans(context) else None
+        if cohort is None:
+            return super().provenance_inputs(context, store)
+        files = [cohort.path / "samples.csv", *cohort.vcfs]
+        if cohort.expression is not None:
+            files.append(cohort.expression)
+            if cohort.expression.suffix == ".npy":
+                files.append(cohort.expression.parent / "genes.txt")
+        return {"Cohort": store.dataset_hash(files)}
+
+    def run(self, context):
+        cohort = open_cohort(context.disease.name, self.genomics_dir) if self.scans(context) else None
+        if cohort is None:
+            return super().run(context)
+        filters = context.filters or NO_FILTERS
+        report = cohort.analyze(self.memory_budget, self.workers, self.top_hits, context.progress, filters)
+        controls = report.n_samples - report.n_cases
+        findings = []
+        if report.n_excluded:
+            findings.append(
+                f"Cohort restricted to {report.n_samples:,} samples ({'; '.join(filters.describe())}), "
+                f"{report.n_excluded:,} excluded"
+            )
+        if report.genes_tested:
+            findings.append(
+                f"Tested {report.genes_tested:,} genes across {report.n_samples:,} samples "
+                f"({report.n_cases:,} cases, {controls:,} controls): {len(report.genes):,} differentially "
+                f"expressed at FDR < {FDR_THRESHOLD:g}"
+            )
+            for gene, diff, q in report.genes[:self.top_hits]:
+                direction = "up" if diff > 0 else "down"
+                findings.append(f"{gene} {direction} in cases (Δ {diff:+.2f}, q = {q:.1e})")
+        if report.variants_tested:
+            findings.append(
+                f"Scanned {report.variants_tested:,} variants in {report.variant_files} VCF file(s): "
+                f"{report.variants_significant:,} associated at FDR < {FDR_THRESHOLD:g}"
+            )
+            for variant, odds, q in report.variants:
+                findings.append(f"{variant} allelic odds ratio {odds:.2f} (q = {q:.1e})")
+        if not (report.genes_tested or report.variants_tested):
+            scope = f" ({'; '.join(filters.describe())})" if filters.describe() else ""
+            findings.append(
+                f"No genes or variants matched this question{scope} in the cohort of {report.n_samples:,} samples"
+            )
+        return AgentOutput(findings, {"variants_tested": report.variants_tested + report.genes_tested})
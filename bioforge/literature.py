@@ -0,0 +1,337 @@
+"""Literature mining over a local corpus of abstracts.
+
+The corpus is one or more PubMed-style JSONL files in ``data/literature/``
+(or ``$BIOFORGE_LITERATURE``), one object per line with ``pmid``, ``title``
+and ``abstract``. They are indexed into an on-disk inverted index in the
+``index/`` directory next to them:
+
+* indexing streams the files and writes a new immutable *segment* every
+  ``segment_size`` documents, so memory is bounded by the segment size;
+* the byte offset reached in every source file is recorded with every
+  segment written, so re-running the indexer after appending to a file (or
+  adding a file, or after an interrupted run) only indexes the new
+  documents;
+* postings, term frequencies and document lengths are ``.npy`` arrays that
+  are memory-mapped at query time, and a query only touches the postings of
+  its own terms.
+
+Queries are ranked with BM25.
+
+    python -m bioforge.literature data/literature/*.jsonl
+"""
+
+import json
+import math
+import os
+import re
+import shutil
+import sys
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from bioforge.agents import AgentOutput, CatalogFindingsAgent
+from bioforge.ranking import top_k
+
+DEFAULT_LITERATURE_DIR = Path(
+    os.environ.get(
+        "BIOFORGE_LITERATURE",
+        Path(__file__).resolve().parent.parent / "data" / "literature",
+    )
+)
+DEFAULT_SEGMENT_SIZE = 100_000
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Query terms found in more than this fraction of documents are skipped
+MAX_DF_RATIO = 0.5
+# A document counts as a match when it contains this fraction of the terms
+MIN_MATCH_RATIO = 0.5
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or that the their
+this to was were which with between during than then these those through via whether
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+class Segment:
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / "vocab.json", encoding="utf-8") as f:
+            self.vocab = json.load(f)
+        self.docs = np.load(self.path / "postings.npy", mmap_mode="r")
+        self.tfs = np.load(self.path / "tfs.npy", mmap_mode="r")
+        self.doclens = np.load(self.path / "doclens.npy", mmap_mode="r")
+        self.doc_offsets = np.load(self.path / "doc_offsets.npy", mmap_mode="r")
+
+    def __len__(self):
+        return len(self.doclens)
+
+    def df(self, term):
+        entry = self.vocab.get(term)
+        return entry[1] if entry else 0
+
+    def postings(self, term):
+        offset, length = self.vocab[term]
+        return self.docs[offset:offset + length], self.tfs[offset:offset + length]
+
+    def document(self, local_id):
+        with open(self.path / "docs.jsonl", "rb") as f:
+            f.seek(int(self.doc_offsets[local_id]))
+            return json.loads(f.readline())
+
+
+def _write_segment(path, documents):
+    # documents: list of (pmid, title, tokens). A directory left at path by
+    # an interrupted run is not listed in meta.json and is replaced.
+    if path.exists():
+        shutil.rmtree(path)
+    path.mkdir(parents=True)
+    postings = defaultdict(list)
+    doclens = np.empty(len(documents), dtype=np.int32)
+    offsets = np.empty(len(documents), dtype=np.int64)
+    with open(path / "docs.jsonl", "wb") as docs_file:
+        for local_id, (pmid, title, tokens) in enumerate(documents):
+            doclens[local_id] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                postings[term].append((local_id, tf))
+            offsets[local_id] = docs_file.tell()
+            docs_file.write(json.dumps({"pmid": pmid, "title": title}, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    vocab = {}
+    total = sum(len(entries) for entries in postings.values())
+    docs = np.empty(total, dtype=np.int32)
+    tfs = np.empty(total, dtype=np.int32)
+    position = 0
+    for term in sorted(postings):
+        entries = postings[term]
+        block = np.asarray(entries, dtype=np.int32)
+        docs[position:position + len(entries)] = block[:, 0]
+        tfs[position:position + len(entries)] = block[:, 1]
+        vocab[term] = [position, len(entries)]
+        position += len(entries)
+
+    np.save(path / "postings.npy", docs)
+    np.save(path / "tfs.npy", tfs)
+    np.save(path / "doclens.npy", doclens)
+    np.save(path / "doc_offsets.npy", offsets)
+    with open(path / "vocab.json", "w", encoding="utf-8") as f:
+        json.dump(vocab, f, ensure_ascii=False)
+    return {"name": path.name, "n_docs": len(documents), "total_len": int(doclens.sum())}
+
+
+def _load_meta(index_dir):
+    meta_path = Path(index_dir) / "meta.json"
+    if meta_path.exists():
+        with open(meta_path, encoding="utf-8") as f:
+            return json.load(f)
+    return {"segments": [], "sources": {}}
+
+
+def _save_meta(index_dir, meta):
+    path = Path(index_dir) / "meta.json"
+    temporary = path.with_suffix(".json.tmp")
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    temporary.replace(path)
+
+
+def update_index(index_dir, sources, segment_size=DEFAULT_SEGMENT_SIZE):
+    # Index documents appended to sources since the last run; returns the
+    # number of new documents
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    meta = _load_meta(index_dir)
+    buffer = []
+    added = 0
+
+    def flush(source, offset):
+        # Write the buffered documents as a segment and record it together
+        # with the source offset reached, so an interrupted run resumes
+        # after the last saved segment
+        name = f"seg-{len(meta['segments']) + 1:05d}"
+        meta["segments"].append(_write_segment(index_dir / name, buffer))
+        meta["sources"][source] = offset
+        _save_meta(index_dir, meta)
+        buffer.clear()
+
+    for source in sorted(str(Path(s).resolve()) for s in sources):
+        offset = meta["sources"].get(source, 0)
+        with open(source, "rb") as f:
+            f.seek(offset)
+            for line in iter(f.readline, b""):
+                if not line.strip():
+                    offset += len(line)
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    if line.endswith(b"\n"):
+                        raise
+                    # Partially written last line; pick it up next time
+                    break
+                # A complete last record without a trailing newline is indexed;
+                # the offset then points past it, so it is not read twice
+                offset += len(line)
+                title = record.get("title", "")
+                tokens = tokenize(f"{title} {record.get('abstract', '')}")
+                buffer.append((str(record.get("pmid", "")), title, tokens))
+                added += 1
+                if len(buffer) >= segment_size:
+                    flush(source, offset)
+        if buffer:
+            flush(source, offset)
+        elif meta["sources"].get(source) != offset:
+            # Only blank lines since the last segment
+            meta["sources"][source] = offset
+            _save_meta(index_dir, meta)
+    return added
+
+
+class LiteratureIndex:
+    def __init__(self, index_dir):
+        self.index_dir = Path(index_dir)
+        meta = _load_meta(self.index_dir)
+        self.segments = [Segment(self.index_dir / entry["name"]) for entry in meta["segments"]]
+        self.n_docs = sum(entry["n_docs"] for entry in meta["segments"])
+        total_len = sum(entry["total_len"] for entry in meta["segments"])
+        self.avg_len = total_len / self.n_docs if self.n_docs else 0.0
+
+    def search(self, query, k=10):
+        # (number of documents matching at least MIN_MATCH_RATIO of the query
+        # terms, [(score, document dict)] best first, postings read)
+        terms = set(tokenize(query))
+        if not terms or not self.n_docs:
+            return 0, [], 0
+        dfs = {term: sum(segment.df(term) for segment in self.segments) for term in terms}
+        # Terms in most documents barely move BM25 but dominate the postings
+        # read, and would make every document a match; a query made only of
+        # such terms matches nothing
+        dfs = {term: df for term, df in dfs.items() if 0 < df <= MAX_DF_RATIO * self.n_docs}
+        if not dfs:
+            return 0, [], 0
+        idf = {term: math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5)) for term, df in dfs.items()}
+        min_match = math.ceil(MIN_MATCH_RATIO * len(idf))
+        candidate_ids, candidate_scores, matched, postings = [], [], 0, 0
+        base = 0
+        for segment in self.segments:
+            seg_docs, seg_scores = [], []
+            for term, weight in idf.items():
+                if term not in segment.vocab:
+                    continue
+                docs, tfs = segment.postings(term)
+                postings += len(docs)
+                tfs = tfs.astype(np.float64)
+                norm = K1 * (1 - B + B * segment.doclens[docs] / self.avg_len)
+                seg_docs.append(docs)
+                seg_scores.append(weight * tfs * (K1 + 1) / (tfs + norm))
+            if seg_docs:
+                # Sum the per-term contributions of each matched document
+                unique, inverse = np.unique(np.concatenate(seg_docs), return_inverse=True)
+                matched += int(np.count_nonzero(np.bincount(inverse) >= min_match))
+                candidate_ids.append(unique.astype(np.int64) + base)
+                candidate_scores.append(np.bincount(inverse, weights=np.concatenate(seg_scores)))
+            base += len(segment)
+        if not candidate_ids:
+            return 0, [], postings
+        ids = np.concatenate(candidate_ids)
+        scores = np.concatenate(candidate_scores)
+        best = top_k(scores, k)
+        return matched, [(float(scores[i]), self.document(int(ids[i]))) for i in best], postings
+
+    def document(self, doc_id):
+        for segment in self.segments:
+            if doc_id < len(segment):
+                return segment.document(doc_id)
+            doc_id -= len(segment)
+        raise IndexError(doc_id)
+
+
+def corpus_files(literature_dir=DEFAULT_LITERATURE_DIR):
+    return sorted(Path(literature_dir).glob("*.jsonl"))
+
+
+def open_literature_index(literature_dir=DEFAULT_LITERATURE_DIR, update=True):
+    # Index of the corpus in literature_dir (brought up to date first), or
+    # None if there is no corpus
+    literature_dir = Path(literature_dir)
+    sources = corpus_files(literature_dir)
+    if not sources:
+        return None
+    index_dir = literature_dir / "index"
+    if update:
+        update_index(index_dir, sources)
+    return LiteratureIndex(index_dir)
+
+
+class LiteratureMiningAgent(CatalogFindingsAgent):
+    # Ranks local abstracts against the research question with BM25; falls
+    # back to the catalog findings when no corpus is available
+    name = "Literature Mining Agent"
+    icon = "📚"
+    sources = CatalogFindingsAgent.sources + ("Abstract corpus",)
+    top_studies = 3
+
+    def __init__(self, literature_dir=DEFAULT_LITERATURE_DIR):
+        self.literature_dir = Path(literature_dir)
+        self._index = None
+        self._index_sources = None
+        self._lock = threading.Lock()
+
+    def index(self):
+        # Re-open (and incrementally update) only when the corpus changed
+        sources = tuple((str(p), p.stat().st_size) for p in corpus_files(self.literature_dir))
+        with self._lock:
+            if sources != self._index_sources:
+                self._index = open_literature_index(self.literature_dir) if sources else None
+                self._index_sources = sources
+            return self._index
+
+    def provenance_inputs(self, context, store):
+        files = corpus_files(self.literature_dir)
+        if not files:
+            return super().provenance_inputs(context, store)
+        return {"Abstract corpus": store.dataset_hash(files)}
+
+    def run(self, context):
+        index = self.index()
+        if index is None:
+            return super().run(context)
+        # The disease name only adds generic terms ("disease") to a question
+        query = context.question or context.disease.name
+        matched, hits, postings = index.search(query, k=self.top_studies)
+        if not matched:
+            findings = [f"No studies relevant to \"{query}\" among {index.n_docs:,} indexed abstracts"]
+            return AgentOutput(findings, {"documents_scanned": postings})
+        findings = [f"Extracted {matched:,} studies relevant to \"{query}\" from {index.n_docs:,} indexed abstracts"]
+        for score, document in hits:
+            findings.append(f"BM25 {score:.1f}: {document['title']} (PMID {document['pmid']})")
+        # Work done is the postings read, not the number of matches
+        return AgentOutput(findings, {"documents_scanned": postings})
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    sources = [Path(p) for p in argv] or corpus_files()
+    if not sources:
+        print(f"No corpus files given and none found in {DEFAULT_LITERATURE_DIR}")
+        return 1
+    index_dir = Path(sources[0]).resolve().parent / "index"
+    added = update_index(index_dir, sources)
+    index = LiteratureIndex(index_dir)
+    print(f"Indexed {added:,} new documents; {index.n_docs:,} documents in {len(index.segments)} segments at {index_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
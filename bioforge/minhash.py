@@ -0,0 +1,155 @@
+"""Near-duplicate hypotheses via MinHash and locality-sensitive hashing.
+
+Each hypothesis's title and description are normalized to word shingles
+(``SHINGLE_WORDS`` consecutive words) and summarized by a MinHash signature:
+the minimum of ``num_perm`` universal hashes over the shingles, so the share
+of equal signature entries estimates the Jaccard similarity of two shingle
+sets. Signatures are cut into bands; hypotheses sharing any band land in the
+same bucket and only those candidates are compared, so grouping n
+hypotheses costs O(n * bands) instead of O(n^2) comparisons.
+
+Near-duplicates are merged into the first hypothesis of their cluster,
+which gains the ``supporting_evidence`` of agents it did not cite yet.
+"""
+
+import re
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_NUM_PERM = 128
+# Estimated Jaccard similarity above which two hypotheses are duplicates
+DEFAULT_THRESHOLD = 0.7
+SHINGLE_WORDS = 3
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text, size=SHINGLE_WORDS):
+    words = WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def hypothesis_text(hypothesis):
+    return f"{hypothesis['title']} {hypothesis.get('description', '')}"
+
+
+@lru_cache(maxsize=None)
+def lsh_params(num_perm, threshold):
+    # (bands, rows) minimizing the false-positive plus false-negative
+    # probability mass around the threshold
+    s = np.linspace(0.0, 1.0, 201)
+    best = None
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        p = 1.0 - (1.0 - s ** rows) ** bands
+        error = np.mean(np.where(s < threshold, p, 1.0 - p))
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+class MinHasher:
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing of 32-bit shingle hashes: odd 64-bit
+        # multipliers, the top 32 bits of the (wrapping) product
+        self.a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, text):
+        values = np.fromiter((zlib.crc32(s.encode()) for s in shingles(text)), dtype=np.uint64)
+        hashed = (self.a[:, None] * values[None, :] + self.b[:, None]) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+
+def similarity(first, second):
+    # Estimated Jaccard similarity of two signatures
+    return float(np.mean(first == second))
+
+
+class LSHIndex:
+    # Banded signatures of at most `capacity` items (the oldest are evicted)
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, threshold=DEFAULT_THRESHOLD, capacity=None):
+        self.threshold = threshold
+        self.bands, self.rows = lsh_params(num_perm, threshold)
+        self.capacity = capacity
+        self._buckets = [{} for _ in range(self.bands)]
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def _keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def query(self, signature):
+        # The most similar indexed key at or above the threshold, or None
+        best, best_score = None, self.threshold
+        checked = set()
+        for bucket, band_key in zip(self._buckets, self._keys(signature)):
+            for key in bucket.get(band_key, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                score = similarity(signature, self._items[key])
+                if score >= best_score:
+                    best, best_score = key, score
+        return best
+
+    def insert(self, key, signature):
+        self._items[key] = signature
+        for bucket, band_key in zip(self._buckets, self._keys(signature)):
+            bucket.setdefault(band_key, []).append(key)
+        if self.capacity is not None and len(self._items) > self.capacity:
+            self._evict()
+
+    def _evict(self):
+        key, signature = self._items.popitem(last=False)
+        for bucket, band_key in zip(self._buckets, self._keys(signature)):
+            members = bucket[band_key]
+            members.remove(key)
+            if not members:
+                del bucket[band_key]
+
+
+def merge_evidence(target, duplicate):
+    # Add the duplicate's evidence from agents the target does not cite
+    evidence = target.setdefault("supporting_evidence", {})
+    for agent, text in duplicate.get("supporting_evidence", {}).items():
+        evidence.setdefault(agent, text)
+
+
+def near_duplicate_clusters(hypotheses, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM):
+    # Lists of positions, each cluster led by its first hypothesis
+    hasher = MinHasher(num_perm)
+    index = LSHIndex(num_perm, threshold)
+    clusters = OrderedDict()
+    for position, hypothesis in enumerate(hypotheses):
+        signature = hasher.signature(hypothesis_text(hypothesis))
+        leader = index.query(signature)
+        if leader is None:
+            index.insert(position, signature)
+            clusters[position] = [position]
+        else:
+            clusters[leader].append(position)
+    return list(clusters.values())
+
+
+def merge_near_duplicates(hypotheses, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM):
+    # One new dict per cluster: its first hypothesis with the merged evidence
+    hypotheses = list(hypotheses)
+    merged = []
+    for cluster in near_duplicate_clusters(hypotheses, threshold, num_perm):
+        leader = dict(hypotheses[cluster[0]])
+        leader["supporting_evidence"] = dict(leader.get("supporting_evidence", {}))
+        for position in cluster[1:]:
+            merge_evidence(leader, hypotheses[position])
+        merged.append(leader)
+    return merged
@@ -0,0 +1,205 @@
+"""Agent network diagram.
+
+The diagram is built from the agent registry: every agent is a node, the
+data sources it declares (``Agent.sources``) are nodes feeding it, and every
+agent feeds the hypothesis engine. ``build_graph`` turns an agent list into
+an ``AgentGraph``; ``layout`` places it with a layered (Sugiyama-style)
+layout:
+
+1. layers by longest path from the sources (sources, agents, engine);
+2. node order within each layer by a few barycenter sweeps, which keeps
+   agents next to the sources they share and limits edge crossings;
+3. layers wider than ``MAX_ROW`` nodes wrap onto several rows, so dozens of
+   agents stay legible.
+
+Layouts only depend on the graph and are cached. ``network_svg`` draws a
+layout as one SVG, colouring agents by run state (running agents pulse), so
+the same layout serves the idle diagram and live updates during a run.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from html import escape
+
+HUB = "Hypothesis Engine"
+HUB_ICON = "🧠"
+SOURCE_ICON = "🗄️"
+
+MAX_ROW = 8
+COLUMN_WIDTH = 120
+ROW_HEIGHT = 130
+MARGIN = 30
+SWEEPS = 4
+LABEL_WIDTH = 16
+
+SIZES = {"source": 44, "agent": 64, "hub": 88}
+FONT_SIZES = {"source": 20, "agent": 28, "hub": 40}
+
+GOLD = "#FFD700"
+ORANGE = "#FF4500"
+# Node outline per agent run state
+STATE_COLORS = {
+    "idle": GOLD,
+    "running": ORANGE,
+    "ok": "#39FF14",
+    "skipped": "#666666",
+    "error": "#FF3B3B",
+    "timeout": "#FF3B3B",
+}
+
+
+@dataclass(frozen=True)
+class Node:
+    id: str
+    label: str
+    icon: str
+    kind: str
+
+
+@dataclass(frozen=True)
+class AgentGraph:
+    nodes: tuple
+    # (source id, target id)
+    edges: tuple
+
+
+@dataclass
+class Layout:
+    width: float
+    height: float
+    # node id -> (x, y) of the node centre
+    positions: dict = field(default_factory=dict)
+
+
+def build_graph(agents):
+    # agents: objects with name, icon and sources (e.g. registered_agents())
+    nodes = OrderedDict()
+    edges = []
+    for agent in agents:
+        for source in getattr(agent, "sources", ()):
+            source_id = f"source:{source}"
+            nodes.setdefault(source_id, Node(source_id, source, SOURCE_ICON, "source"))
+            edges.append((source_id, agent.name))
+        nodes[agent.name] = Node(agent.name, agent.name, agent.icon, "agent")
+        edges.append((agent.name, HUB))
+    nodes[HUB] = Node(HUB, HUB, HUB_ICON, "hub")
+    return AgentGraph(tuple(nodes.values()), tuple(edges))
+
+
+def _layers(graph):
+    # Longest-path layering of a DAG; nodes without inputs are on layer 0
+    inputs = {node.id: [] for node in graph.nodes}
+    for source, target in graph.edges:
+        inputs[target].append(source)
+    depth = {}
+
+    def visit(node_id):
+        if node_id not in depth:
+            depth[node_id] = 0
+            depth[node_id] = 1 + max((visit(i) for i in inputs[node_id]), default=-1)
+        return depth[node_id]
+
+    layers = []
+    for node in graph.nodes:
+        d = visit(node.id)
+        while len(layers) <= d:
+            layers.append([])
+        layers[d].append(node.id)
+    return layers
+
+
+def _order(layers, graph):
+    # Barycenter sweeps: sort each layer by the mean position of its
+    # neighbours in the previous (downward) or next (upward) layer
+    neighbours = {node.id: ([], []) for node in graph.nodes}
+    for source, target in graph.edges:
+        neighbours[target][0].append(source)
+        neighbours[source][1].append(target)
+    position = {node_id: i for layer in layers for i, node_id in enumerate(layer)}
+    for sweep in range(SWEEPS):
+        downward = sweep % 2 == 0
+        indices = range(1, len(layers)) if downward else range(len(layers) - 2, -1, -1)
+        for i in indices:
+            def barycenter(node_id):
+                linked = neighbours[node_id][0 if downward else 1]
+                return sum(position[n] for n in linked) / len(linked) if linked else position[node_id]
+            layers[i].sort(key=barycenter)
+            position.update((node_id, j) for j, node_id in enumerate(layers[i]))
+    return layers
+
+
+@lru_cache(maxsize=64)
+def layout(graph):
+    rows = []
+    for layer in _order(_layers(graph), graph):
+        rows.extend(layer[start:start + MAX_ROW] for start in range(0, len(layer), MAX_ROW))
+    width = 2 * MARGIN + COLUMN_WIDTH * max(len(row) for row in rows)
+    result = Layout(width=width, height=2 * MARGIN + ROW_HEIGHT * len(rows))
+    for r, row in enumerate(rows):
+        # Rows are centred; odd rows are offset by a quarter column so
+        # edges from the row above pass between their nodes
+        offset = (width - COLUMN_WIDTH * len(row)) / 2 + (COLUMN_WIDTH / 4 if r % 2 else 0)
+        for c, node_id in enumerate(row):
+            result.positions[node_id] = (offset + COLUMN_WIDTH * (c + 0.5), MARGIN + ROW_HEIGHT * r + SIZES["hub"] / 2)
+    return result
+
+
+def _label_lines(text, width=LABEL_WIDTH):
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}".strip()
+    return lines + [line] if line else lines
+
+
+def _node_svg(node, x, y, color, running):
+    size = SIZES[node.kind]
+    half = size / 2
+    pulse = (
+        '<animate attributeName="stroke-opacity" values="1;0.2;1" dur="1s" repeatCount="indefinite"/>'
+        if running else ""
+    )
+    parts = [
+        f'<rect x="{x - half + 3:.1f}" y="{y - half + 3:.1f}" width="{size}" height="{size}" fill="{ORANGE}"/>',
+        f'<rect x="{x - half:.1f}" y="{y - half:.1f}" width="{size}" height="{size}" fill="#000" stroke="{color}" stroke-width="3">{pulse}</rect>',
+        f'<text x="{x:.1f}" y="{y:.1f}" font-size="{FONT_SIZES[node.kind]}" text-anchor="middle" dominant-baseline="central">{escape(node.icon)}</text>',
+    ]
+    parts.extend(
+        f'<text x="{x:.1f}" y="{y + half + 14 + 12 * i:.1f}" font-size="10" fill="{GOLD}" text-anchor="middle" '
+        f'font-family="Space Mono, monospace">{escape(line)}</text>'
+        for i, line in enumerate(_label_lines(node.label))
+    )
+    return "".join(parts)
+
+
+def network_svg(graph, states=None):
+    # states: agent name -> run state (see STATE_COLORS); others are idle
+    states = states or {}
+    placed = layout(graph)
+    nodes = {node.id: node for node in graph.nodes}
+    edges = []
+    for source, target in graph.edges:
+        (x1, y1), (x2, y2) = placed.positions[source], placed.positions[target]
+        y1 += SIZES[nodes[source].kind] / 2
+        y2 -= SIZES[nodes[target].kind] / 2
+        bend = (y2 - y1) / 2
+        active = states.get(source) == "running" or states.get(target) == "running"
+        dash = ' stroke-dasharray="6 4"' if active else ""
+        animate = '<animate attributeName="stroke-dashoffset" values="10;0" dur="0.5s" repeatCount="indefinite"/>' if active else ""
+        edges.append(
+            f'<path d="M{x1:.1f},{y1:.1f} C{x1:.1f},{y1 + bend:.1f} {x2:.1f},{y2 - bend:.1f} {x2:.1f},{y2:.1f}" '
+            f'fill="none" stroke="{ORANGE if active else "#8a2a00"}" stroke-width="{3 if active else 2}"{dash}>{animate}</path>'
+        )
+    shapes = "".join(
+        _node_svg(node, *placed.positions[node.id], STATE_COLORS.get(states.get(node.id, "idle"), GOLD), states.get(node.id) == "running")
+        for node in graph.nodes
+    )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {placed.width:.0f} {placed.height:.0f}" '
+        f'width="{placed.width:.0f}" style="max-width:100%;height:auto" role="img" aria-label="Agent network">'
+        f'{"".join(edges)}{shapes}</svg>'
+    )
@@ -0,0 +1,350 @@
+"""Streaming hypothesis generation.
+
+Hypotheses are synthesized by a graph of streaming stages:
+
+    findings -> extraction -> cross-linking -> scoring -> deduplication
+                                                 ^
+                      catalog hypotheses --------+
+
+* findings: agent findings from a processed run (or the catalog findings);
+* extraction: entities (gene and biomarker symbols, known concepts) and
+  the relations stated between them in each finding;
+* cross-linking: pairs an entity from one agent with entities recently
+  reported by other agents, over a bounded window per agent;
+* scoring: confidence, novelty and testability for each candidate;
+* deduplication: merges near-duplicates of hypotheses already emitted
+  (see ``bioforge.minhash``).
+
+Stages are generators; ``bounded`` runs a stage on its own thread behind a
+queue of ``queue_size`` items. Every stage keeps only bounded state (the
+cross-linking window and the recently-seen sets), so memory depends on the
+queue and window sizes, not on how many candidates flow through, and the
+first hypotheses reach the caller while later ones are still produced.
+"""
+
+import queue
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from bioforge.minhash import DEFAULT_THRESHOLD, LSHIndex, MinHasher, hypothesis_text, merge_evidence
+
+DEFAULT_QUEUE_SIZE = 64
+# Recent extractions kept per agent for cross-linking
+DEFAULT_WINDOW = 32
+# Keys remembered by the seen-sets of cross-linking and deduplication
+DEFAULT_SEEN = 10_000
+
+STAGES = ("findings", "extraction", "cross-linking", "scoring", "deduplication")
+
+CONCEPTS = (
+    "amyloid", "tau", "gut-brain axis", "microbiome", "microglia", "neuroinflammation",
+    "inflammation", "sleep", "circadian", "insulin", "insulin resistance", "beta cell",
+    "exosome", "immune", "stroma", "stromal", "mitochondria", "mitochondrial", "oxidative stress",
+    "synaptic", "blood-brain barrier", "cognitive", "metabolic", "fibrosis", "hypoxia",
+    "lipid", "glucose", "adipose", "liver", "pancreatic", "vascular", "autophagy",
+    "epigenetic", "methylation", "cytokine", "t cell", "macrophage", "neurons", "astrocytes",
+)
+
+# Upper-case tokens that look like symbols but are not entities
+NON_ENTITIES = frozenset({"BM25", "PMID", "FDR", "VCF", "CSV", "DNA", "RNA", "USA"})
+
+RELATION_WORDS = (
+    "linked to", "linking", "associated with", "correlates with", "correlated with",
+    "tracks", "drives", "regulates", "interacts with", "interactions between", "affects",
+)
+
+SYMBOL_RE = re.compile(r"\b[A-Za-z0-9]*[A-Z][A-Za-z0-9]*[A-Z0-9][A-Za-z0-9-]*\b")
+CONCEPT_RE = re.compile(r"\b(?:" + "|".join(sorted((re.escape(c) for c in CONCEPTS), key=len, reverse=True)) + r")\b", re.IGNORECASE)
+RELATION_RE = re.compile("|".join(re.escape(w) for w in RELATION_WORDS), re.IGNORECASE)
+NUMBER_RE = re.compile(r"\d")
+
+
+@dataclass(frozen=True)
+class Finding:
+    agent: str
+    text: str
+
+
+@dataclass(frozen=True)
+class Entity:
+    key: str
+    label: str
+    # Gene/biomarker symbols are directly measurable
+    symbol: bool = False
+
+
+@dataclass
+class Extraction:
+    finding: Finding
+    entities: list
+    # (entity key, relation words, entity key)
+    relations: list = field(default_factory=list)
+
+
+@dataclass
+class Candidate:
+    entities: tuple
+    evidence: dict
+    related: bool = False
+
+
+@dataclass
+class PipelineStats:
+    # Items emitted per stage
+    counts: dict = field(default_factory=lambda: dict.fromkeys(STAGES, 0))
+
+    def count(self, stage):
+        self.counts[stage] += 1
+
+
+class _SeenSet:
+    # Set of the most recent `capacity` keys
+    def __init__(self, capacity=DEFAULT_SEEN):
+        self.capacity = capacity
+        self._keys = OrderedDict()
+
+    def add(self, key):
+        # True if the key was new
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.capacity:
+            self._keys.popitem(last=False)
+        return True
+
+
+_DONE = object()
+# Seconds between checks for a closed stage while a queue is full or empty
+POLL_INTERVAL = 0.1
+
+
+class bounded:
+    # Iterate over `iterable` on a worker thread through a queue of at most
+    # `maxsize` items, so the producer runs ahead of the consumer by a
+    # bounded amount. Closing (or exhausting) the iterator stops the worker
+    # and closes `upstream`, the bounded stages the iterable reads from (a
+    # bounded iterable is upstream itself); the worker closes the iterable.
+
+    def __init__(self, iterable, maxsize=DEFAULT_QUEUE_SIZE, upstream=()):
+        self._queue = queue.Queue(maxsize)
+        self._stop = threading.Event()
+        self._upstream = tuple(upstream) + ((iterable,) if isinstance(iterable, bounded) else ())
+        self._thread = threading.Thread(target=self._produce, args=(iterable,), name="bioforge-stage", daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, iterable):
+        try:
+            for item in iterable:
+                if not self._put(item):
+                    return
+        except BaseException as exc:
+            self._put(exc)
+            return
+        finally:
+            # Generators are closed on this thread, the one running them
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                close()
+        self._put(_DONE)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            if self._stop.is_set():
+                raise StopIteration
+            try:
+                item = self._queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                self.close()
+                raise StopIteration
+            if isinstance(item, BaseException):
+                self.close()
+                raise item
+            return item
+
+    def close(self):
+        self._stop.set()
+        for stage in self._upstream:
+            stage.close()
+
+
+def finding_stage(disease, agent_results=None, stats=None):
+    # Findings of a processed agent run, or the catalog findings
+    if agent_results:
+        sources = ((r.agent, r.findings) for r in agent_results.values() if r.ok)
+    else:
+        sources = disease.agents.items()
+    for agent, findings in sources:
+        for text in findings:
+            if stats is not None:
+                stats.count("findings")
+            yield Finding(agent, text)
+
+
+def extract_entities(text):
+    entities = OrderedDict()
+    for match in SYMBOL_RE.finditer(text):
+        label = match.group(0).strip("-")
+        if label.upper() not in NON_ENTITIES and not label.isdigit():
+            entities.setdefault(label.lower(), Entity(label.lower(), label, symbol=True))
+    for match in CONCEPT_RE.finditer(text):
+        key = match.group(0).lower()
+        entities.setdefault(key, Entity(key, key))
+    return list(entities.values())
+
+
+def extract_relations(text, entities):
+    # Consecutive entity mentions joined by a relation phrase
+    positions = sorted(
+        (m.start(), m.end(), e.key)
+        for e in entities
+        for m in re.finditer(re.escape(e.label), text, re.IGNORECASE)
+    )
+    relations = []
+    for (_, end, left), (start, _, right) in zip(positions, positions[1:]):
+        if left != right:
+            words = RELATION_RE.search(text, end, start)
+            if words:
+                relations.append((left, words.group(0).lower(), right))
+    return relations
+
+
+def extraction_stage(findings, exclude="", stats=None):
+    # exclude: text whose words are not entities (e.g. the disease name)
+    exclude = set(re.findall(r"[a-z0-9-]+", exclude.lower()))
+    for finding in findings:
+        entities = [e for e in extract_entities(finding.text) if e.key not in exclude]
+        if entities:
+            if stats is not None:
+                stats.count("extraction")
+            yield Extraction(finding, entities, extract_relations(finding.text, entities))
+
+
+def link_stage(extractions, window=DEFAULT_WINDOW, seen=DEFAULT_SEEN, stats=None):
+    # Pair each new entity with entities other agents reported recently
+    recent = {}
+    emitted = _SeenSet(seen)
+    for extraction in extractions:
+        agent = extraction.finding.agent
+        related = {frozenset((a, b)) for a, _, b in extraction.relations}
+        for other_agent, others in recent.items():
+            if other_agent == agent:
+                continue
+            for other in others:
+                for entity in extraction.entities:
+                    for partner in other.entities:
+                        if entity.key == partner.key:
+                            continue
+                        key = frozenset((entity.key, partner.key))
+                        if not emitted.add(key):
+                            continue
+                        if stats is not None:
+                            stats.count("cross-linking")
+                        yield Candidate(
+                            entities=(entity, partner),
+                            evidence={agent: extraction.finding.text, other_agent: other.finding.text},
+                            related=key in related or any(e.key == partner.key for e in extraction.entities),
+                        )
+        agent_window = recent.setdefault(agent, [])
+        agent_window.append(extraction)
+        if len(agent_window) > window:
+            del agent_window[0]
+
+
+def _short(agent):
+    return agent.split()[0].lower()
+
+
+def _title(entity):
+    # Symbols keep their casing ("ApoE4"), concepts are title-cased
+    return entity.label if entity.symbol else entity.label.title()
+
+
+def candidate_hypothesis(candidate, disease_name, catalog_text):
+    # Hypothesis dict with scores for a cross-linked candidate
+    first, second = candidate.entities
+    agents = list(candidate.evidence)
+    title = f"{_title(first)}-{_title(second)} Interaction Hypothesis"
+    description = (
+        f"{_short(agents[0]).capitalize()} findings on {first.label} and {_short(agents[1])} findings on "
+        f"{second.label} suggest that {first.label} may act through {second.label} in {disease_name}."
+    )
+    quantified = sum(bool(NUMBER_RE.search(text)) for text in candidate.evidence.values())
+    mentions = sum(entity.key in catalog_text for entity in candidate.entities)
+    symbols = sum(entity.symbol for entity in candidate.entities)
+    return {
+        "title": title,
+        "description": description,
+        "supporting_evidence": dict(candidate.evidence),
+        "confidence": min(95, 45 + 10 * (len(agents) - 1) + 5 * quantified + (10 if candidate.related else 0)),
+        "novelty": max(40, 90 - 15 * mentions),
+        "testability": min(95, 55 + 15 * symbols),
+        "synthesized": True,
+    }
+
+
+def scoring_stage(candidates, disease, stats=None):
+    catalog_text = " ".join(f"{h['title']} {h['description']}" for h in disease.hypotheses).lower()
+    for candidate in candidates:
+        if stats is not None:
+            stats.count("scoring")
+        yield candidate_hypothesis(candidate, disease.name, catalog_text)
+
+
+def dedup_stage(hypotheses, seen=DEFAULT_SEEN, threshold=DEFAULT_THRESHOLD, stats=None):
+    # Emit copies of hypotheses that are not near-duplicates (MinHash/LSH
+    # over title and description) of one already emitted; a duplicate's
+    # evidence is merged into the emitted copy in place
+    hasher = MinHasher()
+    index = LSHIndex(hasher.num_perm, threshold, capacity=seen)
+    emitted = OrderedDict()
+    for position, hypothesis in enumerate(hypotheses):
+        signature = hasher.signature(hypothesis_text(hypothesis))
+        leader = index.query(signature)
+        if leader is not None:
+            merge_evidence(emitted[leader], hypothesis)
+            continue
+        hypothesis = dict(hypothesis, supporting_evidence=dict(hypothesis.get("supporting_evidence", {})))
+        index.insert(position, signature)
+        emitted[position] = hypothesis
+        if len(emitted) > seen:
+            emitted.popitem(last=False)
+        if stats is not None:
+            stats.count("deduplication")
+        yield hypothesis
+
+
+def hypothesis_stream(disease, question=None, agent_results=None, queue_size=DEFAULT_QUEUE_SIZE, window=DEFAULT_WINDOW, stats=None):
+    # Catalog hypotheses for the question, then hypotheses synthesized from
+    # the agent findings, deduplicated, as a lazily evaluated stream
+    findings = finding_stage(disease, agent_results, stats)
+    extractions = extraction_stage(findings, disease.name, stats)
+    candidates = bounded(link_stage(extractions, window, stats=stats), queue_size)
+    scored = bounded(scoring_stage(candidates, disease, stats), queue_size, upstream=(candidates,))
+
+    def merged():
+        try:
+            yield from disease.hypotheses_for(question)
+            yield from scored
+        finally:
+            # Stop the stage threads (scored closes candidates) if the
+            # consumer stops early
+            scored.close()
+
+    return dedup_stage(merged(), stats=stats)
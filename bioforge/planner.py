@@ -0,0 +1,135 @@
+"""Query planning for agent runs.
+
+A research question is turned into a ``QueryPlan`` before any agent runs:
+
+* ``ScanFilters`` - the question's content words, the gene symbols it names
+  and cohort constraints it implies ("early-onset" -> age at onset < 65);
+  agents push these down into their scans (only the named genes' expression
+  rows, only the matching samples or patients, only the variant or
+  expression shards the question is about);
+* agent routing - an agent declares the ``topics`` its data scans answer;
+  when the question does not touch them the scan is pruned. Agents with a
+  catalog fallback still run and serve the disease's catalog findings
+  (listed in ``QueryPlan.catalog_only``, passed to them as
+  ``AgentContext.catalog_only``); other agents are skipped. Agents without
+  topics, such as literature mining, always scan.
+
+Cohort predicates only apply to tables that have the column, and rows with
+no value in it are kept: in a case-control cohort the controls have no age
+at onset and stay in the comparison.
+"""
+
+import operator
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from bioforge.pipeline import extract_entities
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or role that the their these this to via which with "
+    "mechanisms patterns approaches factors".split()
+)
+
+# (pattern, column, operator, value or None to use the captured number)
+COHORT_PATTERNS = (
+    (re.compile(r"\bearly[- ]onset\b", re.IGNORECASE), "age_at_onset", "<", 65),
+    (re.compile(r"\blate[- ]onset\b", re.IGNORECASE), "age_at_onset", ">=", 65),
+    (re.compile(r"\b(?:over|above|older than) (\d+)", re.IGNORECASE), "age", ">", None),
+    (re.compile(r"\b(?:under|below|younger than) (\d+)", re.IGNORECASE), "age", "<", None),
+)
+
+OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq}
+
+
+@dataclass(frozen=True)
+class ScanFilters:
+    terms: frozenset = frozenset()
+    # Gene symbols named in the question
+    genes: tuple = ()
+    # (column, operator, value) predicates on cohort tables
+    cohort: tuple = ()
+
+    def mentions(self, topics):
+        # Whether any question word starts with one of the topic stems
+        return any(term.startswith(topics) for term in self.terms)
+
+    def cohort_mask(self, table):
+        # Boolean row mask of a DataFrame for the predicates on its columns;
+        # rows missing the column's value are kept
+        mask = np.ones(len(table), dtype=bool)
+        for column, op, value in self.cohort:
+            if column in table.columns:
+                values = table[column]
+                mask &= (OPERATORS[op](values, value) | values.isna()).to_numpy()
+        return mask
+
+    def describe(self):
+        parts = []
+        if self.genes:
+            parts.append("genes " + ", ".join(self.genes))
+        parts.extend(f"{column} {op} {value}" for column, op, value in self.cohort)
+        return parts
+
+
+NO_FILTERS = ScanFilters()
+
+
+def scan_filters(question, exclude=""):
+    # exclude: text whose words are not filter terms (e.g. the disease name)
+    if not question:
+        return NO_FILTERS
+    excluded = set(re.findall(r"[a-z0-9]+", exclude.lower()))
+    terms = frozenset(
+        word for word in re.findall(r"[a-z0-9]+", question.lower())
+        if word not in STOPWORDS and word not in excluded
+    )
+    genes = tuple(e.label for e in extract_entities(question) if e.symbol and e.key not in excluded)
+    cohort = []
+    for pattern, column, op, value in COHORT_PATTERNS:
+        match = pattern.search(question)
+        if match:
+            cohort.append((column, op, value if value is not None else int(match.group(1))))
+    return ScanFilters(terms, genes, tuple(cohort))
+
+
+@dataclass
+class QueryPlan:
+    question: str
+    filters: ScanFilters
+    # Agents to run, in registry order
+    agents: list = field(default_factory=list)
+    # Agent name -> reason it is skipped
+    skipped: dict = field(default_factory=dict)
+    # Names of agents in `agents` whose data scans are pruned; they serve
+    # their catalog findings
+    catalog_only: frozenset = frozenset()
+
+    def describe(self):
+        lines = ["ROUTED TO " + ", ".join(agent.name for agent in self.agents)]
+        if self.catalog_only:
+            lines.append("CATALOG ONLY " + ", ".join(a.name for a in self.agents if a.name in self.catalog_only))
+        if self.skipped:
+            lines.append("SKIPPED " + ", ".join(self.skipped))
+        filters = self.filters.describe()
+        if filters:
+            lines.append("FILTERS " + "; ".join(filters))
+        return lines
+
+
+def plan_query(disease, question, agents):
+    # Plan a run of `agents` for a research question about `disease`
+    filters = scan_filters(question, disease.name)
+    plan = QueryPlan(question, filters)
+    catalog_only = set()
+    for agent in agents:
+        if question is None or agent.relevant(filters):
+            plan.agents.append(agent)
+        elif agent.catalog_fallback:
+            plan.agents.append(agent)
+            catalog_only.add(agent.name)
+        else:
+            plan.skipped[agent.name] = "not needed for this research question"
+    plan.catalog_only = frozenset(catalog_only)
+    return plan
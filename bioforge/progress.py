@@ -0,0 +1,117 @@
+"""Progress reporting for agent and hypothesis pipelines.
+
+Pipelines report work into a ``ProgressTracker`` (step counts plus an
+optional label); the tracker computes elapsed time and an ETA and forwards
+snapshots to a render callback at a bounded frame rate, so the UI only
+redraws when something changed and never more than ``fps`` times a second.
+
+``advance`` is thread-safe. Only the thread that created the tracker invokes
+the callback (Streamlit elements must be updated from the script thread);
+progress reported from worker threads is picked up by the next ``refresh``
+on the owning thread.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+DEFAULT_FPS = 12
+
+
+@dataclass(frozen=True)
+class ProgressState:
+    done: int
+    total: int
+    label: str
+    elapsed: float
+    finished: bool = False
+
+    @property
+    def fraction(self):
+        if self.total <= 0:
+            return 1.0 if self.finished else 0.0
+        return min(1.0, self.done / self.total)
+
+    @property
+    def eta(self):
+        # Seconds remaining at the observed rate, None until there is a rate
+        if self.finished:
+            return 0.0
+        if self.done <= 0 or self.total <= 0:
+            return None
+        return self.elapsed / self.done * max(0, self.total - self.done)
+
+
+class ProgressTracker:
+    def __init__(self, total, label="", callback=None, fps=DEFAULT_FPS):
+        self.total = total
+        self.label = label
+        self.callback = callback
+        self.min_interval = 1.0 / fps if fps else 0.0
+        self.done = 0
+        self.frames = 0
+        self._started = time.perf_counter()
+        self._last_emit = None
+        self._dirty = True
+        self._finished = False
+        self._lock = threading.Lock()
+        self._owner = threading.get_ident()
+
+    def state(self):
+        with self._lock:
+            return ProgressState(
+                done=self.done,
+                total=self.total,
+                label=self.label,
+                elapsed=time.perf_counter() - self._started,
+                finished=self._finished,
+            )
+
+    def advance(self, steps=1, label=None):
+        with self._lock:
+            self.done += steps
+            if label is not None:
+                self.label = label
+            self._dirty = True
+        if threading.get_ident() == self._owner:
+            self.refresh()
+
+    def add_total(self, steps):
+        # Grow the step count when a pipeline discovers more work
+        with self._lock:
+            self.total += steps
+            self._dirty = True
+
+    def set_label(self, label):
+        with self._lock:
+            self.label = label
+            self._dirty = True
+
+    def refresh(self, force=False):
+        # Emit a snapshot if something changed and the frame budget allows it
+        if self.callback is None or threading.get_ident() != self._owner:
+            return False
+        now = time.perf_counter()
+        with self._lock:
+            due = self._last_emit is None or now - self._last_emit >= self.min_interval
+            if not (self._dirty and (due or force)):
+                return False
+            self._dirty = False
+            self._last_emit = now
+        self.frames += 1
+        self.callback(self.state())
+        return True
+
+    def finish(self):
+        with self._lock:
+            self._finished = True
+            self._dirty = True
+        self.refresh(force=True)
+
+    def __enter__(self):
+        self.refresh(force=True)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish()
+        return False
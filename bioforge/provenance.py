@@ -0,0 +1,243 @@
+"""Content-addressed provenance store for agent runs.
+
+Every agent run is described by its inputs:
+
+* dataset fingerprints - SHA-256 of the files the agent reads (or of the
+  catalog findings it serves), declared by ``Agent.provenance_inputs``;
+* the query - disease, research question, federated flag and pushed-down
+  ``ScanFilters``;
+* parameters - the agent's public scalar settings;
+* code version - SHA-256 of the source of the agent's module and of the
+  ``bioforge`` modules it uses.
+
+The canonical JSON of those inputs hashes to the run's key. The run's output
+(findings, metrics, evidence) is stored as an object addressed by its own
+hash, and ``runs/<key>.json`` links the inputs to it, so identical outputs
+are stored once. A run with the same key is served from the store instead
+of being recomputed; a changed file, question, setting or agent source gives
+a new key.
+
+Evidence that no agent run produced comes from the disease catalog. Each
+catalog record is stored the same way, as a run of source ``Disease catalog``
+keyed by the record's fingerprint (``ProvenanceStore.catalog_key``), so those
+evidence lines are traceable too.
+
+File hashes are memoized by (path, size, mtime), so large cohorts are only
+read again after they change. The store lives in ``data/provenance/`` (or
+``$BIOFORGE_PROVENANCE``); ``python -m bioforge.provenance <key>`` prints a
+run's record.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+
+DEFAULT_PROVENANCE_DIR = Path(
+    os.environ.get(
+        "BIOFORGE_PROVENANCE",
+        Path(__file__).resolve().parent.parent / "data" / "provenance",
+    )
+)
+
+HASH_BLOCK = 1 << 20
+CATALOG_SOURCE = "Disease catalog"
+SCALARS = (str, int, float, bool, type(None))
+
+
+def canonical_json(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_jsonable)
+
+
+def _jsonable(value):
+    if is_dataclass(value):
+        return asdict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, Path):
+        return str(value)
+    return repr(value)
+
+
+def digest(data):
+    return hashlib.sha256(data if isinstance(data, bytes) else data.encode("utf-8")).hexdigest()
+
+
+def _module_closure(module):
+    # The module plus the bioforge modules its globals come from, recursively
+    seen = {}
+    pending = [module]
+    while pending:
+        current = pending.pop()
+        if current.__name__ in seen:
+            continue
+        seen[current.__name__] = current
+        for value in vars(current).values():
+            name = value.__name__ if inspect.ismodule(value) else getattr(value, "__module__", None)
+            if isinstance(name, str) and name.startswith("bioforge") and name in sys.modules:
+                pending.append(sys.modules[name])
+    return [seen[name] for name in sorted(seen)]
+
+
+_code_versions = {}
+
+
+def code_version(agent):
+    # Hash of the source files the agent's class depends on
+    module = sys.modules[type(agent).__module__]
+    version = _code_versions.get(module.__name__)
+    if version is None:
+        sources = []
+        for dependency in _module_closure(module):
+            path = getattr(dependency, "__file__", None)
+            if path:
+                sources.append(f"{dependency.__name__}:{digest(Path(path).read_bytes())}")
+        version = _code_versions[module.__name__] = digest("\n".join(sources))
+    return version
+
+
+def agent_params(agent):
+    # Public scalar settings of an agent (class attributes and instance
+    # state); data directories are left out, their contents are fingerprinted
+    params = {}
+    for scope in [vars(cls) for cls in reversed(type(agent).__mro__)] + [vars(agent)]:
+        params.update((k, v) for k, v in scope.items() if not k.startswith("_") and isinstance(v, SCALARS))
+    return params
+
+
+class ProvenanceStore:
+    def __init__(self, root=DEFAULT_PROVENANCE_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._file_hashes = None
+
+    # -- dataset fingerprints ------------------------------------------------
+
+    def _memo_path(self):
+        return self.root / "file-hashes.json"
+
+    def _load_memo(self):
+        if self._file_hashes is None:
+            try:
+                self._file_hashes = json.loads(self._memo_path().read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._file_hashes = {}
+        return self._file_hashes
+
+    def file_hash(self, path):
+        path = Path(path).resolve()
+        stat = path.stat()
+        stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+        with self._lock:
+            memo = self._load_memo()
+            cached = memo.get(str(path))
+            if cached and cached[0] == stamp:
+                return cached[1]
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK), b""):
+                sha.update(block)
+        value = sha.hexdigest()
+        with self._lock:
+            memo = self._load_memo()
+            memo[str(path)] = [stamp, value]
+            self._write(self._memo_path(), canonical_json(memo))
+        return value
+
+    def dataset_hash(self, paths):
+        # Hash of a set of files, by name and content
+        return digest("\n".join(f"{Path(p).name}:{self.file_hash(p)}" for p in sorted(paths, key=str)))
+
+    # -- runs ------------------------------------------------------------------
+
+    def run_inputs(self, agent, context):
+        return {
+            "agent": agent.name,
+            "datasets": agent.provenance_inputs(context, self),
+            "query": {
+                "disease": context.disease.name,
+                "question": context.question,
+                "federated": bool(context.federated),
+                "filters": context.filters,
+            },
+            "params": agent_params(agent),
+            "code_version": code_version(agent),
+        }
+
+    def run_key(self, agent, context):
+        # (key, inputs) of an agent run
+        inputs = json.loads(canonical_json(self.run_inputs(agent, context)))
+        return digest(canonical_json(inputs)), inputs
+
+    def _run_path(self, key):
+        return self.root / "runs" / key[:2] / f"{key}.json"
+
+    def _object_path(self, key):
+        return self.root / "objects" / key[:2] / f"{key}.json"
+
+    def _write(self, path, text):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary.write_text(text, encoding="utf-8")
+        temporary.replace(path)
+
+    def record(self, key):
+        # The stored run (inputs, output key, time) with its output, or None
+        try:
+            run = json.loads(self._run_path(key).read_text(encoding="utf-8"))
+            run["output"] = json.loads(self._object_path(run["output_key"]).read_text(encoding="utf-8"))
+        except (OSError, ValueError, KeyError):
+            return None
+        return run
+
+    def load(self, key):
+        # Output dict (findings, metrics, evidence) of a stored run, or None
+        run = self.record(key)
+        return run["output"] if run else None
+
+    def catalog_key(self, disease):
+        # Key of a disease catalog record (a DiseaseRecord), stored as a run
+        # whose output is the record's findings and hypothesis evidence
+        record = disease.to_dict()
+        inputs = {
+            "source": CATALOG_SOURCE,
+            "datasets": {CATALOG_SOURCE: digest(canonical_json(record))},
+            "query": {"disease": disease.name},
+        }
+        key = digest(canonical_json(inputs))
+        if not self._run_path(key).exists():
+            self.save(key, inputs, {
+                "findings": record["agents"],
+                "evidence": {h["title"]: h.get("supporting_evidence", {}) for h in record["hypotheses"]},
+            })
+        return key
+
+    def save(self, key, inputs, output):
+        text = canonical_json(output)
+        output_key = digest(text)
+        if not self._object_path(output_key).exists():
+            self._write(self._object_path(output_key), text)
+        self._write(self._run_path(key), canonical_json({"key": key, "inputs": inputs, "output_key": output_key, "created": time.time()}))
+        return output_key
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: python -m bioforge.provenance <run key>", file=sys.stderr)
+        return 2
+    record = ProvenanceStore().record(argv[0])
+    if record is None:
+        print(f"no run {argv[0]}", file=sys.stderr)
+        return 1
+    print(json.dumps(record, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Hypothesis ranking.
+
+Hypotheses are ranked over their [confidence, novelty, testability] score
+matrix, either by a weighted score or by extracting the non-dominated
+(Pareto) front. ``RankedView`` pages through a ranking and only orders as
+many hypotheses as the requested page needs: ``top_k`` uses
+``np.argpartition`` so showing page 1 of 30,000 hypotheses sorts 20 rows,
+not 30,000.
+"""
+
+import math
+
+import numpy as np
+
+from bioforge.federated import SCORE_FIELDS, score_matrix
+
+CATALOG_ORDER = "CATALOG ORDER"
+WEIGHTED_SCORE = "WEIGHTED SCORE"
+PARETO_FRONT = "PARETO FRONT"
+RANKING_MODES = (WEIGHTED_SCORE, PARETO_FRONT, CATALOG_ORDER)
+
+DEFAULT_WEIGHTS = (1.0, 1.0, 1.0)
+DEFAULT_PAGE_SIZE = 20
+
+
+def weighted_scores(matrix, weights=DEFAULT_WEIGHTS):
+    weights = np.asarray(weights, dtype=np.float64)
+    total = weights.sum()
+    if total > 0:
+        weights = weights / total
+    return np.asarray(matrix, dtype=np.float64) @ weights
+
+
+def top_k(scores, k):
+    # Indices of the k highest scores, best first (ties by position)
+    scores = np.asarray(scores)
+    n = len(scores)
+    k = max(0, min(k, n))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        # Keep every row tied with the k-th score so that pages cut from
+        # different k agree with a full sort
+        threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(n)
+    return candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+
+
+def pareto_front(matrix):
+    # Indices of non-dominated rows, ordered by descending score sum. A row
+    # can only be dominated by rows with a larger sum, so one pass in sum
+    # order against the front found so far is enough.
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if len(matrix) == 0:
+        return np.empty(0, dtype=np.int64)
+    order = np.lexsort((np.arange(len(matrix)), -matrix.sum(axis=1)))
+    front = np.empty_like(matrix)
+    indices = []
+    for i in order:
+        point = matrix[i]
+        kept = front[:len(indices)]
+        dominated = np.all(kept >= point, axis=1) & np.any(kept > point, axis=1)
+        if not dominated.any():
+            front[len(indices)] = point
+            indices.append(i)
+    return np.asarray(indices, dtype=np.int64)
+
+
+class RankedView:
+    def __init__(self, hypotheses, mode=WEIGHTED_SCORE, weights=DEFAULT_WEIGHTS, matrix=None):
+        self.hypotheses = hypotheses
+        self.mode = mode
+        self.weights = tuple(weights)
+        self.matrix = score_matrix(hypotheses, SCORE_FIELDS) if matrix is None else matrix
+        self._scores = None
+        self._front = None
+
+    @property
+    def scores(self):
+        if self._scores is None:
+            self._scores = weighted_scores(self.matrix, self.weights)
+        return self._scores
+
+    @property
+    def front(self):
+        if self._front is None:
+            self._front = pareto_front(self.matrix)
+        return self._front
+
+    def __len__(self):
+        if self.mode == PARETO_FRONT:
+            return len(self.front)
+        return len(self.hypotheses)
+
+    def n_pages(self, per_page=DEFAULT_PAGE_SIZE):
+        return max(1, math.ceil(len(self) / per_page))
+
+    def indices(self, start, stop):
+        # Catalog positions of ranks [start, stop)
+        if self.mode == CATALOG_ORDER:
+            return np.arange(start, min(stop, len(self.hypotheses)))
+        if self.mode == PARETO_FRONT:
+            return self.front[start:stop]
+        return top_k(self.scores, stop)[start:stop]
+
+    def page(self, number, per_page=DEFAULT_PAGE_SIZE):
+        # [(rank, catalog position, hypothesis)] for a zero-based page number
+        start = number * per_page
+        positions = self.indices(start, start + per_page)
+        return [
+            (start + offset, int(position), self.hypotheses[position])
+            for offset, position in enumerate(positions)
+        ]
@@ -0,0 +1,166 @@
+"""HTML fragments for hypothesis cards.
+
+Each hypothesis card (description, supporting evidence and the three metric
+bars) is produced from precompiled ``string.Template`` fragments as a single
+HTML string, so it costs one ``st.markdown`` delta instead of one per
+paragraph. Fragments contain no blank lines or indentation, which Markdown
+would otherwise turn into paragraph breaks or code blocks.
+"""
+
+from html import escape
+from string import Template
+
+from bioforge.federated import SCORE_FIELDS
+
+
+def _compile(*lines):
+    return Template("".join(line.strip() for line in lines))
+
+
+CARD_TEMPLATE = _compile(
+    '<div class="pixel-box" style="background-color:#121240;">',
+    '<p style="font-family:Space Mono, monospace; color: #ffffff;">$description</p>',
+    '<h4 style="color:#FFD700;font-family:VT323, monospace;">SUPPORTING EVIDENCE:</h4>',
+    "$evidence",
+    "<h4 style=\"color:#FFD700;font-family:VT323, monospace;\">HYPOTHESIS METRICS:</h4>",
+    '<div style="display:flex;gap:10px;">$metrics</div>',
+    "$ratings",
+    "</div>",
+)
+
+RATINGS_TEMPLATE = _compile(
+    '<div style="border:2px solid #FF4500;padding:5px 10px;margin-top:10px;font-family:Space Mono, monospace;font-size:13px;">',
+    '<span style="color:#FFD700;font-family:VT323, monospace;font-size:18px;">RESEARCHER RATINGS:</span>&nbsp;',
+    "$count EVALUATIONS | POTENTIAL $potential | NOVELTY $novelty | $priorities",
+    "</div>",
+)
+
+EVIDENCE_TEMPLATE = _compile(
+    '<div style="margin:10px 0;">',
+    '<span style="color:#FF4500;font-family:VT323, monospace;">$icon $agent:</span>$run',
+    '<div style="border-left:3px solid #FFD700;padding-left:10px;margin-top:5px;font-family:Space Mono, monospace;font-size:14px;color:#ffffff;background-color:#121240;">$evidence</div>',
+    "</div>",
+)
+
+# Provenance run of an evidence line (python -m bioforge.provenance <key>)
+RUN_ID_LENGTH = 12
+RUN_TEMPLATE = _compile(
+    '<span title="provenance run $key" style="float:right;font-family:Space Mono, monospace;font-size:11px;color:#888;">run $short</span>',
+)
+
+METRIC_TEMPLATE = _compile(
+    '<div style="flex:1;text-align:center;border:2px solid #FFD700;padding:10px;margin:5px;background:#121240;">',
+    '<div style="font-family:VT323, monospace;color:#FFD700;">$label</div>',
+    '<div style="font-size:30px;font-family:VT323, monospace;color:#FF4500;">$value%</div>',
+    '<div style="width:100%;background:#333;height:10px;margin-top:5px;">',
+    '<div style="width:$value%;background:#FFD700;height:10px;"></div>',
+    "</div>",
+    "</div>",
+)
+
+DETAILS_TEMPLATE = _compile(
+    '<details$open style="border:2px solid #FFD700;margin:8px 0;padding:5px 10px;background:#000;">',
+    '<summary style="font-family:VT323, monospace;font-size:20px;color:#FFD700;cursor:pointer;">HYPOTHESIS #$rank: $title</summary>',
+    "$card",
+    "</details>",
+)
+
+
+def ratings_html(summary):
+    # Aggregated researcher evaluations (an EvaluationSummary), or "" if none
+    if summary is None or not summary.count:
+        return ""
+    return RATINGS_TEMPLATE.substitute(
+        count=summary.count,
+        potential=f"{summary.mean_potential:.1f}",
+        novelty=f"{summary.mean_novelty:.1f}",
+        priorities=" · ".join(f"{name} {count}" for name, count in summary.priorities.items()),
+    )
+
+
+def run_html(key):
+    # Short provenance run id of an evidence line; the full key is the tooltip
+    if not key:
+        return ""
+    return RUN_TEMPLATE.substitute(key=escape(key), short=escape(key[:RUN_ID_LENGTH]))
+
+
+def hypothesis_card_html(hypothesis, agent_icons=None, ratings=None):
+    agent_icons = agent_icons or {}
+    provenance = hypothesis.get("provenance") or {}
+    evidence = "".join(
+        EVIDENCE_TEMPLATE.substitute(
+            icon=agent_icons.get(agent, "🤖"), agent=escape(agent), evidence=escape(text),
+            run=run_html(provenance.get(agent)),
+        )
+        for agent, text in hypothesis.get("supporting_evidence", {}).items()
+    )
+    metrics = "".join(
+        METRIC_TEMPLATE.substitute(label=field.upper(), value=int(hypothesis[field]))
+        for field in SCORE_FIELDS
+    )
+    return CARD_TEMPLATE.substitute(
+        description=escape(hypothesis["description"]),
+        evidence=evidence,
+        metrics=metrics,
+        ratings=ratings_html(ratings),
+    )
+
+
+def hypothesis_page_html(page_items, agent_icons=None, open_first=True, ratings=None):
+    # One fragment for a whole page of (rank, position, hypothesis) items,
+    # each card folded into a <details> element. ratings maps titles to
+    # EvaluationSummary objects.
+    ratings = ratings or {}
+    return "".join(
+        DETAILS_TEMPLATE.substitute(
+            open=" open" if open_first and i == 0 else "",
+            rank=rank + 1,
+            title=escape(hypothesis["title"]),
+            card=hypothesis_card_html(hypothesis, agent_icons, ratings.get(hypothesis["title"])),
+        )
+        for i, (rank, _, hypothesis) in enumerate(page_items)
+    )
+
+
+STREAM_TEMPLATE = _compile(
+    '<div class="pixel-box" style="background-color:#121240;font-family:Space Mono, monospace;font-size:13px;">',
+    '<span style="color:#FFD700;font-family:VT323, monospace;font-size:18px;">$count HYPOTHESES SO FAR</span>',
+    "$rows",
+    "</div>",
+)
+
+STREAM_ROW_TEMPLATE = _compile(
+    '<div style="color:#ffffff;">$marker $title <span style="color:#FF4500;">$scores</span></div>',
+)
+
+
+def stream_preview_html(hypotheses, latest=5):
+    # The most recent `latest` hypotheses of a stream still being generated
+    rows = "".join(
+        STREAM_ROW_TEMPLATE.substitute(
+            marker="⚡" if hypothesis.get("synthesized") else "▶",
+            title=escape(hypothesis["title"]),
+            scores=" / ".join(str(int(hypothesis[field])) for field in SCORE_FIELDS),
+        )
+        for hypothesis in hypotheses[-latest:]
+    )
+    return STREAM_TEMPLATE.substitute(count=len(hypotheses), rows=rows)
+
+
+RELATED_ROW_TEMPLATE = _compile(
+    '<div style="border-left:3px solid #FFD700;padding-left:10px;margin:6px 0;font-family:Space Mono, monospace;font-size:13px;color:#ffffff;">',
+    '<span style="color:#FF4500;font-family:VT323, monospace;font-size:18px;">$disease</span> · $title',
+    '<span style="color:#FFD700;"> ($similarity% SIMILAR)</span>',
+    "</div>",
+)
+
+
+def related_hypotheses_html(related):
+    # [(similarity, disease, hypothesis)] from HypothesisIndex.related
+    return "".join(
+        RELATED_ROW_TEMPLATE.substitute(
+            disease=escape(disease), title=escape(hypothesis["title"]), similarity=round(100 * similarity),
+        )
+        for similarity, disease, hypothesis in related
+    )
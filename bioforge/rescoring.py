@@ -0,0 +1,158 @@
+"""Feedback-driven online re-scoring.
+
+Running statistics are kept per (disease, hypothesis): Welford mean and
+variance of the potential and novelty ratings plus counts per priority.
+A submission updates them in O(1); the history in the evaluation store is
+only read once, to seed the statistics at startup.
+
+Displayed scores blend the model score with the researcher mean, with the
+model score weighted as ``PRIOR_WEIGHT`` evaluations, so a single rating
+nudges a score and many ratings dominate it.
+"""
+
+import math
+import threading
+from dataclasses import dataclass, field
+
+from bioforge.evaluations import PRIORITIES
+
+# The model's own score counts as this many researcher ratings
+PRIOR_WEIGHT = 5
+
+# Rating field -> hypothesis score field it adjusts
+RATED_FIELDS = {"potential": "confidence", "novelty": "novelty"}
+
+# Thresholds for suggestions
+DISAGREEMENT_STD = 20.0
+GAP_THRESHOLD = 15.0
+
+
+@dataclass
+class RunningStats:
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    @classmethod
+    def from_moments(cls, count, mean, mean_of_squares):
+        # Rebuild from aggregate moments (e.g. SQL AVG(x) and AVG(x * x))
+        m2 = max(0.0, count * (mean_of_squares - mean * mean)) if count else 0.0
+        return cls(count=count, mean=mean or 0.0, m2=m2)
+
+
+@dataclass
+class HypothesisFeedback:
+    potential: RunningStats = field(default_factory=RunningStats)
+    novelty: RunningStats = field(default_factory=RunningStats)
+    priorities: dict = field(default_factory=lambda: dict.fromkeys(PRIORITIES, 0))
+
+    @property
+    def count(self):
+        return self.potential.count
+
+
+def blend(score, stats, prior_weight=PRIOR_WEIGHT):
+    if not stats.count:
+        return score
+    return round((prior_weight * score + stats.count * stats.mean) / (prior_weight + stats.count))
+
+
+class OnlineRescorer:
+    def __init__(self, prior_weight=PRIOR_WEIGHT):
+        self.prior_weight = prior_weight
+        self._feedback = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_store(cls, store, prior_weight=PRIOR_WEIGHT):
+        rescorer = cls(prior_weight)
+        for disease, hypothesis, count, potential, potential_sq, novelty, novelty_sq, priorities in store.rating_moments():
+            feedback = HypothesisFeedback(
+                potential=RunningStats.from_moments(count, potential, potential_sq),
+                novelty=RunningStats.from_moments(count, novelty, novelty_sq),
+            )
+            feedback.priorities.update(priorities)
+            rescorer._feedback[(disease, hypothesis)] = feedback
+        return rescorer
+
+    def update(self, evaluation):
+        key = (evaluation.disease, evaluation.hypothesis)
+        with self._lock:
+            feedback = self._feedback.get(key)
+            if feedback is None:
+                feedback = self._feedback[key] = HypothesisFeedback()
+            feedback.potential.update(evaluation.potential)
+            feedback.novelty.update(evaluation.novelty)
+            feedback.priorities[evaluation.priority] = feedback.priorities.get(evaluation.priority, 0) + 1
+
+    def feedback(self, disease, hypothesis):
+        return self._feedback.get((disease, hypothesis))
+
+    def rescore(self, disease, hypothesis):
+        # Copy of a hypothesis dict with feedback blended in (or the input)
+        feedback = self._feedback.get((disease, hypothesis["title"]))
+        if feedback is None:
+            return hypothesis
+        adjusted = dict(hypothesis)
+        adjusted["model_scores"] = {name: hypothesis[name] for name in RATED_FIELDS.values()}
+        for rating, score_field in RATED_FIELDS.items():
+            adjusted[score_field] = blend(hypothesis[score_field], getattr(feedback, rating), self.prior_weight)
+        adjusted["evaluations"] = feedback.count
+        return adjusted
+
+    def apply(self, disease, hypotheses):
+        if not self._feedback:
+            return hypotheses
+        return [self.rescore(disease, h) for h in hypotheses]
+
+    def suggestions(self, disease, hypothesis):
+        # Suggestions derived from the accumulated ratings of one hypothesis
+        feedback = self._feedback.get((disease, hypothesis["title"]))
+        if feedback is None:
+            return []
+        potential, novelty = feedback.potential, feedback.novelty
+        model = hypothesis.get("model_scores") or hypothesis
+        confidence, predicted_novelty = model["confidence"], model["novelty"]
+        suggestions = []
+        if potential.count >= 2 and potential.std >= DISAGREEMENT_STD:
+            suggestions.append(
+                f"Researchers disagree on its potential (spread ±{potential.std:.0f} over "
+                f"{potential.count} ratings); gathering targeted evidence would settle it"
+            )
+        if confidence - potential.mean >= GAP_THRESHOLD:
+            evidence = hypothesis.get("supporting_evidence") or {}
+            weakest = min(evidence, key=lambda agent: len(evidence[agent])) if evidence else "supporting"
+            suggestions.append(
+                f"Rated potential ({potential.mean:.0f}) is well below model confidence "
+                f"({confidence}); re-check the {weakest} evidence"
+            )
+        elif potential.mean - confidence >= GAP_THRESHOLD:
+            suggestions.append(
+                f"Researchers rate its potential ({potential.mean:.0f}) above model confidence; "
+                "consider expanding the analysis around it"
+            )
+        if predicted_novelty - novelty.mean >= GAP_THRESHOLD:
+            suggestions.append("Rated less novel than predicted; search recent literature and preprints for prior work")
+        urgent = feedback.priorities.get("HIGH", 0) + feedback.priorities.get("VERY HIGH", 0)
+        if urgent * 2 > feedback.count:
+            suggestions.append(f"{urgent} of {feedback.count} evaluations mark it high priority; schedule validation experiments")
+        if not suggestions:
+            suggestions.append(
+                f"Ratings agree with the model scores after {feedback.count} evaluation(s); "
+                "more ratings will sharpen the ranking"
+            )
+        return suggestions
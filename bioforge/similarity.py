@@ -0,0 +1,206 @@
+"""Cross-disease hypothesis similarity search.
+
+Hypotheses are embedded without any model or network access: the words and
+word bigrams of title + description are hashed into ``dim`` signed buckets
+(the hashing trick), weighted by sublinear TF-IDF and L2-normalized, so
+cosine similarity is a dot product.
+
+Two indexes share that layout:
+
+* ``ExactIndex`` - brute force, one matrix-vector product over all vectors;
+* ``IVFIndex`` - an inverted-file index: spherical k-means splits the vectors
+  into ``nlist`` cells stored contiguously, and a query only scans the
+  ``nprobe`` cells whose centroids are closest to it.
+
+``HypothesisIndex`` embeds every catalog hypothesis and answers "related
+hypotheses in other diseases" from the exact index for small catalogs and
+from the IVF index above ``IVF_MIN_SIZE`` hypotheses.
+"""
+
+import re
+import zlib
+
+import numpy as np
+
+from bioforge.minhash import hypothesis_text
+
+DEFAULT_DIM = 256
+# Catalog size from which queries go through the IVF index
+IVF_MIN_SIZE = 20_000
+DEFAULT_NPROBE = 12
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE = 32_768
+# Documents hashed per batch while vectorizing
+BATCH_SIZE = 8192
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it may of on or that the their these this to via which with".split()
+)
+# Multiplier combining two word hashes into a bigram hash
+BIGRAM_PRIME = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _word_hashes(texts, vocabulary):
+    # Concatenated word hashes of all texts and each text's start offset
+    hashes, offsets = [], [0]
+    for text in texts:
+        for word in WORD_RE.findall(text.lower()):
+            if word in STOPWORDS:
+                continue
+            value = vocabulary.get(word)
+            if value is None:
+                value = vocabulary[word] = zlib.crc32(word.encode())
+            hashes.append(value)
+        offsets.append(len(hashes))
+    return np.array(hashes, dtype=np.uint64), np.array(offsets)
+
+
+def hashed_counts(texts, dim=DEFAULT_DIM, vocabulary=None):
+    # Signed term counts (n, dim) of words and bigrams, as float32
+    vocabulary = {} if vocabulary is None else vocabulary
+    hashes, offsets = _word_hashes(texts, vocabulary)
+    n = len(offsets) - 1
+    docs = np.repeat(np.arange(n), np.diff(offsets))
+    # Bigrams of consecutive words within the same text
+    same = docs[1:] == docs[:-1]
+    bigrams = (hashes[:-1] * BIGRAM_PRIME + hashes[1:])[same] >> np.uint64(16)
+    terms = np.concatenate([hashes, bigrams])
+    owners = np.concatenate([docs, docs[1:][same]])
+    buckets = (terms % np.uint64(dim)).astype(np.int64)
+    signs = np.where((terms >> np.uint64(12)) & np.uint64(1), 1.0, -1.0)
+    counts = np.bincount(owners * dim + buckets, weights=signs, minlength=n * dim)
+    return counts.reshape(n, dim).astype(np.float32)
+
+
+class HashingTfidf:
+    def __init__(self, dim=DEFAULT_DIM):
+        self.dim = dim
+        self.idf = np.ones(dim, dtype=np.float32)
+        self._vocabulary = {}
+
+    def _counts(self, texts):
+        for start in range(0, len(texts), BATCH_SIZE):
+            yield hashed_counts(texts[start:start + BATCH_SIZE], self.dim, self._vocabulary)
+
+    def fit_transform(self, texts):
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        blocks = list(self._counts(texts))
+        df = sum((block != 0).sum(axis=0) for block in blocks)
+        self.idf = (np.log((1 + len(texts)) / (1 + df)) + 1.0).astype(np.float32)
+        return np.vstack([self._weight(block) for block in blocks])
+
+    def transform(self, texts):
+        return np.vstack([self._weight(block) for block in self._counts(list(texts))])
+
+    def _weight(self, counts):
+        # Sublinear term frequency keeps the hashed sign
+        weighted = np.sign(counts) * np.log1p(np.abs(counts)) * self.idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        return weighted / np.where(norms > 0, norms, 1.0)
+
+
+def _top_k(scores, ids, k):
+    if len(scores) > k:
+        keep = np.argpartition(-scores, k)[:k]
+        scores, ids = scores[keep], ids[keep]
+    order = np.argsort(-scores, kind="stable")
+    return scores[order], ids[order]
+
+
+class ExactIndex:
+    # Brute-force cosine search; groups optionally tag each vector (e.g. with
+    # its disease) so a query can exclude one group
+
+    def __init__(self, vectors, groups=None):
+        self.vectors = vectors
+        self.groups = groups
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def search(self, query, k=5, exclude_group=None):
+        scores = self.vectors @ query
+        ids = np.arange(len(scores))
+        if exclude_group is not None and self.groups is not None:
+            keep = self.groups != exclude_group
+            scores, ids = scores[keep], ids[keep]
+        return _top_k(scores, ids, k)
+
+
+def spherical_kmeans(vectors, n_clusters, iterations=KMEANS_ITERATIONS, seed=0):
+    # Unit-norm centroids trained on a sample of the vectors
+    rng = np.random.default_rng(seed)
+    sample = vectors[rng.choice(len(vectors), min(len(vectors), KMEANS_SAMPLE), replace=False)]
+    centroids = sample[rng.choice(len(sample), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty cells keep their previous centroid
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1.0), centroids)
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    def __init__(self, vectors, groups=None, nlist=None, nprobe=DEFAULT_NPROBE, seed=0):
+        n = len(vectors)
+        nlist = nlist or max(1, int(np.sqrt(n)))
+        self.nprobe = nprobe
+        self.centroids = spherical_kmeans(vectors, min(nlist, n), seed=seed)
+        assignment = np.concatenate([
+            np.argmax(vectors[start:start + BATCH_SIZE] @ self.centroids.T, axis=1)
+            for start in range(0, n, BATCH_SIZE)
+        ]) if n else np.zeros(0, dtype=np.int64)
+        # Cells are stored contiguously so a probe scans one slice each
+        order = np.argsort(assignment, kind="stable")
+        self.ids = order
+        self.vectors = vectors[order]
+        self.groups = groups[order] if groups is not None else None
+        self.offsets = np.searchsorted(assignment[order], np.arange(len(self.centroids) + 1))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, query, k=5, exclude_group=None, nprobe=None):
+        cells = np.argsort(-(self.centroids @ query))[: nprobe or self.nprobe]
+        rows = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in cells])
+        if exclude_group is not None and self.groups is not None:
+            rows = rows[self.groups[rows] != exclude_group]
+        scores = self.vectors[rows] @ query
+        return _top_k(scores, self.ids[rows], k)
+
+
+class HypothesisIndex:
+    def __init__(self, entries, dim=DEFAULT_DIM, ivf_min_size=IVF_MIN_SIZE):
+        # entries: (disease name, hypothesis) pairs
+        self.diseases = []
+        self.hypotheses = []
+        for disease, hypothesis in entries:
+            self.diseases.append(disease)
+            self.hypotheses.append(hypothesis)
+        self._codes = {name: code for code, name in enumerate(sorted(set(self.diseases)))}
+        self.groups = np.array([self._codes[name] for name in self.diseases], dtype=np.int32)
+        self.vectorizer = HashingTfidf(dim)
+        vectors = self.vectorizer.fit_transform(hypothesis_text(h) for h in self.hypotheses)
+        self.exact = ExactIndex(vectors, self.groups)
+        self.ivf = IVFIndex(vectors, self.groups) if len(vectors) >= ivf_min_size else None
+
+    @classmethod
+    def from_catalog(cls, catalog, **kwargs):
+        return cls(catalog.iter_hypotheses(), **kwargs)
+
+    def __len__(self):
+        return len(self.hypotheses)
+
+    def related(self, hypothesis, disease, k=5):
+        # [(similarity, disease, hypothesis)] from diseases other than `disease`
+        if not self.hypotheses:
+            return []
+        query = self.vectorizer.transform([hypothesis_text(hypothesis)])[0]
+        index = self.ivf or self.exact
+        scores, ids = index.search(query, k, exclude_group=self._codes.get(disease))
+        return [(float(s), self.diseases[i], self.hypotheses[i]) for s, i in zip(scores, ids) if s > 0]
@@ -0,0 +1,184 @@
+"""Startup profiling.
+
+With ``BIOFORGE_PROFILE_STARTUP=1`` the app records, for the first script
+run of the process:
+
+* import time per module - an import hook times every module imported after
+  ``bioforge.startup`` (cumulative, including the modules it imports, and
+  self time);
+* first-render time per page section (``STARTUP.section``).
+
+The report is printed to stderr when the first run finishes and shown in the
+sidebar. ``python -m bioforge.startup`` measures a cold start headlessly: it
+renders ``app.py`` once with Streamlit's ``AppTest`` in a fresh process and
+prints the report. Profiling is off by default and then costs one attribute
+check per section.
+"""
+
+import argparse
+import importlib.abc
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ENABLED = os.environ.get("BIOFORGE_PROFILE_STARTUP", "").lower() in ("1", "true", "yes")
+TOP_IMPORTS = 25
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, profile):
+        self.loader = loader
+        self.profile = profile
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self.profile._timed_import(module.__name__):
+            self.loader.exec_module(module)
+
+    def __getattr__(self, name):
+        # get_source, get_resource_reader, is_package, ... of the real loader
+        return getattr(self.loader, name)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    def __init__(self, profile):
+        self.profile = profile
+        self._finding = threading.local()
+
+    def find_spec(self, name, path, target=None):
+        if getattr(self._finding, "active", False):
+            return None
+        self._finding.active = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self.profile)
+                    return spec
+            return None
+        finally:
+            self._finding.active = False
+
+
+class StartupProfile:
+    def __init__(self, enabled=ENABLED):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        # module -> [cumulative seconds, self seconds]
+        self.imports = {}
+        # section -> seconds, in first-render order
+        self.sections = {}
+        self.first_render = None
+        self.finished = False
+        # Per thread: elapsed time of the child imports of each import in
+        # progress, so imports on worker threads do not mix with the main
+        # thread's
+        self._local = threading.local()
+        self._finder = None
+        if enabled:
+            self.install()
+
+    def install(self):
+        if self._finder is None:
+            self._finder = _ImportTimer(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def _timed_import(self, name):
+        stack = self._stack()
+        start = time.perf_counter()
+        stack.append(0.0)
+        try:
+            yield
+        finally:
+            children = stack.pop()
+            elapsed = time.perf_counter() - start
+            self.imports[name] = [elapsed, elapsed - children]
+            if stack:
+                stack[-1] += elapsed
+
+    @contextmanager
+    def section(self, name):
+        # Times a page section during the first script run
+        if not self.enabled or self.finished:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections[name] = self.sections.get(name, 0.0) + time.perf_counter() - start
+
+    def finish(self):
+        # End of the first script run; returns the report once, else None
+        if not self.enabled or self.finished:
+            return None
+        self.finished = True
+        self.first_render = time.perf_counter() - self.started
+        self.uninstall()
+        report = self.report()
+        print(report, file=sys.stderr)
+        return report
+
+    def report(self, top=TOP_IMPORTS):
+        lines = [f"first render {self.first_render * 1000:.0f} ms" if self.first_render else "first render pending"]
+        if self.imports:
+            total = sum(own for _, own in self.imports.values())
+            lines.append(f"imports {total * 1000:.0f} ms in {len(self.imports)} modules; slowest (cumulative / self ms):")
+            slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)[:top]
+            lines.extend(f"  {name:<40} {cumulative * 1000:8.1f} {own * 1000:8.1f}" for name, (cumulative, own) in slowest)
+        if self.sections:
+            lines.append("first render per section (ms):")
+            lines.extend(f"  {name:<40} {seconds * 1000:8.1f}" for name, seconds in self.sections.items())
+        return "\n".join(lines)
+
+
+STARTUP = StartupProfile()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile a cold start of the app (imports and first render).")
+    parser.add_argument("--app", default=str(Path(__file__).resolve().parent.parent / "app.py"), help="Streamlit script to render")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds allowed for the first render")
+    args = parser.parse_args(argv)
+
+    # Run as a script this module is __main__; the app imports (and reports
+    # through) bioforge.startup, which then profiles from its import on
+    os.environ["BIOFORGE_PROFILE_STARTUP"] = "1"
+    from bioforge.startup import STARTUP as profile
+    from streamlit.testing.v1 import AppTest
+
+    # Streamlit itself is loaded by `streamlit run` before the app starts;
+    # time from here on is what the app adds
+    profile.enabled = True
+    profile.install()
+    profile.imports.clear()
+    profile.started = time.perf_counter()
+    at = AppTest.from_file(args.app, default_timeout=args.timeout).run()
+    if at.exception:
+        print(at.exception, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Vectorized statistical tests shared by the data-backed agents.
+
+Every test works on whole arrays (one entry per gene, variant or feature)
+and returns NaN-free p-values, with untestable entries at p = 1.
+"""
+
+import numpy as np
+
+
+def benjamini_hochberg(pvalues):
+    # q-values in the input order
+    p = np.asarray(pvalues, dtype=np.float64)
+    if not p.size:
+        return p
+    order = np.argsort(p)
+    ranked = p[order] * p.size / np.arange(1, p.size + 1)
+    q = np.minimum.accumulate(ranked[::-1])[::-1]
+    out = np.empty_like(q)
+    out[order] = np.minimum(q, 1.0)
+    return out
+
+
+def welch_t_test(cases, controls):
+    # Column-wise Welch t-test; returns (mean difference, t, two-sided p)
+    from scipy.special import stdtr
+
+    n1, n2 = cases.shape[0], controls.shape[0]
+    m1, m2 = cases.mean(axis=0), controls.mean(axis=0)
+    v1, v2 = cases.var(axis=0, ddof=1) / n1, controls.var(axis=0, ddof=1) / n2
+    se2 = v1 + v2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (m1 - m2) / np.sqrt(se2)
+        df = se2 ** 2 / (v1 ** 2 / (n1 - 1) + v2 ** 2 / (n2 - 1))
+    p = 2.0 * stdtr(df, -np.abs(t))
+    return m1 - m2, t, np.where(np.isfinite(p), p, 1.0)
+
+
+def allelic_chi2(alt_cases, ref_cases, alt_controls, ref_controls):
+    # Per-variant 2x2 allelic chi-square test; returns (odds ratio, p)
+    from scipy.special import chdtrc
+
+    a, b, c, d = (np.asarray(x, dtype=np.float64) for x in (alt_cases, ref_cases, alt_controls, ref_controls))
+    n = a + b + c + d
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chi2 = n * (a * d - b * c) ** 2 / ((a + b) * (c + d) * (a + c) * (b + d))
+        odds = (a + 0.5) * (d + 0.5) / ((b + 0.5) * (c + 0.5))
+    p = chdtrc(1, chi2)
+    return odds, np.where(np.isfinite(p), p, 1.0)
+
+
+def pearson_from_sums(n, sx, sy, sxx, syy, sxy):
+    # Pearson r and two-sided p from accumulated sums, so correlations can be
+    # built up chunk by chunk
+    from scipy.special import stdtr
+
+    n, sx, sy, sxx, syy, sxy = (np.asarray(v, dtype=np.float64) for v in (n, sx, sy, sxx, syy, sxy))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+        r = np.clip(r, -1.0, 1.0)
+        t = r * np.sqrt((n - 2) / (1 - r * r))
+        p = 2.0 * stdtr(n - 2, -np.abs(t))
+    p = np.where(n > 2, p, np.nan)
+    return np.where(np.isfinite(r), r, 0.0), np.where(np.isfinite(p), p, 1.0)
@@ -0,0 +1,173 @@
+"""Synthetic disease catalogs and corpora for benchmarks and load tests.
+
+Records follow the layout of ``data/catalog`` and can be written with
+``bioforge.catalog.write_json_catalog`` or ``write_sqlite_catalog``;
+abstracts follow the JSONL layout read by ``bioforge.literature``, cohorts
+the layout read by ``bioforge.genomics`` and patient records the layout
+read by ``bioforge.clinical``.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+AGENTS = (
+    "Literature Mining Agent",
+    "Genomic Data Analysis Agent",
+    "Clinical Data Integration Agent",
+)
+
+MECHANISMS = (
+    "Exosome-Mediated", "Metabolic", "Neuroinflammatory", "Circadian", "Microbiome-Induced",
+    "Epigenetic", "Immune Exclusion", "Mitochondrial", "Vascular", "Stromal",
+)
+PROCESSES = (
+    "Feedback Loop", "Cascade", "Priming", "Reprogramming", "Crosstalk",
+    "Memory", "Integration Failure", "Signaling Shift", "Barrier Breakdown", "Drift",
+)
+TARGETS = (
+    "TREM2", "APOE", "KRAS", "TP53", "TCF7L2", "PSEN1", "CDKN2A", "PPARG", "SMAD4", "CLOCK",
+)
+TISSUES = (
+    "neurons", "microglia", "beta cells", "stellate cells", "hepatocytes",
+    "adipocytes", "endothelial cells", "T cells", "ductal cells", "astrocytes",
+)
+
+
+def synthetic_hypothesis(rng, index):
+    mechanism = MECHANISMS[rng.integers(len(MECHANISMS))]
+    process = PROCESSES[rng.integers(len(PROCESSES))]
+    target = TARGETS[rng.integers(len(TARGETS))]
+    tissue = TISSUES[rng.integers(len(TISSUES))]
+    confidence, novelty, testability = (int(v) for v in rng.integers(40, 100, size=3))
+    return {
+        "title": f"{mechanism} {process} Hypothesis #{index}",
+        "description": (
+            f"{mechanism} changes in {tissue} may drive a {process.lower()} through {target}, "
+            f"linking early molecular shifts to the clinical course of the disease."
+        ),
+        "supporting_evidence": {
+            AGENTS[0]: f"Studies report {target} involvement in {tissue}",
+            AGENTS[1]: f"{target} expression shifts in {tissue} precede symptoms",
+            AGENTS[2]: f"Patient records associate {mechanism.lower()} markers with progression",
+        },
+        "confidence": confidence,
+        "novelty": novelty,
+        "testability": testability,
+    }
+
+
+def synthetic_catalog(n_hypotheses, n_diseases=3, n_questions=4, seed=0):
+    # Disease dicts holding n_hypotheses in total, spread evenly
+    rng = np.random.default_rng(seed)
+    records = []
+    per_disease = np.diff(np.linspace(0, n_hypotheses, n_diseases + 1).round().astype(int))
+    index = 0
+    for d, count in enumerate(per_disease):
+        name = f"Synthetic Disease {d + 1}"
+        hypotheses = []
+        for _ in range(count):
+            index += 1
+            hypotheses.append(synthetic_hypothesis(rng, index))
+        records.append({
+            "name": name,
+            "description": f"Generated disease {d + 1} with {count} hypotheses.",
+            "research_questions": [f"{name} research question {q + 1}" for q in range(n_questions)],
+            "agents": {
+                agent: [f"{agent} finding {i + 1} for {name}" for i in range(3)]
+                for agent in AGENTS
+            },
+            "hypotheses": hypotheses,
+            "federated_improvements": [f"Partner dataset {i + 1} for {name}" for i in range(3)],
+        })
+    return records
+
+
+def synthetic_abstracts(n_documents, seed=0):
+    # PubMed-style {"pmid", "title", "abstract"} dicts for the literature
+    # index (see bioforge.literature)
+    rng = np.random.default_rng(seed)
+    for pmid in range(1, n_documents + 1):
+        mechanism = MECHANISMS[rng.integers(len(MECHANISMS))]
+        process = PROCESSES[rng.integers(len(PROCESSES))]
+        target = TARGETS[rng.integers(len(TARGETS))]
+        tissue = TISSUES[rng.integers(len(TISSUES))]
+        cohort = int(rng.integers(20, 5000))
+        yield {
+            "pmid": str(10_000_000 + pmid),
+            "title": f"{target} and {mechanism.lower()} {process.lower()} in {tissue}",
+            "abstract": (
+                f"We studied {mechanism.lower()} changes affecting {target} in {tissue} "
+                f"across a cohort of {cohort} participants. Results suggest a "
+                f"{process.lower()} that associates with disease progression."
+            ),
+        }
+
+
+def write_synthetic_cohort(path, n_samples, n_genes, n_variants, n_signals=20, seed=0):
+    # Cohort directory in the layout read by bioforge.genomics, with
+    # n_signals genes and variants shifted in cases
+    rng = np.random.default_rng(seed)
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    samples = [f"S{i:06d}" for i in range(n_samples)]
+    case = rng.random(n_samples) < 0.5
+    # Age at onset for cases only (controls have none)
+    onset = rng.integers(40, 90, size=n_samples)
+    with open(path / "samples.csv", "w", encoding="utf-8") as f:
+        f.write("sample,case,age_at_onset\n")
+        f.writelines(f"{s},{int(c)},{a if c else ''}\n" for s, c, a in zip(samples, case, onset))
+
+    genes = [TARGETS[i] if i < len(TARGETS) else f"GENE{i:05d}" for i in range(n_genes)]
+    (path / "genes.txt").write_text("\n".join(genes) + "\n", encoding="utf-8")
+    expression = np.lib.format.open_memmap(path / "expression.npy", mode="w+", dtype=np.float32, shape=(n_genes, n_samples))
+    for start in range(0, n_genes, 256):
+        block = rng.normal(8.0, 1.0, size=(min(256, n_genes - start), n_samples)).astype(np.float32)
+        expression[start:start + len(block)] = block
+    expression[:n_signals, case] += 0.5
+    expression.flush()
+    del expression
+
+    codes = np.array(["0/0", "0/1", "1/1"])
+    with open(path / "variants.vcf", "w", encoding="utf-8") as f:
+        f.write("##fileformat=VCFv4.2\n")
+        f.write("\t".join(["#CHROM", "POS", "ID", "REF", "ALT", "QUAL", "FILTER", "INFO", "FORMAT"] + samples) + "\n")
+        for v in range(n_variants):
+            freq = np.where(case, 0.45, 0.25) if v < n_signals else np.full(n_samples, 0.3)
+            genotypes = codes[rng.binomial(2, freq)]
+            f.write(f"1\t{1000 + v * 100}\trs{v + 1}\tA\tG\t.\tPASS\t.\tGT\t" + "\t".join(genotypes) + "\n")
+
+
+BIOMARKERS = ("Serum NfL", "CSF p-tau", "Plasma TREM2", "HbA1c", "CA19-9", "CRP", "IL-6", "Fasting glucose")
+ASSESSMENTS = ("MMSE", "CDR-SB", "HOMA-IR", "ECOG")
+
+
+def write_synthetic_records(path, n_patients, visits=3, seed=0):
+    # Patient-record tables in the layout read by bioforge.clinical; the
+    # first two biomarkers and the first assessment track progression
+    rng = np.random.default_rng(seed)
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    patients = np.array([f"P{i:07d}" for i in range(n_patients)])
+    risk = rng.normal(size=n_patients)
+    progression = (risk + rng.normal(size=n_patients) > 0).astype(int)
+    decline = 2.0 * risk + rng.normal(size=n_patients)
+    pd.DataFrame({"patient_id": patients, "progression": progression, "decline": decline.round(3)}).to_csv(
+        path / "outcomes.csv", index=False
+    )
+
+    for name, feature, value, names in (
+        ("biomarkers", "biomarker", "value", BIOMARKERS),
+        ("assessments", "assessment", "score", ASSESSMENTS),
+    ):
+        frames = []
+        for j, label in enumerate(names):
+            patient = np.repeat(np.arange(n_patients), visits)
+            signal = 0.8 * risk[patient] if j < (2 if name == "biomarkers" else 1) else 0.0
+            frames.append(pd.DataFrame({
+                "patient_id": patients[patient],
+                feature: label,
+                value: (signal + rng.normal(size=len(patient))).round(3),
+            }))
+        pd.concat(frames).to_csv(path / f"{name}.csv", index=False)
@@ -0,0 +1,87 @@
+"""Per-agent activity telemetry.
+
+Every agent run appends one row of metrics (documents scanned, records
+joined, variants tested, latency) to a fixed-size NumPy-backed ring buffer
+for that agent. A run replayed from the provenance store records the metrics
+of the stored run with ``replayed`` set; the activity chart skips those rows.
+Charts read their data straight from the ring, so they cost no extra compute
+and only change when an agent actually ran.
+"""
+
+import threading
+
+import numpy as np
+
+METRIC_FIELDS = ("documents_scanned", "records_joined", "variants_tested", "latency_ms", "replayed")
+
+# Fields that count units of work (summed for the activity chart)
+WORK_FIELDS = ("documents_scanned", "records_joined", "variants_tested")
+
+DEFAULT_CAPACITY = 256
+
+
+class MetricsRing:
+    def __init__(self, capacity=DEFAULT_CAPACITY, fields=METRIC_FIELDS):
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._columns = {name: i for i, name in enumerate(self.fields)}
+        self._data = np.zeros((capacity, len(self.fields)), dtype=np.float64)
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def append(self, metrics):
+        # Unknown keys are ignored, missing fields are recorded as 0
+        row = [float(metrics.get(name, 0.0)) for name in self.fields]
+        with self._lock:
+            self._data[self._next] = row
+            self._next = (self._next + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def _positions(self, n):
+        count = self._count if n is None else min(n, self._count)
+        return np.arange(self._next - count, self._next) % self.capacity
+
+    def history(self, fields=None, n=None):
+        # Last n rows (oldest first) as a (rows, fields) copy
+        fields = self.fields if fields is None else tuple(fields)
+        columns = [self._columns[name] for name in fields]
+        with self._lock:
+            return self._data[np.ix_(self._positions(n), columns)]
+
+    def column(self, field, n=None):
+        return self.history((field,), n)[:, 0]
+
+    def __len__(self):
+        return self._count
+
+
+class TelemetryRegistry:
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._rings = {}
+        self._lock = threading.Lock()
+
+    def ring(self, agent):
+        with self._lock:
+            ring = self._rings.get(agent)
+            if ring is None:
+                ring = self._rings[agent] = MetricsRing(self.capacity)
+            return ring
+
+    def record(self, agent, metrics):
+        self.ring(agent).append(metrics)
+
+    def work_history(self, agent, n=8):
+        # Units of work per run for the last n runs an agent actually
+        # computed (replays did no work)
+        rows = self.ring(agent).history(WORK_FIELDS + ("replayed",))
+        work = rows[rows[:, -1] == 0, :-1].sum(axis=1)
+        return work if n is None else work[max(len(work) - n, 0):]
+
+    def latency_history(self, agent, n=8):
+        return self.ring(agent).column("latency_ms", n)
+
+
+# Process-wide telemetry shared by every session
+TELEMETRY = TelemetryRegistry()
@@ -0,0 +1,92 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from bioforge.agents import Agent, AgentContext, AgentOutput, AgentRuntime
+
+DISEASE = SimpleNamespace(name="Disease", agents={})
+
+
+class SleepyAgent(Agent):
+    def __init__(self, name, delay=0.0, timeout=5.0, release=None):
+        self.name = name
+        self.delay = delay
+        self.timeout = timeout
+        self.release = release
+        self.calls = 0
+
+    def run(self, context):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(10)
+        time.sleep(self.delay)
+        return AgentOutput([f"{self.name} finding"], {"documents_scanned": 1})
+
+
+class FailingAgent(Agent):
+    name = "Failing"
+
+    def run(self, context):
+        raise RuntimeError("boom")
+
+
+@pytest.fixture
+def runtimes():
+    created = []
+
+    def make(*args, **kwargs):
+        runtime = AgentRuntime(*args, telemetry=None, **kwargs)
+        created.append(runtime)
+        return runtime
+
+    yield make
+    for runtime in created:
+        runtime.shutdown()
+
+
+def run(runtime, agents=None):
+    return {result.agent: result for result in runtime.run(AgentContext(DISEASE), agents)}
+
+
+def test_results_and_errors(runtimes):
+    results = run(runtimes([SleepyAgent("Quick"), FailingAgent()]))
+    assert results["Quick"].ok and results["Quick"].findings == ["Quick finding"]
+    assert results["Failing"].status == "error" and results["Failing"].error == "boom"
+
+
+def test_timeout_counts_from_the_start_of_the_call(runtimes):
+    # One worker: the second agent waits in the queue longer than its
+    # timeout, but runs well within it
+    agents = [SleepyAgent("First", delay=0.3, timeout=1.0), SleepyAgent("Second", delay=0.05, timeout=0.2)]
+    results = run(runtimes(agents, max_workers=1, abandoned_workers=0))
+    assert results["First"].ok and results["Second"].ok
+
+
+def test_stuck_call_is_abandoned_and_not_started_again(runtimes):
+    release = threading.Event()
+    stuck = SleepyAgent("Stuck", timeout=0.1, release=release)
+    quick = SleepyAgent("Quick")
+    runtime = runtimes([stuck, quick], max_workers=1)
+    try:
+        first = run(runtime)
+        assert first["Stuck"].status == "timeout" and first["Quick"].ok
+        second = run(runtime)
+        assert second["Stuck"].status == "timeout"
+        assert "still running" in second["Stuck"].error
+        assert second["Quick"].ok
+        assert stuck.calls == 1
+    finally:
+        release.set()
+    deadline = time.monotonic() + 5
+    while runtime._abandoned and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert run(runtime)["Stuck"].ok
+    assert stuck.calls == 2
+
+
+def test_abandoned_workers_default_to_one_per_agent(runtimes):
+    agents = [SleepyAgent(f"Agent {i}") for i in range(6)]
+    assert runtimes(agents, max_workers=2).executor._max_workers == 2 + 6
+
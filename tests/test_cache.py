@@ -0,0 +1,72 @@
+import pytest
+
+from bioforge.cache import ResultCache, result_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = ResultCache(ttl=60, clock=clock)
+    cache.put("run", [1], size=1)
+    cache.put("failed run", [2], size=1, ttl=5)
+    clock.now = 5
+    assert cache.get("failed run") is None
+    assert cache.get("run") == [1]
+    clock.now = 60
+    assert cache.get("run") is None
+    assert len(cache) == 0 and cache.total_bytes == 0
+
+
+def test_least_recently_used_entries_are_evicted_first(clock):
+    cache = ResultCache(max_bytes=3, clock=clock)
+    for key in "abc":
+        cache.put(key, key, size=1)
+    cache.get("a")
+    cache.put("d", "d", size=1)
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["a", "c", "d"]
+    assert cache.evictions == 1
+
+
+def test_oversized_values_are_not_cached(clock):
+    cache = ResultCache(max_bytes=10, clock=clock)
+    cache.put("a", "a", size=1)
+    assert cache.put("big", "value", size=11) == "value"
+    assert cache.get("big") is None
+    assert cache.get("a") == "a"
+
+
+def test_get_or_compute_recomputes_only_after_expiry(clock):
+    cache = ResultCache(ttl=10, clock=clock)
+    calls = []
+
+    def compute():
+        calls.append(clock.now)
+        return len(calls)
+
+    key = result_key("agents", "Disease", None)
+    assert cache.get_or_compute(key, compute) == 1
+    assert cache.get_or_compute(key, compute) == 1
+    clock.now = 10
+    assert cache.get_or_compute(key, compute) == 2
+    assert calls == [0.0, 10]
+
+
+def test_purge_expired(clock):
+    cache = ResultCache(ttl=10, clock=clock)
+    cache.put("a", "a", size=2)
+    cache.put("b", "b", size=2, ttl=20)
+    clock.now = 15
+    cache.purge_expired()
+    assert len(cache) == 1 and cache.total_bytes == 2
@@ -0,0 +1,28 @@
+import warnings
+from types import SimpleNamespace
+
+import pytest
+
+from bioforge.agents import AgentContext
+from bioforge.clinical import ClinicalDataIntegrationAgent, analyze
+from bioforge.synthetic import write_synthetic_records
+
+
+@pytest.mark.parametrize("tables", [("biomarkers", "assessments"), ("biomarkers",)])
+def test_analysis_joins_records_without_pandas_warnings(tmp_path, tables):
+    write_synthetic_records(tmp_path / "alzheimers-disease", 2000)
+    for path in (tmp_path / "alzheimers-disease").glob("*.csv"):
+        if path.stem not in tables + ("outcomes",):
+            path.unlink()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        report = analyze(tmp_path / "alzheimers-disease")
+    assert report.records_joined == report.records > 0
+    assert report.pairs_tested > 0
+    assert all(0 <= q <= 1 for *_, q in report.correlations)
+
+
+def test_agent_falls_back_to_catalog_without_records(tmp_path):
+    disease = SimpleNamespace(name="Alzheimer's Disease", agents={ClinicalDataIntegrationAgent.name: ["catalog"]})
+    output = ClinicalDataIntegrationAgent(tmp_path).run(AgentContext(disease, "biomarkers"))
+    assert output.findings == ["catalog"]
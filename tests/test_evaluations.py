@@ -0,0 +1,62 @@
+import sqlite3
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from bioforge import evaluations
+from bioforge.evaluations import Evaluation, EvaluationStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(evaluations, "RETRY_DELAY", 0.0)
+    store = EvaluationStore(tmp_path / "evaluations.sqlite", flush_interval=0.01)
+    yield store
+    store.close()
+
+
+def evaluation(potential=50):
+    return Evaluation("Disease", "Hypothesis", potential, 40, "HIGH")
+
+
+def test_failed_batch_is_dropped_and_the_writer_keeps_running(store):
+    conn = sqlite3.connect(store.path)
+    conn.execute("DROP TABLE evaluations")
+    conn.commit()
+    store.submit(evaluation())
+    store.flush()
+    assert store.failed == 1
+    assert isinstance(store.error, sqlite3.Error)
+
+    conn.executescript(evaluations.SCHEMA)
+    conn.close()
+    store.submit(evaluation())
+    store.flush()
+    assert store.written == 1
+    assert store.summary("Disease", "Hypothesis").count == 1
+
+
+def test_failed_write_is_retried(store, monkeypatch):
+    insert = evaluations.INSERT
+    monkeypatch.setattr(evaluations, "INSERT", "INSERT INTO missing VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+    retries = []
+
+    def sleep(delay):
+        # The next attempt uses the real statement
+        retries.append(delay)
+        evaluations.INSERT = insert
+
+    monkeypatch.setattr(evaluations, "time", SimpleNamespace(sleep=sleep, monotonic=time.monotonic))
+    store.submit(evaluation())
+    store.flush()
+    assert len(retries) == 1
+    assert (store.written, store.failed) == (1, 0)
+
+
+def test_submit_fails_loudly_once_the_writer_stopped(store):
+    store.close()
+    with pytest.raises(RuntimeError, match="not running"):
+        store.submit(evaluation())
+    with pytest.raises(RuntimeError):
+        store.flush()
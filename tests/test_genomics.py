@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import pytest
+
+from bioforge.agents import AgentContext
+from bioforge.genomics import GenomicDataAnalysisAgent, open_cohort
+from bioforge.planner import scan_filters
+from bioforge.synthetic import write_synthetic_cohort
+
+DISEASE = SimpleNamespace(name="Alzheimer's Disease", agents={})
+N_VARIANTS = 60
+
+
+@pytest.fixture
+def genomics_dir(tmp_path):
+    write_synthetic_cohort(tmp_path / "alzheimers-disease", 40, 30, N_VARIANTS, n_signals=3)
+    return tmp_path
+
+
+def test_blank_and_truncated_vcf_lines_are_skipped(genomics_dir):
+    cohort = open_cohort(DISEASE.name, genomics_dir)
+    (vcf,) = cohort.vcfs
+    lines = vcf.read_bytes().splitlines(keepends=True)
+    # A blank line mid-file and a record cut short at the end
+    vcf.write_bytes(b"".join(lines[:-5]) + b"\n" + b"".join(lines[-5:]) + lines[-1][:25])
+    for workers in (1, 3):
+        report = cohort.analyze(workers=workers, filters=scan_filters("variants"))
+        assert report.variants_tested == N_VARIANTS
+
+
+def test_agent_explains_when_nothing_matched(genomics_dir):
+    for vcf in open_cohort(DISEASE.name, genomics_dir).vcfs:
+        vcf.unlink()
+    output = GenomicDataAnalysisAgent(genomics_dir).run(AgentContext(DISEASE, "Rare variants", filters=scan_filters("Rare variants")))
+    assert len(output.findings) == 1
+    assert output.findings[0].startswith("No genes or variants matched this question")
+    assert output.metrics["variants_tested"] == 0
@@ -0,0 +1,99 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from bioforge import literature
+from bioforge.agents import AgentContext
+from bioforge.literature import LiteratureIndex, LiteratureMiningAgent, update_index
+
+ABSTRACTS = [
+    ("1", "TREM2 variants in microglia", "Disease risk variants alter microglial plaque response"),
+    ("2", "Amyloid clearance", "Disease progression tracks amyloid clearance by microglia"),
+    ("3", "Tau propagation", "Disease stage follows tau spreading along connected regions"),
+    ("4", "Sleep and amyloid", "Disease related sleep loss raises amyloid in interstitial fluid"),
+]
+
+
+def write_corpus(path, records, trailing_newline=True):
+    lines = [json.dumps({"pmid": pmid, "title": title, "abstract": abstract}) for pmid, title, abstract in records]
+    path.write_text("\n".join(lines) + ("\n" if trailing_newline else ""), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    return write_corpus(tmp_path / "abstracts.jsonl", ABSTRACTS)
+
+
+def test_search_ranks_rare_terms(corpus, tmp_path):
+    update_index(tmp_path / "index", [corpus])
+    matched, hits, postings = LiteratureIndex(tmp_path / "index").search("tau spreading", k=2)
+    assert matched == 1
+    assert hits[0][1]["pmid"] == "3"
+    assert postings == 2
+
+
+def test_query_of_only_common_terms_matches_nothing(corpus, tmp_path):
+    update_index(tmp_path / "index", [corpus])
+    index = LiteratureIndex(tmp_path / "index")
+    # "disease" is in every abstract, so it carries no signal
+    assert index.search("disease") == (0, [], 0)
+    matched, hits, _ = index.search("disease tau")
+    assert matched == 1 and hits[0][1]["pmid"] == "3"
+
+
+def test_last_record_without_trailing_newline_is_indexed_once(tmp_path):
+    corpus = write_corpus(tmp_path / "abstracts.jsonl", ABSTRACTS, trailing_newline=False)
+    assert update_index(tmp_path / "index", [corpus]) == len(ABSTRACTS)
+    assert update_index(tmp_path / "index", [corpus]) == 0
+    with open(corpus, "a", encoding="utf-8") as f:
+        f.write("\n" + json.dumps({"pmid": "5", "title": "Gut microbiome", "abstract": "Microbial metabolites"}) + "\n")
+    assert update_index(tmp_path / "index", [corpus]) == 1
+    assert LiteratureIndex(tmp_path / "index").n_docs == len(ABSTRACTS) + 1
+
+
+def test_partially_written_last_record_waits_for_the_rest(tmp_path):
+    corpus = write_corpus(tmp_path / "abstracts.jsonl", ABSTRACTS[:3])
+    record = json.dumps({"pmid": "4", "title": "Sleep and amyloid", "abstract": "Sleep loss"})
+    with open(corpus, "a", encoding="utf-8") as f:
+        f.write(record[:20])
+    assert update_index(tmp_path / "index", [corpus]) == 3
+    with open(corpus, "a", encoding="utf-8") as f:
+        f.write(record[20:] + "\n")
+    assert update_index(tmp_path / "index", [corpus]) == 1
+    assert LiteratureIndex(tmp_path / "index").search("sleep")[1][0][1]["pmid"] == "4"
+
+
+def test_interrupted_build_resumes_after_the_last_segment(corpus, tmp_path, monkeypatch):
+    write_segment = literature._write_segment
+
+    def interrupted(path, documents):
+        if path.name == "seg-00002":
+            # Killed while writing the second segment
+            path.mkdir(parents=True)
+            raise KeyboardInterrupt
+        return write_segment(path, documents)
+
+    monkeypatch.setattr(literature, "_write_segment", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        update_index(tmp_path / "index", [corpus], segment_size=2)
+    assert LiteratureIndex(tmp_path / "index").n_docs == 2
+
+    monkeypatch.setattr(literature, "_write_segment", write_segment)
+    assert update_index(tmp_path / "index", [corpus], segment_size=2) == 2
+    index = LiteratureIndex(tmp_path / "index")
+    assert index.n_docs == len(ABSTRACTS)
+    assert sorted(index.document(i)["pmid"] for i in range(index.n_docs)) == ["1", "2", "3", "4"]
+
+
+def test_agent_reports_postings_read_and_empty_matches(corpus):
+    agent = LiteratureMiningAgent(corpus.parent)
+    disease = SimpleNamespace(name="Alzheimer's Disease", agents={})
+    output = agent.run(AgentContext(disease, "amyloid clearance"))
+    assert "Extracted 2 studies" in output.findings[0]
+    assert output.metrics["documents_scanned"] == 3
+    # Without a question the disease name is the query; "disease" is common
+    output = agent.run(AgentContext(disease))
+    assert output.findings[0].startswith("No studies relevant to \"Alzheimer's Disease\"")
+    assert output.metrics["documents_scanned"] == 0
@@ -0,0 +1,69 @@
+import pytest
+
+from bioforge.minhash import (
+    LSHIndex, MinHasher, lsh_params, merge_near_duplicates, near_duplicate_clusters, shingles, similarity,
+)
+
+BASE = (
+    "Microglial TREM2 signalling regulates amyloid plaque compaction and limits "
+    "neuritic dystrophy in early stage disease through lipid sensing pathways"
+)
+
+
+def jaccard(first, second):
+    a, b = shingles(first), shingles(second)
+    return len(a & b) / len(a | b)
+
+
+def test_shingles_of_short_text():
+    assert shingles("Two words") == {"two words"}
+    assert shingles("a b c d") == {"a b c", "b c d"}
+
+
+@pytest.mark.parametrize("other", [
+    BASE,
+    BASE.replace("early stage", "late stage"),
+    BASE + " and synaptic loss",
+    "Gut microbiome metabolites modulate insulin resistance in adipose tissue",
+])
+def test_signature_similarity_estimates_jaccard(other):
+    hasher = MinHasher(num_perm=256)
+    estimate = similarity(hasher.signature(BASE), hasher.signature(other))
+    assert estimate == pytest.approx(jaccard(BASE, other), abs=0.1)
+
+
+def test_lsh_params_fit_the_signature():
+    bands, rows = lsh_params(128, 0.7)
+    assert bands * rows <= 128
+    assert bands > 1 and rows > 1
+
+
+def test_index_evicts_oldest_beyond_capacity():
+    hasher = MinHasher()
+    index = LSHIndex(capacity=2)
+    for key, text in enumerate([BASE, "insulin resistance in adipose tissue", "tau spreading along connectomes"]):
+        index.insert(key, hasher.signature(text))
+    assert len(index) == 2
+    assert index.query(hasher.signature(BASE)) is None
+    assert not any(0 in members for bucket in index._buckets for members in bucket.values())
+
+
+def test_near_duplicates_cluster_under_their_first_hypothesis():
+    hypotheses = [
+        {"title": "TREM2 and plaques", "description": BASE},
+        {"title": "Gut microbiome", "description": "Gut microbiome metabolites modulate insulin resistance in adipose tissue"},
+        {"title": "TREM2 and plaques", "description": BASE + " too"},
+    ]
+    assert near_duplicate_clusters(hypotheses) == [[0, 2], [1]]
+
+
+def test_merge_keeps_leader_and_adds_missing_evidence():
+    leader = {"title": "TREM2 and plaques", "description": BASE, "supporting_evidence": {"Genomics": "variant"}}
+    duplicate = {
+        "title": "TREM2 and plaques", "description": BASE,
+        "supporting_evidence": {"Genomics": "other variant", "Literature": "study"},
+    }
+    merged = merge_near_duplicates([leader, duplicate])
+    assert len(merged) == 1
+    assert merged[0]["supporting_evidence"] == {"Genomics": "variant", "Literature": "study"}
+    assert leader["supporting_evidence"] == {"Genomics": "variant"}
@@ -0,0 +1,66 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from bioforge.catalog import open_catalog
+from bioforge.pipeline import bounded, hypothesis_stream
+
+
+def stage_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "bioforge-stage"]
+
+
+def wait_for_stage_threads(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while stage_threads() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return stage_threads()
+
+
+def test_bounded_preserves_order_and_errors():
+    assert list(bounded(range(100), maxsize=4)) == list(range(100))
+
+    def failing():
+        yield 1
+        raise ValueError("bad record")
+
+    stage = bounded(failing())
+    assert next(stage) == 1
+    with pytest.raises(ValueError, match="bad record"):
+        next(stage)
+    assert not wait_for_stage_threads()
+
+
+def test_closing_a_stage_stops_and_closes_everything_upstream():
+    closed = []
+
+    def source():
+        try:
+            yield from itertools.count()
+        finally:
+            closed.append(threading.current_thread().name)
+
+    first = bounded(source(), maxsize=2)
+    second = bounded((item * 2 for item in first), maxsize=2, upstream=(first,))
+    assert next(second) == 0
+    second.close()
+    with pytest.raises(StopIteration):
+        next(second)
+    assert not wait_for_stage_threads()
+    assert closed == ["bioforge-stage"]
+
+
+def test_hypothesis_stream_closed_early_leaves_no_threads():
+    catalog = open_catalog()
+    disease = catalog.get(catalog.names()[0])
+    stream = hypothesis_stream(disease, queue_size=1)
+    first = next(stream)
+    assert first["title"]
+    stream.close()
+    assert not wait_for_stage_threads()
+
+    complete = list(hypothesis_stream(disease))
+    assert len(complete) >= len(disease.hypotheses)
+    assert not wait_for_stage_threads()
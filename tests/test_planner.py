@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from bioforge import clinical, genomics
+from bioforge.agents import Agent, AgentContext, AgentRuntime
+from bioforge.clinical import ClinicalDataIntegrationAgent
+from bioforge.genomics import GenomicDataAnalysisAgent
+from bioforge.planner import plan_query, scan_filters
+
+DISEASE = SimpleNamespace(
+    name="Alzheimer's Disease",
+    agents={
+        GenomicDataAnalysisAgent.name: ["APOE4 carriers show reduced amyloid clearance"],
+        ClinicalDataIntegrationAgent.name: ["CSF tau correlates with cognitive decline"],
+    },
+)
+
+
+class ScanOnlyAgent(Agent):
+    name = "Scan Only Agent"
+    topics = ("variant",)
+
+    def run(self, context):
+        return ["scanned"]
+
+
+def test_scan_filters_push_down_genes_and_cohort():
+    filters = scan_filters("TREM2 variants in early-onset Alzheimer's Disease", DISEASE.name)
+    assert filters.genes == ("TREM2",)
+    assert filters.cohort == (("age_at_onset", "<", 65),)
+    assert "alzheimer" not in filters.terms
+    table = pd.DataFrame({"age_at_onset": [50, 70, None]})
+    assert filters.cohort_mask(table).tolist() == [True, False, True]
+
+
+def test_irrelevant_scans_are_pruned_not_skipped():
+    agents = [GenomicDataAnalysisAgent(), ClinicalDataIntegrationAgent(), ScanOnlyAgent()]
+    plan = plan_query(DISEASE, "Blood-brain barrier dysfunction patterns", agents)
+    assert [agent.name for agent in plan.agents] == [GenomicDataAnalysisAgent.name, ClinicalDataIntegrationAgent.name]
+    assert plan.catalog_only == {GenomicDataAnalysisAgent.name, ClinicalDataIntegrationAgent.name}
+    assert list(plan.skipped) == [ScanOnlyAgent.name]
+
+    plan = plan_query(DISEASE, "Rare variants in amyloid processing", agents)
+    assert GenomicDataAnalysisAgent.name not in plan.catalog_only
+    assert ScanOnlyAgent.name not in plan.skipped
+
+
+def test_pruned_plan_still_returns_catalog_findings(monkeypatch):
+    def no_scan(*args, **kwargs):
+        pytest.fail("a pruned data scan was opened")
+
+    monkeypatch.setattr(genomics, "open_cohort", no_scan)
+    monkeypatch.setattr(clinical, "open_records", no_scan)
+    agents = [GenomicDataAnalysisAgent(), ClinicalDataIntegrationAgent()]
+    plan = plan_query(DISEASE, "Blood-brain barrier dysfunction patterns", agents)
+    context = AgentContext(DISEASE, plan.question, filters=plan.filters, catalog_only=plan.catalog_only)
+    runtime = AgentRuntime(agents, telemetry=None)
+    try:
+        results = {result.agent: result for result in runtime.run(context, plan.agents)}
+    finally:
+        runtime.shutdown()
+    for name, findings in DISEASE.agents.items():
+        assert results[name].ok
+        assert results[name].findings == findings
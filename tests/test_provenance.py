@@ -0,0 +1,101 @@
+import pytest
+
+from bioforge.agents import AgentContext, AgentResult, AgentRuntime, CatalogFindingsAgent, attach_evidence
+from bioforge.catalog import DiseaseRecord
+from bioforge.provenance import ProvenanceStore
+from bioforge.telemetry import TelemetryRegistry
+
+
+class CountingAgent(CatalogFindingsAgent):
+    name = "Counting Agent"
+    threshold = 0.5
+
+    def __init__(self):
+        # Private, so it is not an agent parameter in the run key
+        self._calls = 0
+
+    def run(self, context):
+        self._calls += 1
+        output = super().run(context)
+        output.evidence = {"APOE": "APOE evidence", "tau": "tau evidence"}
+        return output
+
+
+@pytest.fixture
+def disease():
+    return DiseaseRecord(
+        name="Disease",
+        description="",
+        research_questions=["Question"],
+        agents={CountingAgent.name: ["finding one", "finding two"]},
+        hypotheses=[{"title": "Catalog hypothesis", "description": "Lipids", "supporting_evidence": {CountingAgent.name: "catalog line"}}],
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProvenanceStore(tmp_path / "provenance")
+
+
+def test_run_key_changes_with_inputs(store, disease):
+    agent = CountingAgent()
+    key, inputs = store.run_key(agent, AgentContext(disease, "Question"))
+    assert store.run_key(agent, AgentContext(disease, "Question"))[0] == key
+    assert store.run_key(agent, AgentContext(disease, "Other question"))[0] != key
+    assert inputs["params"]["threshold"] == 0.5
+    agent.threshold = 0.9
+    assert store.run_key(agent, AgentContext(disease, "Question"))[0] != key
+    agent.threshold = 0.5
+    disease.agents[CountingAgent.name] = ["changed finding"]
+    assert store.run_key(agent, AgentContext(disease, "Question"))[0] != key
+
+
+def test_file_hash_follows_content(store, tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n", encoding="utf-8")
+    first = store.file_hash(path)
+    assert ProvenanceStore(store.root).file_hash(path) == first
+    path.write_text("a,b,c\n", encoding="utf-8")
+    assert store.file_hash(path) != first
+
+
+def test_repeated_run_is_replayed_from_the_store(store, disease):
+    agent = CountingAgent()
+    telemetry = TelemetryRegistry()
+    runtime = AgentRuntime([agent], telemetry=telemetry, provenance=store)
+    try:
+        (first,) = runtime.run_all(AgentContext(disease, "Question"))
+        (second,) = runtime.run_all(AgentContext(disease, "Question"))
+    finally:
+        runtime.shutdown()
+    assert agent._calls == 1
+    assert not first.replayed and second.replayed
+    assert second.provenance == first.provenance
+    assert (second.findings, second.evidence, second.metrics["documents_scanned"]) == (
+        first.findings, first.evidence, first.metrics["documents_scanned"],
+    )
+    # Evidence keeps its strongest-first order
+    assert list(second.evidence) == ["APOE", "tau"]
+    record = store.record(first.provenance)
+    assert record["inputs"]["agent"] == CountingAgent.name
+    assert record["output"]["findings"] == ["finding one", "finding two"]
+    # The replay is recorded but does not count as work
+    assert len(telemetry.ring(agent.name)) == 2
+    assert telemetry.work_history(agent.name).tolist() == [2.0]
+
+
+def test_catalog_evidence_is_traced_to_the_catalog_record(store, disease):
+    catalog = store.catalog_key(disease)
+    assert store.catalog_key(disease) == catalog
+    assert store.record(catalog)["output"]["evidence"]["Catalog hypothesis"] == {CountingAgent.name: "catalog line"}
+
+    result = AgentResult(CountingAgent.name, ["finding one"], evidence={"APOE": "APOE evidence"}, provenance="run-key")
+    hypotheses = disease.hypotheses + [
+        {"title": "APOE link", "description": "APOE shifts lipid transport", "supporting_evidence": {CountingAgent.name: "finding one"}},
+    ]
+    attached = attach_evidence(hypotheses, [result], catalog)
+    assert attached[0]["provenance"] == {CountingAgent.name: catalog}
+    assert attached[1]["supporting_evidence"] == {CountingAgent.name: "APOE evidence"}
+    assert attached[1]["provenance"] == {CountingAgent.name: "run-key"}
+    # Without agent results the catalog lines are still traced
+    assert attach_evidence(disease.hypotheses, [], catalog)[0]["provenance"] == {CountingAgent.name: catalog}
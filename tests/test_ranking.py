@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from bioforge.ranking import CATALOG_ORDER, PARETO_FRONT, WEIGHTED_SCORE, RankedView, pareto_front, top_k, weighted_scores
+
+
+@pytest.fixture
+def matrix():
+    return np.random.default_rng(3).integers(0, 101, size=(300, 3)).astype(float)
+
+
+def brute_force_front(matrix):
+    return {
+        i for i, row in enumerate(matrix)
+        if not any(np.all(other >= row) and np.any(other > row) for other in matrix)
+    }
+
+
+@pytest.mark.parametrize("k", [0, 1, 7, 20, 299, 300, 400])
+def test_top_k_matches_a_stable_full_sort(k):
+    # Many ties, so the tie order matters
+    scores = np.random.default_rng(k).integers(0, 10, size=300).astype(float)
+    expected = np.lexsort((np.arange(300), -scores))[:k]
+    np.testing.assert_array_equal(top_k(scores, k), expected)
+
+
+def test_pages_agree_with_a_full_ranking(matrix):
+    view = RankedView([{"title": str(i)} for i in range(len(matrix))], WEIGHTED_SCORE, matrix=matrix)
+    paged = [position for number in range(view.n_pages(20)) for _, position, _ in view.page(number, 20)]
+    assert paged == np.lexsort((np.arange(len(matrix)), -weighted_scores(matrix))).tolist()
+
+
+def test_pareto_front_matches_brute_force(matrix):
+    front = pareto_front(matrix)
+    assert set(front.tolist()) == brute_force_front(matrix)
+    sums = matrix[front].sum(axis=1)
+    assert np.all(np.diff(sums) <= 0)
+
+
+def test_pareto_front_keeps_duplicates_and_handles_empty():
+    assert pareto_front(np.array([[1, 2, 3], [1, 2, 3], [0, 0, 0]])).tolist() == [0, 1]
+    assert pareto_front(np.empty((0, 3))).size == 0
+
+
+def test_view_modes(matrix):
+    hypotheses = [{"title": str(i)} for i in range(len(matrix))]
+    assert [p for _, p, _ in RankedView(hypotheses, CATALOG_ORDER, matrix=matrix).page(1, 5)] == [5, 6, 7, 8, 9]
+    pareto = RankedView(hypotheses, PARETO_FRONT, matrix=matrix)
+    assert len(pareto) == len(brute_force_front(matrix))
+    weighted = RankedView(hypotheses, WEIGHTED_SCORE, weights=(1, 0, 0), matrix=matrix)
+    assert matrix[weighted.page(0, 1)[0][1], 0] == matrix[:, 0].max()
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from bioforge.evaluations import Evaluation, EvaluationStore
+from bioforge.rescoring import OnlineRescorer, RunningStats, blend
+
+
+@pytest.fixture
+def ratings():
+    return np.random.default_rng(11).integers(0, 101, size=500).astype(float)
+
+
+def test_running_stats_match_batch_moments(ratings):
+    stats = RunningStats()
+    for value in ratings:
+        stats.update(value)
+    assert stats.count == ratings.size
+    assert stats.mean == pytest.approx(ratings.mean(), rel=1e-12)
+    assert stats.variance == pytest.approx(ratings.var(ddof=1), rel=1e-10)
+    assert stats.std == pytest.approx(ratings.std(ddof=1), rel=1e-10)
+
+
+def test_running_stats_single_value_has_no_spread():
+    stats = RunningStats()
+    stats.update(42)
+    assert (stats.mean, stats.variance) == (42, 0.0)
+
+
+def test_from_moments_matches_online_updates(ratings):
+    online = RunningStats()
+    for value in ratings:
+        online.update(value)
+    rebuilt = RunningStats.from_moments(ratings.size, ratings.mean(), (ratings * ratings).mean())
+    assert rebuilt.mean == pytest.approx(online.mean)
+    assert rebuilt.variance == pytest.approx(online.variance, rel=1e-8)
+
+
+def test_blend_weights_the_model_score_as_prior_ratings():
+    stats = RunningStats()
+    assert blend(80, stats) == 80
+    stats.update(20)
+    assert blend(80, stats, prior_weight=5) == round((5 * 80 + 20) / 6)
+
+
+def test_rescorer_seeded_from_store_matches_online(tmp_path, ratings):
+    store = EvaluationStore(tmp_path / "evaluations.sqlite")
+    online = OnlineRescorer()
+    try:
+        for potential, novelty in zip(ratings[:50], ratings[50:100]):
+            evaluation = Evaluation("Disease", "Hypothesis", int(potential), int(novelty), "HIGH")
+            store.submit(evaluation)
+            online.update(evaluation)
+        store.flush()
+        seeded = OnlineRescorer.from_store(store)
+    finally:
+        store.close()
+    expected, actual = online.feedback("Disease", "Hypothesis"), seeded.feedback("Disease", "Hypothesis")
+    assert actual.count == expected.count == 50
+    for rating in ("potential", "novelty"):
+        assert getattr(actual, rating).mean == pytest.approx(getattr(expected, rating).mean)
+        assert getattr(actual, rating).variance == pytest.approx(getattr(expected, rating).variance, rel=1e-8)
+    assert actual.priorities["HIGH"] == 50
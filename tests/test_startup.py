@@ -0,0 +1,44 @@
+import threading
+import time
+
+from bioforge.startup import StartupProfile
+
+
+def test_import_stacks_are_per_thread():
+    profile = StartupProfile(enabled=False)
+    inside = threading.Event()
+    done = threading.Event()
+
+    def worker():
+        with profile._timed_import("worker_module"):
+            inside.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    inside.wait(5)
+    # Main-thread imports while the worker's import is still in progress
+    with profile._timed_import("parent"):
+        with profile._timed_import("child"):
+            time.sleep(0.02)
+    done.set()
+    thread.join()
+
+    parent_total, parent_self = profile.imports["parent"]
+    child_total, _ = profile.imports["child"]
+    assert parent_self == parent_total - child_total
+    worker_total, worker_self = profile.imports["worker_module"]
+    assert worker_self == worker_total
+
+
+def test_sections_are_timed_until_finished():
+    profile = StartupProfile(enabled=True)
+    profile.uninstall()
+    with profile.section("sidebar"):
+        pass
+    assert "sidebar" in profile.sections
+    assert "first render" in profile.finish()
+    with profile.section("later"):
+        pass
+    assert "later" not in profile.sections
+    assert profile.finish() is None
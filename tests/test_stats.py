@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from scipy import stats as scipy_stats
+
+from bioforge.stats import allelic_chi2, benjamini_hochberg, pearson_from_sums, welch_t_test
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+def test_benjamini_hochberg_matches_scipy(rng):
+    p = np.concatenate([rng.uniform(size=200), rng.uniform(0, 1e-3, size=20), [1.0, 0.0, 0.5, 0.5]])
+    np.testing.assert_allclose(benjamini_hochberg(p), scipy_stats.false_discovery_control(p), rtol=1e-12)
+
+
+def test_benjamini_hochberg_empty():
+    assert benjamini_hochberg([]).size == 0
+
+
+def test_welch_t_test_matches_scipy(rng):
+    cases = rng.normal(0.3, 1.0, size=(40, 25))
+    controls = rng.normal(0.0, 2.0, size=(55, 25))
+    diff, t, p = welch_t_test(cases, controls)
+    expected = scipy_stats.ttest_ind(cases, controls, axis=0, equal_var=False)
+    np.testing.assert_allclose(diff, cases.mean(axis=0) - controls.mean(axis=0))
+    np.testing.assert_allclose(t, expected.statistic, rtol=1e-10)
+    np.testing.assert_allclose(p, expected.pvalue, rtol=1e-8)
+
+
+def test_welch_t_test_constant_column_is_untestable():
+    cases, controls = np.ones((5, 1)), np.ones((6, 1))
+    _, _, p = welch_t_test(cases, controls)
+    assert p[0] == 1.0
+
+
+def test_allelic_chi2_matches_scipy(rng):
+    counts = rng.integers(1, 200, size=(30, 4))
+    odds, p = allelic_chi2(*counts.T)
+    for (a, b, c, d), observed_odds, observed_p in zip(counts, odds, p):
+        _, expected_p, _, _ = scipy_stats.chi2_contingency([[a, b], [c, d]], correction=False)
+        assert observed_p == pytest.approx(expected_p, rel=1e-9)
+        assert observed_odds == pytest.approx((a + 0.5) * (d + 0.5) / ((b + 0.5) * (c + 0.5)))
+
+
+def test_allelic_chi2_empty_margin_is_untestable():
+    _, p = allelic_chi2([0], [0], [3], [4])
+    assert p[0] == 1.0
+
+
+def test_pearson_from_sums_matches_scipy(rng):
+    x = rng.normal(size=80)
+    y = 0.4 * x + rng.normal(size=80)
+    sums = (x.size, x.sum(), y.sum(), (x * x).sum(), (y * y).sum(), (x * y).sum())
+    r, p = pearson_from_sums(*sums)
+    expected = scipy_stats.pearsonr(x, y)
+    assert float(r) == pytest.approx(expected.statistic, rel=1e-10)
+    assert float(p) == pytest.approx(expected.pvalue, rel=1e-8)